@@ -1,7 +1,4 @@
 import json
-import hashlib
-import os
-import pickle
 from typing import Any, Dict, List, Optional
 from config import target_langs
 from services.openai_api import OpenAIAPI
@@ -10,8 +7,6 @@ from services.openai_api import OpenAIAPI
 class AgentModule:
     def __init__(self):
         self.openai_api = OpenAIAPI()
-        self.agent_id = None
-        self.cache_file = os.path.join(os.path.dirname(__file__), "assistant_cache.pkl")
 
         langs_list = ", ".join(target_langs)
 
@@ -60,6 +55,11 @@ class AgentModule:
             Якщо пост не є оголошенням — поверни null.
         """
 
+        # Prompt and schema are fixed for the process: build the strict
+        # response_format once and send it inline with every completion.
+        self.response_schema = self._build_response_schema()
+        self.response_format = OpenAIAPI._schema_to_response_format(self.response_schema)
+
     def _build_response_schema(self) -> Dict[str, Any]:
         """Build JSON schema compatible with OpenAI strict mode for article drafts."""
 
@@ -149,70 +149,41 @@ class AgentModule:
         }
         return wrapped_schema
 
-    def _fingerprint(self, response_schema: Dict[str, Any]) -> str:
-        schema_str = json.dumps(response_schema, sort_keys=True, ensure_ascii=False)
-        payload = f"{self.agent_prompt.strip()}|{self.openai_api.model}|{schema_str}"
-        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
-
-    def _load_cached_agent(self) -> Optional[str]:
-        if not os.path.exists(self.cache_file):
-            return None
-        try:
-            with open(self.cache_file, "rb") as f:
-                cache_data = pickle.load(f)
-            return cache_data.get("assistant_id") if cache_data.get("fingerprint") == self.current_fingerprint else None
-        except Exception:
-            return None
-
-    def _persist_cache(self, assistant_id: str):
-        try:
-            with open(self.cache_file, "wb") as f:
-                pickle.dump({"assistant_id": assistant_id, "fingerprint": self.current_fingerprint}, f)
-        except Exception:
-            pass
-
-    def create_agent(self):
-        response_schema = self._build_response_schema()
-        self.current_fingerprint = self._fingerprint(response_schema)
-        cached_id = self._load_cached_agent()
-        if cached_id:
-            self.agent_id = cached_id
-            print(f"Using cached agent id: {self.agent_id}")
-            return
-
-        self.agent_id = self.openai_api.create_agent(self.agent_prompt, response_schema=response_schema)
-        self._persist_cache(self.agent_id)
-        print(f"Agent created with id: {self.agent_id}")
+    def build_messages(self, post: Dict[str, Any]) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": self.agent_prompt},
+            {"role": "user", "content": json.dumps(post, ensure_ascii=False)},
+        ]
+
+    def batch_request(self, post: Dict[str, Any]) -> Dict[str, Any]:
+        """One line of an OpenAI Batch API input file for `post` (custom_id = instagram_id)."""
+        return {
+            "custom_id": post["instagram_id"],
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": self.openai_api.model,
+                "messages": self.build_messages(post),
+                "response_format": self.response_format,
+            },
+        }
+
+    @staticmethod
+    def parse_result(result: Any) -> Optional[Dict[str, Any]]:
+        """Unwrap our JSON schema nullable wrapper → actual data or None."""
+        if isinstance(result, dict) and "value" in result:
+            result = result.get("value")
+        return result if isinstance(result, dict) else None
 
     def process_post(self, post: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Process a single Instagram post and return article draft data,
         or None if the post is not a listing.
         """
-        content = json.dumps(post, ensure_ascii=False)
-        messages = [{"role": "user", "content": content}]
-
-        response_schema = self._build_response_schema()
-        response = self.openai_api.send_messages(
-            assistant_id=self.agent_id,
-            messages=messages,
-            response_schema=response_schema,
+        messages = self.build_messages(post)
+        result = self.openai_api.complete_json(
+            system_prompt=messages[0]["content"],
+            messages=messages[1:],
+            response_format=self.response_format,
         )
-
-        # send_messages returns Text.to_dict():
-        #   {"value": <parsed JSON>, "annotations": [...]}
-        # where <parsed JSON> is our schema wrapper:
-        #   {"value": <article_data | null>}
-        #
-        # We need to unwrap BOTH levels to get the actual article data.
-
-        # 1st unwrap: OpenAI Text wrapper → our schema response
-        result = response
-        if isinstance(result, dict) and "value" in result:
-            result = result.get("value")
-
-        # 2nd unwrap: our JSON schema nullable wrapper → actual data or None
-        if isinstance(result, dict) and "value" in result:
-            result = result.get("value")
-
-        return result if isinstance(result, dict) else None
+        return self.parse_result(result)
@@ -1,23 +1,49 @@
+import argparse
+import json
 import os
 import re
-import uuid
+import tempfile
 import unicodedata
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-
-import requests
+from typing import Optional
 
 from agent_module import AgentModule
 from services.instagram_api import InstagramAPI
+from services.media_downloader import MediaDownloader
 from dbase.collections.ArticleCollection import ArticleCollection
+from dbase.collections.JobCollection import JobCollection
+from dbase.collections.SyncStateCollection import SyncStateCollection
+from dbase.text import TRANSLIT_MAP
+from dbase.translation_memory import aligned_pairs, translation_memory
 
 
 USERNAME = "realdeko_group_official"
+SYNC_SOURCE = "instagram"
+# Pages followed per run until the high-water mark is reached (also the depth of the very first sync).
+INSTAGRAM_MAX_PAGES = int(os.getenv("INSTAGRAM_MAX_PAGES", "20"))
 
 # Use the same MEDIA_ROOT as the API server.
 # Default: ../media relative to ai-pipeline/ → backend/media/
 MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", os.path.join(os.path.dirname(__file__), "..", "media")))
 MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
 
+# Posts processed by the AI agent at once; the OpenAI gateway still enforces
+# OPENAI_RPM / OPENAI_TPM / OPENAI_MAX_CONCURRENCY across all of them.
+AI_WORKERS = int(os.getenv("PIPELINE_AI_WORKERS", "4"))
+# Finished drafts are saved in batches of this size while later posts are still processed.
+WRITE_BATCH = int(os.getenv("PIPELINE_WRITE_BATCH", "10"))
+
+# --batch mode: OpenAI Batch API jobs are tracked in the jobs collection under this kind.
+BATCH_JOB_KIND = "pipeline_batch"
+BATCH_PENDING_STATUSES = ("validating", "in_progress", "finalizing", "cancelling")
+# A post whose batch result cannot be imported is submitted at most this many times.
+BATCH_MAX_ATTEMPTS = int(os.getenv("PIPELINE_BATCH_MAX_ATTEMPTS", "3"))
+# A batch still "running" this long after it was claimed was left by a crashed run and is collected again.
+BATCH_COLLECT_TIMEOUT = float(os.getenv("PIPELINE_BATCH_COLLECT_TIMEOUT", "3600"))
+
 
 def normalize_posts(raw_posts):
     """Extract relevant fields from raw Instagram API response.
@@ -75,6 +101,9 @@ def normalize_posts(raw_posts):
                     "video_url": video_url,
                     "carousel_media": carousel_items,
                     "post_url": f"https://www.instagram.com/p/{code}",
+                    "taken_at": node.get("taken_at") or 0,
+                    # Pinned posts stay on top of the first page regardless of age
+                    "pinned": bool(node.get("timeline_pinned_user_ids")),
                 }
             )
         except Exception as e:
@@ -85,23 +114,11 @@ def normalize_posts(raw_posts):
 
 def slugify(text: str, max_length: int = 60) -> str:
     """Simple slugify: transliterate, lowercase, replace non-alnum with hyphens."""
-    # Basic Cyrillic → Latin transliteration map
-    translit_map = {
-        'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
-        'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
-        'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
-        'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
-        'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
-        'і': 'i', 'ї': 'yi', 'є': 'ye', 'ґ': 'g',
-        'ě': 'e', 'š': 's', 'č': 'c', 'ř': 'r', 'ž': 'z', 'ý': 'y',
-        'á': 'a', 'í': 'i', 'é': 'e', 'ú': 'u', 'ů': 'u', 'ň': 'n',
-        'ť': 't', 'ď': 'd', 'ö': 'o', 'ü': 'u', 'ä': 'a',
-    }
     text = text.lower()
     result = []
     for ch in text:
-        if ch in translit_map:
-            result.append(translit_map[ch])
+        if ch in TRANSLIT_MAP:
+            result.append(TRANSLIT_MAP[ch])
         else:
             result.append(ch)
     text = "".join(result)
@@ -117,47 +134,47 @@ def slugify(text: str, max_length: int = 60) -> str:
     return text
 
 
-def download_media(url: str) -> str:
+def schedule_post_media(post: dict, downloader: MediaDownloader) -> dict:
     """
-    Download media (image or video) from a URL and save it locally to MEDIA_ROOT.
-    Returns the relative media path (e.g. /media/<filename>.jpg or /media/<filename>.mp4).
+    Start downloading every media file of a post: cover image, video
+    (media_type 2) and carousel items (media_type 8). Returns the futures.
     """
-    try:
-        resp = requests.get(url, timeout=60, stream=True)
-        resp.raise_for_status()
-
-        # Determine file extension from Content-Type header
-        content_type = resp.headers.get("Content-Type", "")
-        ext_map = {
-            "image/jpeg": ".jpg",
-            "image/png": ".png",
-            "image/webp": ".webp",
-            "image/gif": ".gif",
-            "video/mp4": ".mp4",
-            "video/quicktime": ".mov",
-            "video/webm": ".webm",
-        }
-        ct_clean = content_type.split(";")[0].strip()
-        ext = ext_map.get(ct_clean, "")
-        if not ext:
-            # Fallback: guess from content-type family
-            ext = ".mp4" if ct_clean.startswith("video/") else ".jpg"
-
-        filename = f"{uuid.uuid4().hex}{ext}"
-        target_path = MEDIA_ROOT / filename
+    futures = {"image": None, "video": None, "carousel": []}
+    if post.get("image_url"):
+        futures["image"] = downloader.submit(post["image_url"])
+    if post.get("video_url"):
+        futures["video"] = downloader.submit(post["video_url"])
+    if post.get("media_type") == 8:
+        for item in post.get("carousel_media") or []:
+            futures["carousel"].append(
+                {
+                    # Image is the thumbnail for videos, the full image for photos
+                    "image": downloader.submit(item["image_url"]) if item.get("image_url") else None,
+                    "video": downloader.submit(item["video_url"]) if item.get("video_url") else None,
+                    "media_type": item.get("media_type", 1),
+                }
+            )
+    return futures
 
-        with open(target_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
 
-        kind = "video" if ext in (".mp4", ".mov", ".webm") else "image"
-        size_kb = target_path.stat().st_size // 1024
-        print(f"  → Downloaded {kind}: {filename} ({size_kb} KB)")
-        return f"/media/{filename}"
+def apply_post_media(post: dict, futures: dict):
+    """Wait for a post's downloads and store the local /media paths on it."""
+    if futures["image"] and futures["image"].result():
+        post["local_image_url"] = futures["image"].result()
+    if futures["video"] and futures["video"].result():
+        post["local_video_url"] = futures["video"].result()
 
-    except Exception as e:
-        print(f"  → Failed to download media: {e}")
-        return ""
+    if futures["carousel"]:
+        local_carousel = []
+        for item in futures["carousel"]:
+            local_item = {}
+            if item["image"] and item["image"].result():
+                local_item["local_image_url"] = item["image"].result()
+            if item["video"] and item["video"].result():
+                local_item["local_video_url"] = item["video"].result()
+            local_item["media_type"] = item["media_type"]
+            local_carousel.append(local_item)
+        post["local_carousel_media"] = local_carousel
 
 
 def build_article_document(ai_result: dict, instagram_post: dict) -> dict:
@@ -243,110 +260,431 @@ def build_article_document(ai_result: dict, instagram_post: dict) -> dict:
     }
 
 
-def sync_instagram_posts():
+def seed_translation_memory(drafts: list, created_slugs: list, model: str) -> int:
     """
-    Main pipeline: fetch Instagram posts, process with AI,
-    and save new ones as draft articles.
+    Store the agent's own translations segment by segment, so a later
+    re-localization from the admin UI only pays for segments edited since.
     """
-    # 1. Fetch posts from Instagram
-    instagram_api = InstagramAPI()
-    raw_posts = instagram_api.get_posts(USERNAME)
-    normalized_posts = normalize_posts(raw_posts)
+    created = set(created_slugs)
+    seeded = 0
+    for draft in drafts:
+        if draft["slug"] not in created:
+            continue
+        for lang_code, translation in (draft.get("translations") or {}).items():
+            seeded += translation_memory.remember(aligned_pairs(draft, translation), lang_code, model)
+    return seeded
 
-    if not normalized_posts:
-        print("No posts received from Instagram.")
-        return
 
-    print(f"Fetched {len(normalized_posts)} posts from Instagram.")
+def process_post(agent: AgentModule, post: dict, downloader: MediaDownloader):
+    """
+    AI stage for one post, run on the worker pool. Media downloads are
+    scheduled as soon as the post is known to be a listing, so they overlap
+    with the AI calls of the other posts. Returns (ai_result, media futures).
+    """
+    ai_result = agent.process_post(post)
+    if ai_result is None:
+        return None, None
+    return ai_result, schedule_post_media(post, downloader)
 
-    # 2. Check which posts are already imported
-    collection = ArticleCollection()
-    existing_instagram_ids = set(collection.get_source_instagram_ids())
 
-    new_posts = [p for p in normalized_posts if p["instagram_id"] not in existing_instagram_ids]
+def save_drafts(collection: ArticleCollection, drafts: list, model: str) -> dict:
+    """Save a batch of drafts in one insert_many and seed the translation memory."""
+    try:
+        report = collection.create_many(drafts)
+    except Exception as e:
+        print(f"\nError saving articles: {e}")
+        report = {"created": [], "conflicts": [], "errors": [{"slug": d.get("slug"), "error": str(e)} for d in drafts]}
+
+    for slug in report["created"]:
+        print(f"  → Created draft article: {slug}")
+    for slug in report["conflicts"]:
+        # Slug (or Instagram post) already exists — skip
+        print(f"  → Skipped (slug conflict): {slug}")
+    for error in report["errors"]:
+        print(f"  → Error saving article {error['slug']}: {error['error']}")
+
+    try:
+        seeded = seed_translation_memory(drafts, report["created"], model)
+        print(f"  → Translation memory: {seeded} segments stored")
+    except Exception as e:
+        print(f"  → Translation memory seeding failed: {e}")
+    return report
+
+
+def is_newer(post: dict, high_water: Optional[dict]) -> bool:
+    """Whether `post` was published after the high-water mark (every post is, without one)."""
+    if not high_water:
+        return True
+    if post["instagram_id"] == high_water["instagram_id"]:
+        return False
+    return post["taken_at"] > high_water["taken_at"]
+
+
+def walk_posts(instagram_api: InstagramAPI, collection: ArticleCollection, high_water: Optional[dict],
+               max_id: str = "") -> dict:
+    """
+    Follow maxId page by page (newest first, or from the `max_id` cursor)
+    until a page reaches the high-water mark, for at most INSTAGRAM_MAX_PAGES
+    pages. With nothing new this is a single request for the first page.
+
+    Without a mark (first sync) the walk stops at the first page holding an
+    already imported post, which then serves as the mark, so history that
+    was imported (or deleted by admins) is not sent to the agent again.
+
+    Returns {"posts": posts newer than the mark, "high_water": the mark (as
+    seeded), "reached": whether it was reached, "cursor": where to continue
+    when it was not}.
+    """
+    posts = []
+    seed = high_water is None and bool(collection.get_source_instagram_ids(limit=1))
+    for response in instagram_api.iter_post_pages(USERNAME, INSTAGRAM_MAX_PAGES, max_id=max_id):
+        page = normalize_posts(response)
+        if seed:
+            imported = set(collection.get_source_instagram_ids([post["instagram_id"] for post in page]))
+            newest = max((post for post in page if post["instagram_id"] in imported and not post["pinned"]),
+                         key=lambda post: post["taken_at"], default=None)
+            if newest:
+                high_water = {"instagram_id": newest["instagram_id"], "taken_at": newest["taken_at"]}
+        posts.extend(post for post in page if is_newer(post, high_water))
+        # Pinned posts are older ones shown first, so they never end the walk.
+        if high_water and any(not post["pinned"] and not is_newer(post, high_water) for post in page):
+            return {"posts": posts, "high_water": high_water, "reached": True, "cursor": ""}
+        max_id = InstagramAPI.next_max_id(response)
+        if not max_id:
+            # The account's oldest post: nothing below to catch up on.
+            return {"posts": posts, "high_water": high_water, "reached": True, "cursor": ""}
+    print(f"Stopped after {INSTAGRAM_MAX_PAGES} pages (INSTAGRAM_MAX_PAGES); the next run continues from there.")
+    return {"posts": posts, "high_water": high_water, "reached": False, "cursor": max_id}
+
+
+def fetch_new_posts(collection: ArticleCollection, state: dict):
+    """
+    Fetch the posts published since the last sync and drop the ones already
+    imported. While an earlier run left a gap (page cap hit before the mark),
+    this run continues from its cursor instead of starting from the top.
+    Returns (walk, posts to process).
+    """
+    instagram_api = InstagramAPI()
+    resume = state.get("resume")
+    if resume:
+        print("Continuing the previous sync from its saved cursor.")
+    walk = walk_posts(instagram_api, collection, state.get("high_water"), resume["cursor"] if resume else "")
+    fetched = walk["posts"]
+
+    if not fetched:
+        print("No new posts on Instagram since the last sync.")
+        return walk, []
+
+    print(f"Fetched {len(fetched)} posts from Instagram since the last sync.")
+
+    # Only the fetched ids are looked up, through the unique source_instagram_id index.
+    existing_instagram_ids = set(collection.get_source_instagram_ids([p["instagram_id"] for p in fetched]))
+    new_posts = [p for p in fetched if p["instagram_id"] not in existing_instagram_ids]
     if not new_posts:
         print("No new posts to process. All posts already imported.")
+    return walk, new_posts
+
+
+def advance_high_water(high_water: Optional[dict], fetched: list, failed_ids: set) -> Optional[dict]:
+    """
+    Move the mark to the newest fetched post such that it and every older
+    fetched post were handled; posts that failed stay above the mark and
+    are fetched again by the next run.
+    """
+    for post in sorted(fetched, key=lambda p: p["taken_at"]):
+        if post["instagram_id"] in failed_ids:
+            break
+        high_water = {"instagram_id": post["instagram_id"], "taken_at": post["taken_at"]}
+    return high_water
+
+
+def save_sync_state(sync_state: SyncStateCollection, state: dict, walk: dict, failed_ids: set):
+    """
+    Persist the sync position after a walk. The mark only moves once the walk
+    has reached it: a walk cut short by the page cap stores a cursor and the
+    mark it will move to, and keeps the old mark until the gap is closed.
+    """
+    high_water, resume = walk["high_water"], state.get("resume")
+    clean = not (failed_ids & {post["instagram_id"] for post in walk["posts"]})
+    # The newest handled post of the whole catch-up; None once any part of it failed.
+    pending = resume["high_water"] if resume else advance_high_water(None, walk["posts"], set())
+    if not clean:
+        pending = None
+
+    if not walk["reached"]:
+        resume = {"cursor": walk["cursor"], "high_water": pending}
+        sync_state.set_state(SYNC_SOURCE, USERNAME, high_water, resume)
         return
 
-    print(f"Found {len(new_posts)} new posts to process.")
+    if resume and pending:
+        new_mark = pending
+    else:
+        # Failed posts stay above the mark; the next run fetches them again from the top.
+        new_mark = advance_high_water(high_water, walk["posts"], failed_ids)
+    if new_mark != state.get("high_water") or resume:
+        sync_state.set_state(SYNC_SOURCE, USERNAME, new_mark, None)
+    if new_mark and new_mark != state.get("high_water"):
+        print(f"High-water mark: post {new_mark['instagram_id']} (taken_at {new_mark['taken_at']})")
 
-    # 3. Create AI agent
-    agent = AgentModule()
-    agent.create_agent()
 
-    # 4. Process each new post
+def import_posts(collection: ArticleCollection, posts: list, outcomes: list, model: str):
+    """
+    Consume AI outcomes in post order and save the drafts in batches.
+    `outcomes[i]()` returns (ai_result, media futures) for `posts[i]`, blocking
+    until it is ready, or raises — one failing post never stops the others.
+    Returns (imported, skipped, ids of failed posts); a post fails when its AI
+    call or its insert fails.
+    """
     imported = 0
     skipped = 0
-
-    for post in new_posts:
+    failed_ids = set()
+    batch = []
+    for post, outcome in zip(posts, outcomes):
         media_type = post.get("media_type", 1)
         media_label = {1: "photo", 2: "video", 8: "carousel"}.get(media_type, "unknown")
-        print(f"\nProcessing Instagram {media_label} post {post['instagram_id']} ({post['post_url']})...")
+        print(f"\nInstagram {media_label} post {post['instagram_id']} ({post['post_url']}):")
 
-        ai_result = agent.process_post(post)
+        try:
+            ai_result, media = outcome()
+        except Exception as e:
+            print(f"  → Failed: {e}")
+            failed_ids.add(post["instagram_id"])
+            continue
 
         if ai_result is None:
             print(f"  → Skipped (not a listing).")
             skipped += 1
             continue
 
-        # --- Download cover image ---
-        image_url = post.get("image_url", "")
-        if image_url:
-            local_path = download_media(image_url)
-            if local_path:
-                post["local_image_url"] = local_path
-
-        # --- Download video (for video posts, media_type 2) ---
-        video_url = post.get("video_url", "")
-        if video_url:
-            local_video = download_media(video_url)
-            if local_video:
-                post["local_video_url"] = local_video
-
-        # --- Download carousel items (for carousel posts, media_type 8) ---
-        if media_type == 8 and post.get("carousel_media"):
-            local_carousel = []
-            for idx, item in enumerate(post["carousel_media"]):
-                print(f"  → Downloading carousel item {idx + 1}/{len(post['carousel_media'])}...")
-                local_item = {}
-
-                # Download image (thumbnail for videos, full image for photos)
-                item_image = item.get("image_url", "")
-                if item_image:
-                    local_img = download_media(item_image)
-                    if local_img:
-                        local_item["local_image_url"] = local_img
-
-                # Download video if carousel item is a video
-                item_video = item.get("video_url", "")
-                if item_video:
-                    local_vid = download_media(item_video)
-                    if local_vid:
-                        local_item["local_video_url"] = local_vid
-
-                local_item["media_type"] = item.get("media_type", 1)
-                local_carousel.append(local_item)
-
-            post["local_carousel_media"] = local_carousel
-
-        # Build article document and save as draft
-        article_doc = build_article_document(ai_result, post)
+        apply_post_media(post, media)
+        batch.append(build_article_document(ai_result, post))
+
+        # Save completed drafts while the remaining posts are still in flight
+        if len(batch) >= WRITE_BATCH:
+            report = save_drafts(collection, batch, model)
+            imported += len(report["created"])
+            skipped += len(report["conflicts"])
+            failed_ids.update(unsaved_instagram_ids(batch, report))
+            batch = []
+
+    if batch:
+        report = save_drafts(collection, batch, model)
+        imported += len(report["created"])
+        skipped += len(report["conflicts"])
+        failed_ids.update(unsaved_instagram_ids(batch, report))
+    return imported, skipped, failed_ids
+
+
+def unsaved_instagram_ids(drafts: list, report: dict) -> set:
+    errored = {error["slug"] for error in report["errors"]}
+    return {draft["source_instagram_id"] for draft in drafts if draft["slug"] in errored}
+
+
+def sync_instagram_posts():
+    """
+    Main pipeline: fetch Instagram posts, process with AI,
+    and save new ones as draft articles.
+    """
+    # 1-2. Fetch the posts published since the last sync and keep the ones not imported yet
+    collection = ArticleCollection()
+    sync_state = SyncStateCollection()
+    state = sync_state.get(SYNC_SOURCE, USERNAME) or {}
+    walk, new_posts = fetch_new_posts(collection, state)
+    if not new_posts:
+        save_sync_state(sync_state, state, walk, set())
+        return
+
+    print(f"Found {len(new_posts)} new posts to process.")
+
+    # 3. Create AI agent
+    agent = AgentModule()
+    model = agent.openai_api.model
+
+    # 4. Process new posts: up to AI_WORKERS posts go through the agent at once,
+    # their media downloads start as soon as each post is classified, and
+    # results are consumed in post order so the output stays deterministic.
+    downloader = MediaDownloader(MEDIA_ROOT)
+    workers = max(1, min(AI_WORKERS, len(new_posts)))
+    print(f"Processing with {workers} AI workers.")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent") as executor:
+        futures = [executor.submit(process_post, agent, post, downloader) for post in new_posts]
+        # 5. Save drafts in post order as results arrive
+        imported, skipped, failed_ids = import_posts(
+            collection, new_posts, [future.result for future in futures], model
+        )
+
+    downloader.close()
+    print(downloader.report())
+    save_sync_state(sync_state, state, walk, failed_ids)
+    print(f"\nDone! Imported: {imported}, Skipped: {skipped}, Failed: {len(failed_ids)}")
+
+
+# ── Batch mode ──────────────────────────────────────────────────────────────
 
+
+def batch_outcome(result, media):
+    if isinstance(result, Exception):
+        raise result
+    return AgentModule.parse_result(result), media
+
+
+def collect_batch(job: dict, agent: AgentModule, collection: ArticleCollection, jobs: JobCollection) -> list:
+    """
+    Import the results of one finished OpenAI batch; pending batches are left
+    alone. Returns (post, attempts so far) for the posts to submit again: those
+    without a result (expired / cancelled batch) or whose result could not be imported.
+    """
+    batch = agent.openai_api.retrieve_batch(job["target"])
+    if batch.status in BATCH_PENDING_STATUSES:
+        counts = batch.request_counts
+        progress = f" ({counts.completed}/{counts.total})" if counts else ""
+        print(f"Batch {batch.id}: {batch.status}{progress}")
+        return []
+
+    # Unique per run: the lease check in complete/fail must not match a later run with the same pid.
+    worker = f"pipeline-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    if not jobs.claim(job["id"], worker):
+        return []  # collected by an overlapping run
+    print(f"\nCollecting batch {batch.id} ({batch.status}).")
+
+    downloader = None
+    try:
+        results = agent.openai_api.batch_results(batch.error_file_id)
+        results.update(agent.openai_api.batch_results(batch.output_file_id))
+        posts = job["params"]["posts"]
+        model = job["params"]["model"]
+
+        downloader = MediaDownloader(MEDIA_ROOT)
+        answered = [post for post in posts if post["instagram_id"] in results]
+        outcomes = []
+        for post in answered:
+            result = results[post["instagram_id"]]
+            listing = not isinstance(result, Exception) and AgentModule.parse_result(result) is not None
+            media = schedule_post_media(post, downloader) if listing else None
+            outcomes.append(partial(batch_outcome, result, media))
+
+        imported, skipped, failed_ids = import_posts(collection, answered, outcomes, model)
+    except Exception as e:
+        print(f"Batch {batch.id}: collection failed: {e}")
+        jobs.fail(job["id"], worker, str(e))
+        return [(post, attempts_of(job, post)) for post in job["params"]["posts"]]
+    finally:
+        if downloader:
+            downloader.close()
+            print(downloader.report())
+
+    summary = {"batch_status": batch.status, "imported": imported, "skipped": skipped, "failed": len(failed_ids),
+               "unanswered": len(posts) - len(answered)}
+    if not jobs.complete(job["id"], worker, summary):
+        # Re-queued as stale meanwhile; the next collection finds these drafts already imported.
+        print(f"Batch {batch.id}: job was re-queued while collecting; left for the next run")
+    print(f"Batch {batch.id}: imported {imported}, skipped {skipped}, failed {len(failed_ids)}, "
+          f"without result {summary['unanswered']}")
+    return [
+        (post, attempts_of(job, post))
+        for post in posts
+        if post["instagram_id"] not in results or post["instagram_id"] in failed_ids
+    ]
+
+
+def attempts_of(job: dict, post: dict) -> int:
+    # Jobs submitted before attempts were recorded count as a first attempt.
+    return job["params"].get("attempts", {}).get(post["instagram_id"], 1)
+
+
+def submit_batch(posts: list, agent: AgentModule, jobs: JobCollection, attempts: Optional[dict] = None) -> str:
+    """
+    Write one chat completion request per post as JSONL, submit it and record
+    the batch job; `attempts` holds the earlier submissions of retried posts.
+    """
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", encoding="utf-8", delete=False) as f:
+        for post in posts:
+            f.write(json.dumps(agent.batch_request(post), ensure_ascii=False) + "\n")
+        input_path = f.name
+    try:
+        batch = agent.openai_api.submit_batch(input_path)
+    finally:
+        os.unlink(input_path)
+
+    jobs.create(
+        BATCH_JOB_KIND,
+        batch.id,
+        {
+            "model": agent.openai_api.model,
+            "input_file_id": batch.input_file_id,
+            "posts": posts,
+            "attempts": {post["instagram_id"]: (attempts or {}).get(post["instagram_id"], 0) + 1 for post in posts},
+        },
+    )
+    print(f"Submitted batch {batch.id} with {len(posts)} posts.")
+    return batch.id
+
+
+def sync_instagram_posts_batch():
+    """
+    Backfill mode: collect finished OpenAI batches from earlier runs, then
+    submit the posts published since the high-water mark together with the
+    posts of collected batches that need another attempt. Run it periodically
+    (e.g. hourly); no process stays open while the batch runs.
+    """
+    collection = ArticleCollection()
+    jobs = JobCollection()
+    sync_state = SyncStateCollection()
+    agent = AgentModule()
+
+    requeued = jobs.requeue_stale(BATCH_JOB_KIND, BATCH_COLLECT_TIMEOUT)
+    if requeued:
+        print(f"Re-queued {requeued} batch(es) left uncollected by an interrupted run.")
+    retries = []
+    for job_id in jobs.queued_ids(BATCH_JOB_KIND):
         try:
-            created = collection.create(article_doc)
-            print(f"  → Created draft article: {created['slug']}")
-            imported += 1
-        except ValueError as e:
-            # Slug already exists — skip
-            print(f"  → Skipped (slug conflict): {e}")
-            skipped += 1
+            retries.extend(collect_batch(jobs.get(job_id), agent, collection, jobs))
         except Exception as e:
-            print(f"  → Error saving article: {e}")
-            skipped += 1
+            # The job stays queued (or is re-queued once stale) for a later run.
+            print(f"Batch job {job_id}: could not be collected: {e}")
+    retry_posts, attempts = [], {}
+    if retries:
+        existing = set(collection.get_source_instagram_ids([post["instagram_id"] for post, _ in retries]))
+        for post, tried in retries:
+            if post["instagram_id"] in existing:
+                continue
+            if tried >= BATCH_MAX_ATTEMPTS:
+                print(f"Giving up on post {post['instagram_id']} after {tried} batch attempts.")
+                continue
+            retry_posts.append(post)
+            attempts[post["instagram_id"]] = tried
+
+    state = sync_state.get(SYNC_SOURCE, USERNAME) or {}
+    walk, new_posts = fetch_new_posts(collection, state)
+    pending_ids = {
+        post["instagram_id"]
+        for job_id in jobs.queued_ids(BATCH_JOB_KIND)
+        for post in jobs.get(job_id)["params"]["posts"]
+    }
+    to_submit = {}
+    for post in retry_posts + new_posts:
+        if post["instagram_id"] not in pending_ids:
+            to_submit.setdefault(post["instagram_id"], post)
 
-    print(f"\nDone! Imported: {imported}, Skipped: {skipped}")
+    if to_submit:
+        submit_batch(list(to_submit.values()), agent, jobs, attempts)
+    else:
+        print("Nothing to submit.")
+    # Submitted posts are tracked by their batch job from here on.
+    save_sync_state(sync_state, state, walk, set())
 
 
 if __name__ == "__main__":
-    sync_instagram_posts()
+    parser = argparse.ArgumentParser(description="Import Instagram posts as draft articles")
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Use the OpenAI Batch API: collect finished batches, then submit new posts",
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        sync_instagram_posts_batch()
+    else:
+        sync_instagram_posts()
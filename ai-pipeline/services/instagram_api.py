@@ -1,7 +1,7 @@
 import http.client
 import json
 import os
-from typing import Optional
+from typing import Iterator, Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -15,12 +15,14 @@ class InstagramAPI:
             )
         self.host = host
 
-    def get_posts(self, username: str, max_id: str = "") -> str:
+    def get_posts(self, username: str, max_id: str = "", conn: Optional[http.client.HTTPSConnection] = None) -> dict:
         """
-        Fetch posts for the given Instagram username via RapidAPI.
-        Returns the raw JSON response as a string.
+        Fetch one page of posts for the given Instagram username via RapidAPI.
+        Returns the parsed JSON response; pass `next_max_id(response)` as
+        `max_id` to get the following (older) page.
         """
-        conn = http.client.HTTPSConnection(self.host)
+        own_conn = conn is None
+        conn = conn or http.client.HTTPSConnection(self.host)
         payload = json.dumps({"username": username, "maxId": max_id})
 
         headers = {
@@ -29,8 +31,36 @@ class InstagramAPI:
             "Content-Type": "application/json",
         }
 
-        conn.request("POST", "/api/instagram/posts", payload, headers)
-        res = conn.getresponse()
-        data = res.read()
-        conn.close()
-        return json.loads(data.decode("utf-8"))
\ No newline at end of file
+        try:
+            conn.request("POST", "/api/instagram/posts", payload, headers)
+            res = conn.getresponse()
+            data = res.read()
+        finally:
+            if own_conn:
+                conn.close()
+        return json.loads(data.decode("utf-8"))
+
+    @staticmethod
+    def next_max_id(response: dict) -> str:
+        """Cursor of the next (older) page, or "" on the last page."""
+        result = response.get("result") or {}
+        page_info = result.get("page_info") or {}
+        if page_info.get("has_next_page") is False:
+            return ""
+        return page_info.get("end_cursor") or result.get("next_max_id") or ""
+
+    def iter_post_pages(self, username: str, max_pages: int, max_id: str = "") -> Iterator[dict]:
+        """
+        Pages of posts, newest first (or from the `max_id` cursor on), over one
+        keep-alive connection; stop iterating to stop fetching.
+        """
+        conn = http.client.HTTPSConnection(self.host)
+        try:
+            for _ in range(max_pages):
+                response = self.get_posts(username, max_id=max_id, conn=conn)
+                yield response
+                max_id = self.next_max_id(response)
+                if not max_id:
+                    break
+        finally:
+            conn.close()
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from dbase.media_store import CHUNK_SIZE, MediaStore, MediaTooLarge
+
+EXT_MAP = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "video/mp4": ".mp4",
+    "video/quicktime": ".mov",
+    "video/webm": ".webm",
+}
+VIDEO_EXTS = (".mp4", ".mov", ".webm")
+
+
+class MediaDownloader:
+    """
+    Concurrent media downloader for the pipeline.
+
+    - one keep-alive requests.Session shared by a bounded thread pool,
+    - at most `per_host` simultaneous downloads per host (Instagram CDNs throttle),
+    - streamed through the content-addressed MediaStore, so media that is
+      already stored (re-imports, reposted photos) is not written twice,
+    - downloads above `max_bytes` are aborted,
+    - aggregate throughput is available through `report()`.
+    """
+
+    def __init__(
+        self,
+        media_root: Path,
+        max_workers: Optional[int] = None,
+        per_host: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timeout: float = 60,
+    ):
+        self.store = MediaStore(media_root)
+        self.max_workers = max_workers or int(os.getenv("MEDIA_DOWNLOAD_WORKERS", "8"))
+        self.per_host = per_host or int(os.getenv("MEDIA_DOWNLOAD_PER_HOST", "4"))
+        self.max_bytes = max_bytes or int(os.getenv("MEDIA_MAX_BYTES", str(200 * 1024 * 1024)))
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers, max_retries=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="media")
+
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._files = 0
+        self._reused = 0
+        self._failures = 0
+        self._bytes = 0
+        self._busy_since = None
+        self._busy_seconds = 0.0
+        self._active = 0
+
+    def submit(self, url: str) -> Future:
+        """Schedule a download; the future resolves to the /media/... path, or "" on failure."""
+        return self.executor.submit(self.download, url)
+
+    def download(self, url: str) -> str:
+        self._enter()
+        try:
+            with self._host_slot(url):
+                return self._download(url)
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+            print(f"  → Failed to download media: {e}")
+            return ""
+        finally:
+            self._leave()
+
+    def _download(self, url: str) -> str:
+        with self.session.get(url, timeout=self.timeout, stream=True) as resp:
+            resp.raise_for_status()
+            length = int(resp.headers.get("Content-Length") or 0)
+            if length > self.max_bytes:
+                raise MediaTooLarge(f"{url} is {length} bytes (limit {self.max_bytes})")
+
+            # Determine file extension from Content-Type header
+            ct_clean = resp.headers.get("Content-Type", "").split(";")[0].strip()
+            ext = EXT_MAP.get(ct_clean) or (".mp4" if ct_clean.startswith("video/") else ".jpg")
+
+            media_url, created, size = self.store.save_stream(
+                resp.iter_content(chunk_size=CHUNK_SIZE), ext, self.max_bytes
+            )
+
+        with self._lock:
+            self._files += 1
+            self._bytes += size
+            self._reused += 0 if created else 1
+        kind = "video" if ext in VIDEO_EXTS else "image"
+        state = "Downloaded" if created else "Already stored"
+        print(f"  → {state} {kind}: {media_url} ({size // 1024} KB)")
+        return media_url
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    # Wall-clock time with at least one download in flight, for throughput.
+    def _enter(self):
+        with self._lock:
+            if self._active == 0:
+                self._busy_since = time.monotonic()
+            self._active += 1
+
+    def _leave(self):
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._busy_seconds += time.monotonic() - self._busy_since
+
+    def report(self) -> str:
+        with self._lock:
+            seconds = self._busy_seconds
+            if self._active:
+                seconds += time.monotonic() - self._busy_since
+            mb = self._bytes / (1024 * 1024)
+            rate = mb / seconds if seconds else 0.0
+            return (
+                f"Media: {self._files} files, {mb:.1f} MB in {seconds:.1f}s "
+                f"({rate:.2f} MB/s), {self._reused} already stored, {self._failures} failed"
+            )
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.session.close()
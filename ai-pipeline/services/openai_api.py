@@ -1,9 +1,10 @@
-import os
 import json
+import os
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
-from openai import OpenAI
+
+from openai_gateway.gateway import OpenAIGateway, get_gateway
 
 load_dotenv()
 
@@ -14,65 +15,78 @@ class OpenAIAPI:
         model: str = "gpt-4o-mini",
         base_url: Optional[str] = None,
     ):
-        api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError(
-                "OPENAI_API_KEY is not set. Add it to your environment or pass api_key explicitly."
-            )
-
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        # The shared gateway (pooling, rate limits, retries) unless a dedicated key/endpoint is given.
+        if api_key or base_url:
+            self.gateway = OpenAIGateway(api_key=api_key, base_url=base_url)
+        else:
+            self.gateway = get_gateway()
+        self.client = self.gateway.client
         self.model = model
 
-    def create_agent(
+    def complete_json(
         self,
         system_prompt: str,
-        tools: Optional[List[Dict[str, Any]]] = None,
-        response_schema: Optional[Dict[str, Any]] = None,
-    ) -> str:
-        """Создаёт ассистента и возвращает его id."""
-        resp = self.client.beta.assistants.create(
-            name="Pipeline Agent",
-            model=self.model,
-            instructions=system_prompt,
-            tools=tools or [],
-            response_format=self._schema_to_response_format(response_schema),
-        )
-        return resp.id
-
-    def send_messages(
-        self,
-        assistant_id: str,
         messages: List[Dict[str, str]],
         response_schema: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> Any:
         """
-        Шлёт сообщения ассистенту и ждёт завершения run.
-        messages: [{"role": "user"|"assistant"|"system", "content": "..."}]
-        Возвращает JSON-совместимый словарь при включённом schema.
+        Один вызов chat.completions: системный промпт inline, строгая JSON-схема.
+        messages: [{"role": "user"|"assistant", "content": "..."}]
+        Возвращает разобранный JSON (или сырой текст, если он не JSON).
         """
-        thread = self.client.beta.threads.create(messages=messages)
-        run = self.client.beta.threads.runs.create_and_poll(
-            assistant_id=assistant_id,
-            thread_id=thread.id,
-            response_format=self._schema_to_response_format(response_schema),
+        response = self.gateway.chat(
+            model=self.model,
+            messages=[{"role": "system", "content": system_prompt}, *messages],
+            response_format=response_format or self._schema_to_response_format(response_schema),
         )
+        content = response.choices[0].message.content or ""
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return content
 
-        last_msg = self.client.beta.threads.messages.list(thread_id=thread.id, limit=1).data[0]
-        content_item = last_msg.content[0]
-        if hasattr(content_item, "text"):
-            response_dict = content_item.text.to_dict()
-        else:
-            response_dict = content_item.to_dict()
+    def submit_batch(self, input_path: str, endpoint: str = "/v1/chat/completions") -> Any:
+        """Загружает JSONL-файл запросов и создаёт batch (окно выполнения 24h)."""
+        # Bytes, not the handle: a retried upload would re-send a file already read to EOF.
+        with open(input_path, "rb") as f:
+            content = f.read()
+        input_file = self.gateway.call(
+            self.client.files.create, file=(os.path.basename(input_path), content), purpose="batch"
+        )
+        return self.gateway.call(
+            self.client.batches.create,
+            input_file_id=input_file.id,
+            endpoint=endpoint,
+            completion_window="24h",
+        )
 
-        # OpenAI text responses wrap the JSON payload as a string under "value".
-        # Parse it so downstream code gets a real JSON object instead of a string.
-        if isinstance(response_dict, dict) and isinstance(response_dict.get("value"), str):
-            try:
-                response_dict["value"] = json.loads(response_dict["value"])
-            except json.JSONDecodeError:
-                pass
+    def retrieve_batch(self, batch_id: str) -> Any:
+        return self.gateway.call(self.client.batches.retrieve, batch_id)
 
-        return response_dict
+    def batch_results(self, file_id: Optional[str]) -> Dict[str, Any]:
+        """
+        Разбирает output/error файл batch: {custom_id: JSON ответа модели | Exception}.
+        """
+        if not file_id:
+            return {}
+        content = self.gateway.call(self.client.files.content, file_id).text
+        results = {}
+        for line in content.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                error = item.get("error") or response.get("body", {}).get("error") or {}
+                results[item["custom_id"]] = RuntimeError(error.get("message") or f"status {response.get('status_code')}")
+                continue
+            message = response["body"]["choices"][0]["message"].get("content") or ""
+            try:
+                results[item["custom_id"]] = json.loads(message)
+            except json.JSONDecodeError as e:
+                results[item["custom_id"]] = RuntimeError(f"Invalid JSON in batch result: {e}")
+        return results
 
     @staticmethod
     def _schema_to_response_format(schema: Optional[Dict[str, Any]]):
@@ -0,0 +1,69 @@
+"""
+Conditional GET helpers for public content endpoints.
+
+Validators are computed from cheap collection metadata (document count and the
+newest `updated_at`), so a matching If-None-Match / If-Modified-Since is
+answered with 304 before the response body or response model is built.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Bump to invalidate every client-side copy after a response-shape change.
+CONTENT_VERSION = os.getenv("CONTENT_VERSION", "1")
+
+PUBLIC_CACHE_CONTROL = os.getenv("PUBLIC_CACHE_CONTROL", "public, max-age=60, stale-while-revalidate=300")
+PRIVATE_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the given validator parts."""
+    raw = "|".join(str(part) for part in (CONTENT_VERSION, *parts))
+    return f'"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence; weak comparison is allowed for GET.
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime], cache_control: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, last_modified: Optional[datetime], cache_control: str = PUBLIC_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified, cache_control))
+
+
+def set_cache_headers(
+    response: Response, etag: str, last_modified: Optional[datetime], cache_control: str = PUBLIC_CACHE_CONTROL
+):
+    response.headers.update(cache_headers(etag, last_modified, cache_control))
@@ -1,5 +1,8 @@
 import os
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from api.routers.posts_router import router
 from api.routers.application_router import router as application_router
 from api.routers.dekostavby_router import dekostavby_router
@@ -7,10 +10,48 @@ from api.routers.articles_router import articles_router
 from api.routers.media_router import media_router
 from api.routers.pipeline_router import pipeline_router
 from api.routers.team_router import router as team_router
+from api.routers.system_router import system_router
+from api.routers.feeds_router import feeds_router
+from api.routers.jobs_router import jobs_router
+from api.services.localization import localization_queue
+from dbase.driver import close_async_pools, close_pools, open_async_pools, open_pools
+from dbase.indexes import ensure_all_indexes
+from dbase.change_streams import watcher
+from api.static_export import exporter
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # One shared MongoDB pool per worker, opened before the first request.
+    open_pools()
+    await open_async_pools()
+    if os.getenv("MONGODB_ENSURE_INDEXES", "1") == "1":
+        try:
+            await run_in_threadpool(ensure_all_indexes)
+        except Exception as e:
+            print(f"Index setup failed: {e}")
+    if os.getenv("MONGODB_CHANGE_STREAMS", "1") == "1":
+        # Picks up writes from other workers and the pipeline subprocess.
+        watcher.start()
+    if os.getenv("STATIC_EXPORT", "0") == "1":
+        exporter.start()
+    try:
+        await run_in_threadpool(localization_queue.start)
+    except Exception as e:
+        print(f"Localization workers failed to start: {e}")
+    yield
+    localization_queue.shutdown()
+    if os.getenv("STATIC_EXPORT", "0") == "1":
+        exporter.stop()
+    if os.getenv("MONGODB_CHANGE_STREAMS", "1") == "1":
+        watcher.stop()
+    await close_async_pools()
+    close_pools()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +68,9 @@ app.include_router(articles_router)
 app.include_router(media_router)
 app.include_router(pipeline_router)
 app.include_router(team_router)
+app.include_router(system_router)
+app.include_router(feeds_router)
+app.include_router(jobs_router)
 
 # Default matches the ai-pipeline default: backend/media/ (one level above api/)
 _default_media = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "media")
@@ -1,196 +1,263 @@
+import asyncio
 import json
-import os
-from pathlib import Path
-from typing import List, Optional
+from functools import partial
+from typing import List, Literal, Optional
 
-from dotenv import load_dotenv
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from openai import OpenAI
-
-# Load .env from the ai-pipeline directory where OPENAI_API_KEY is stored
-_env_path = Path(__file__).resolve().parents[2] / "ai-pipeline" / ".env"
-load_dotenv(_env_path)
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from api.serialization import TrustedSerializer, render_page, respond
 from api.schemas.ArticleSchema import (
+    ArticleBulkRequest,
+    ArticleBulkResponse,
+    ArticleCard,
+    ArticleCardPage,
     ArticleCreate,
+    ArticleFilterPage,
     ArticleResponse,
+    ArticleSearchHit,
     ArticleUpdate,
     LanguageCode,
     LocalizeRequest,
-    LocalizeResponse,
+)
+from api.schemas.JobSchema import JobResponse
+from api.services.localization import (
+    LocalizationError,
+    localization_queue,
+    localize_language,
+    normalize_target_langs,
+    write_back,
 )
 from api.dependencies.auth import require_admin
-from dbase.collections.ArticleCollection import ArticleCollection
+from api.http_cache import (
+    PRIVATE_CACHE_CONTROL,
+    PUBLIC_CACHE_CONTROL,
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from dbase.collections.ArticleCollection import AsyncArticleCollection
 
 articles_router = APIRouter(prefix="/articles", tags=["articles"])
 
-LANGUAGE_NAMES = {"cs": "Czech", "en": "English", "uk": "Ukrainian", "ru": "Russian"}
+articles_db = AsyncArticleCollection()
 
+article_serializer = TrustedSerializer(ArticleResponse)
+card_serializer = TrustedSerializer(ArticleCard)
+render_card_page = partial(render_page, card_serializer)
 
-def apply_translation(article: dict, lang: Optional[LanguageCode]) -> dict:
-    if not lang:
-        return article
 
-    translations = article.get("translations") or {}
-    localized = translations.get(lang)
-    if not localized:
-        return article
+@articles_router.get("", response_model=List[ArticleResponse])
+async def list_articles(
+    request: Request,
+    response: Response,
+    status: Optional[str] = Query(default=None, regex="^(draft|published)$"),
+    lang: Optional[LanguageCode] = Query(default=None, description="Optional language code to localize response"),
+):
+    version = await articles_db.version(status=status)
+    etag = make_etag("articles", status, lang, version["count"], version["updated_at"])
+    cache_control = PUBLIC_CACHE_CONTROL if status == "published" else PRIVATE_CACHE_CONTROL
+    if is_not_modified(request, etag, version["updated_at"]):
+        return not_modified(etag, version["updated_at"], cache_control)
 
-    merged = article.copy()
-    for field in ("title", "subtitle", "location", "body", "tags", "key_metrics", "gallery", "blocks"):
-        value = localized.get(field) if isinstance(localized, dict) else getattr(localized, field, None)
-        if value is not None:
-            merged[field] = value
-    return merged
+    set_cache_headers(response, etag, version["updated_at"], cache_control)
+    articles = await articles_db.list(status=status, lang=lang)
+    return respond(articles, response, article_serializer.dumps_many)
 
 
-@articles_router.get("", response_model=List[ArticleResponse])
-def list_articles(
+@articles_router.get("/cards", response_model=ArticleCardPage)
+async def list_article_cards(
+    request: Request,
+    response: Response,
     status: Optional[str] = Query(default=None, regex="^(draft|published)$"),
     lang: Optional[LanguageCode] = Query(default=None, description="Optional language code to localize response"),
+    limit: int = Query(default=24, ge=1, le=100),
+    after: Optional[str] = Query(default=None, description="Cursor returned as `next_cursor` by the previous page"),
+):
+    """Keyset-paginated listing cards, newest first."""
+    version = await articles_db.version(status=status)
+    etag = make_etag("cards", status, lang, limit, after, version["count"], version["updated_at"])
+    cache_control = PUBLIC_CACHE_CONTROL if status == "published" else PRIVATE_CACHE_CONTROL
+    if is_not_modified(request, etag, version["updated_at"]):
+        return not_modified(etag, version["updated_at"], cache_control)
+
+    set_cache_headers(response, etag, version["updated_at"], cache_control)
+    try:
+        page = await articles_db.list_cards(status=status, lang=lang, limit=limit, after=after)
+    except ValueError as exc:
+        # `status` is shadowed by the query parameter here.
+        raise HTTPException(status_code=400, detail=str(exc))
+    return respond(page, response, render_card_page)
+
+
+@articles_router.get("/filter", response_model=ArticleFilterPage)
+async def filter_articles(
+    request: Request,
+    response: Response,
+    post_type: Optional[Literal["sale", "rent"]] = None,
+    min_price: Optional[float] = Query(default=None, ge=0),
+    max_price: Optional[float] = Query(default=None, ge=0),
+    currency: Optional[Literal["CZK", "EUR", "USD"]] = None,
+    min_area: Optional[float] = Query(default=None, ge=0, description="Minimum area in m²"),
+    max_area: Optional[float] = Query(default=None, ge=0, description="Maximum area in m²"),
+    disposition: Optional[List[str]] = Query(default=None, description="Dispositions such as 2+kk, 3+1"),
+    tags: Optional[List[str]] = Query(default=None),
+    location: Optional[str] = Query(default=None, max_length=200),
+    lang: Optional[LanguageCode] = Query(default=None, description="Optional language code to localize response"),
+    limit: int = Query(default=24, ge=1, le=100),
+    after: Optional[str] = Query(default=None, description="Cursor returned as `next_cursor` by the previous page"),
+):
+    """Filter published listings by parsed price/area/disposition with facet counts."""
+    filters = {
+        "post_type": post_type,
+        "min_price": min_price,
+        "max_price": max_price,
+        "currency": currency,
+        "min_area": min_area,
+        "max_area": max_area,
+        "dispositions": disposition,
+        "tags": tags,
+        "location": location,
+    }
+    version = await articles_db.version(status="published")
+    etag = make_etag("filter", sorted(filters.items()), lang, limit, after, version["count"], version["updated_at"])
+    if is_not_modified(request, etag, version["updated_at"]):
+        return not_modified(etag, version["updated_at"])
+
+    set_cache_headers(response, etag, version["updated_at"])
+    try:
+        page = await articles_db.filter(filters, lang=lang, limit=limit, after=after)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return respond(page, response, render_card_page)
+
+
+@articles_router.get("/search", response_model=List[ArticleSearchHit])
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200, description="Free-text query, e.g. '2+kk Praha 3'"),
+    lang: Optional[LanguageCode] = Query(default=None, description="Optional language code to localize response"),
+    limit: int = Query(default=20, ge=1, le=100),
 ):
-    collection = ArticleCollection()
-    articles = collection.list(status=status)
-    return [apply_translation(article, lang) for article in articles]
+    """Full-text search over published articles in every language, ranked by BM25."""
+    return await articles_db.search(q, lang=lang, limit=limit)
 
 
 @articles_router.get("/{slug}", response_model=ArticleResponse)
-def get_article(
+async def get_article(
+    request: Request,
+    response: Response,
     slug: str,
     lang: Optional[LanguageCode] = Query(default=None, description="Optional language code to localize response"),
 ):
-    collection = ArticleCollection()
-    article = collection.get(slug)
+    version = await articles_db.article_version(slug)
+    if not version:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+
+    etag = make_etag("article", slug, lang, version["updated_at"])
+    cache_control = PUBLIC_CACHE_CONTROL if version["status"] == "published" else PRIVATE_CACHE_CONTROL
+    if is_not_modified(request, etag, version["updated_at"]):
+        return not_modified(etag, version["updated_at"], cache_control)
+
+    set_cache_headers(response, etag, version["updated_at"], cache_control)
+    article = await articles_db.get(slug, lang=lang)
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
-    return apply_translation(article, lang)
+    return respond(article, response, article_serializer.dumps)
 
 
 @articles_router.post("", response_model=ArticleResponse, status_code=status.HTTP_201_CREATED)
-def create_article(payload: ArticleCreate, _admin: dict = Depends(require_admin)):
-    collection = ArticleCollection()
+async def create_article(payload: ArticleCreate, _admin: dict = Depends(require_admin)):
     try:
-        return collection.create(payload.dict())
+        return await articles_db.create(payload.dict())
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
 
 
+@articles_router.post("/bulk", response_model=ArticleBulkResponse)
+async def bulk_articles(payload: ArticleBulkRequest, _admin: dict = Depends(require_admin)):
+    """Publish, unpublish, retag or delete many articles in one request; returns per-item results."""
+    operations = [operation.model_dump() for operation in payload.operations]
+    return await articles_db.bulk(operations)
+
+
 @articles_router.put("/{slug}", response_model=ArticleResponse)
-def update_article(slug: str, payload: ArticleUpdate, _admin: dict = Depends(require_admin)):
-    collection = ArticleCollection()
+async def update_article(slug: str, payload: ArticleUpdate, _admin: dict = Depends(require_admin)):
     updates = payload.dict(exclude_unset=True)
-    article = collection.update(slug, updates)
+    article = await articles_db.update(slug, updates)
     if not article:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     return article
 
 
 @articles_router.delete("/{slug}")
-def delete_article(slug: str, _admin: dict = Depends(require_admin)):
-    collection = ArticleCollection()
-    deleted = collection.delete(slug)
+async def delete_article(slug: str, _admin: dict = Depends(require_admin)):
+    deleted = await articles_db.delete(slug)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
     return {"message": "Article deleted"}
 
 
-@articles_router.post("/{slug}/localize", response_model=LocalizeResponse)
-def localize_article(slug: str, payload: LocalizeRequest, _admin: dict = Depends(require_admin)):
-    """Translate base Ukrainian article content into English, Czech, and Russian."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="OPENAI_API_KEY is not configured on the server.",
-        )
-
-    # Base content is always Ukrainian; targets are always en, cs, ru
-    source_lang = "uk"
-    target_langs = ["en", "cs", "ru"]
-
-    collection = ArticleCollection()
-    article = collection.get(slug)
-    if not article:
+@articles_router.post("/{slug}/localize", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def localize_article(slug: str, payload: LocalizeRequest, _admin: dict = Depends(require_admin)):
+    """
+    Queue translation of the base Ukrainian content into English, Czech and Russian.
+    The result is written into the article's `translations`; poll `GET /jobs/{id}`.
+    """
+    if not await articles_db.article_version(slug):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
 
-    # Build the source content dict (Ukrainian base) to send to the model
-    source_content = {
-        "title": article.get("title", ""),
-        "subtitle": article.get("subtitle", ""),
-        "location": article.get("location", ""),
-        "body": article.get("body", ""),
-    }
+    try:
+        return await run_in_threadpool(localization_queue.submit, slug, normalize_target_langs(payload.target_langs))
+    except LocalizationError as exc:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc))
 
-    key_metrics = article.get("key_metrics") or []
-    if key_metrics:
-        source_content["key_metrics"] = [
-            {"label": m.get("label", ""), "value": m.get("value", ""), "helper": m.get("helper", "")}
-            for m in key_metrics
-        ]
 
-    target_lang_names = {code: LANGUAGE_NAMES[code] for code in target_langs}
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-    target_langs_description = ", ".join(
-        f'"{code}" ({name})' for code, name in target_lang_names.items()
-    )
 
-    system_prompt = (
-        "You are a professional real-estate copywriter and translator. "
-        "You receive a property listing in Ukrainian and translate it into the requested target languages. "
-        "Preserve the tone, marketing appeal, and all factual details (numbers, addresses, proper nouns). "
-        "Location names that are proper nouns (street names, city districts) should stay in their original form. "
-        "Return ONLY valid JSON — no markdown fences, no commentary."
-    )
-
-    user_prompt = (
-        f"Source language: Ukrainian (uk).\n"
-        f"Target languages: {target_langs_description}.\n\n"
-        f"Source content (Ukrainian):\n{json.dumps(source_content, ensure_ascii=False, indent=2)}\n\n"
-        "Translate all text fields into each target language. "
-        "Return a JSON object with this exact structure:\n"
-        "{\n"
-        '  "translations": {\n'
-        '    "<lang_code>": {\n'
-        '      "title": "...",\n'
-        '      "subtitle": "...",\n'
-        '      "location": "...",\n'
-        '      "body": "...",\n'
-        '      "key_metrics": [{"label": "...", "value": "...", "helper": "..."}]\n'
-        "    }\n"
-        "  }\n"
-        "}\n"
-        "Include a key for every target language code (en, cs, ru). "
-        "If there are no key_metrics in the source, omit the key_metrics field."
+@articles_router.post("/{slug}/localize/stream")
+async def localize_article_stream(slug: str, payload: LocalizeRequest, _admin: dict = Depends(require_admin)):
+    """
+    Localize with one concurrent request per target language, streaming each
+    finished language as a Server-Sent Event (`language`, `error`, then `done`).
+    Every finished language is written into `translations` right away.
+    """
+    article = await articles_db.get(slug)
+    if not article:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Article not found")
+    target_langs = normalize_target_langs(payload.target_langs)
+
+    async def run_language(lang: str) -> dict:
+        try:
+            result = await run_in_threadpool(localize_language, article, lang)
+            await run_in_threadpool(write_back, slug, {lang: result["translation"]})
+            return result
+        except Exception as exc:
+            return {"lang": lang, "error": str(exc)}
+
+    async def events():
+        tasks = [asyncio.ensure_future(run_language(lang)) for lang in target_langs]
+        completed, failed = [], []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if "error" in result:
+                    failed.append(result["lang"])
+                    yield _sse("error", result)
+                else:
+                    completed.append(result["lang"])
+                    yield _sse("language", result)
+            yield _sse("done", {"completed": completed, "failed": failed})
+        finally:
+            # Client went away: stop waiting on the remaining languages.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-
-    try:
-        client = OpenAI(api_key=api_key)
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            temperature=0.3,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
-        raw = response.choices[0].message.content or ""
-        # Strip markdown fences if present
-        cleaned = raw.strip()
-        if cleaned.startswith("```"):
-            cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned[3:]
-        if cleaned.endswith("```"):
-            cleaned = cleaned[:-3]
-        result = json.loads(cleaned.strip())
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail="AI returned invalid JSON. Please try again.",
-        )
-    except Exception as exc:
-        raise HTTPException(
-            status_code=status.HTTP_502_BAD_GATEWAY,
-            detail=f"AI localization failed: {exc}",
-        )
-
-    return result
-
@@ -0,0 +1,132 @@
+"""
+Crawler discovery endpoints: sitemap.xml with hreflang alternates and
+per-language Atom feeds of published articles.
+
+Both are rendered from the incrementally maintained feed index (see
+dbase/feeds.py), streamed in chunks, and answered with 304 when the
+client's validators still match.
+"""
+
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from fastapi import APIRouter, Path, Request
+from fastapi.responses import StreamingResponse
+
+from api.http_cache import cache_headers, is_not_modified, make_etag, not_modified
+from dbase.collections.ArticleCollection import VIEW_LANGS, AsyncArticleCollection
+
+feeds_router = APIRouter(tags=["feeds"])
+
+articles_db = AsyncArticleCollection()
+
+SITE_URL = os.getenv("SITE_URL", "https://realdekogroup.cz").rstrip("/")
+API_URL = os.getenv("API_URL", "https://api.realdekogroup.cz").rstrip("/")
+ARTICLE_URL_TEMPLATE = os.getenv("ARTICLE_URL_TEMPLATE", "{site}/{lang}/articles/{slug}")
+DEFAULT_LANG = os.getenv("SITE_DEFAULT_LANG", "cs")
+FEED_TITLE = os.getenv("FEED_TITLE", "Realdeko Group")
+FEED_SIZE = int(os.getenv("FEED_SIZE", "50"))
+FEED_CACHE_CONTROL = os.getenv("FEED_CACHE_CONTROL", "public, max-age=300, stale-while-revalidate=3600")
+
+# Entries rendered per streamed chunk.
+CHUNK_SIZE = 200
+
+
+def article_url(slug: str, lang: str) -> str:
+    return ARTICLE_URL_TEMPLATE.format(site=SITE_URL, lang=lang, slug=slug)
+
+
+def _w3c_date(value: Optional[datetime]) -> str:
+    # Stored datetimes are naive UTC.
+    return (value or datetime.utcnow()).replace(microsecond=0).isoformat() + "Z"
+
+
+def _chunked(entries: List[dict], render) -> Iterator[str]:
+    for start in range(0, len(entries), CHUNK_SIZE):
+        yield "".join(render(entry) for entry in entries[start:start + CHUNK_SIZE])
+
+
+def _sitemap_url(entry: dict) -> str:
+    alternates = "".join(
+        f'<xhtml:link rel="alternate" hreflang="{lang}" href={quoteattr(article_url(entry["slug"], lang))}/>'
+        for lang in VIEW_LANGS
+    )
+    alternates += (
+        f'<xhtml:link rel="alternate" hreflang="x-default" href={quoteattr(article_url(entry["slug"], DEFAULT_LANG))}/>'
+    )
+    lastmod = _w3c_date(entry.get("updated_at"))
+    return "".join(
+        f"<url><loc>{escape(article_url(entry['slug'], lang))}</loc><lastmod>{lastmod}</lastmod>{alternates}</url>\n"
+        for lang in VIEW_LANGS
+    )
+
+
+def render_sitemap(entries: List[dict]) -> Iterator[str]:
+    # One <url> per article and language; a single sitemap holds up to 50k URLs
+    # (12.5k articles), far above the current catalogue size.
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+    )
+    yield from _chunked(entries, _sitemap_url)
+    yield "</urlset>\n"
+
+
+def render_atom(entries: List[dict], lang: str, updated: Optional[datetime]) -> Iterator[str]:
+    self_url = f"{API_URL}/feeds/{lang}.atom"
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="{lang}">\n'
+        f"<id>{escape(self_url)}</id>\n"
+        f"<title>{escape(FEED_TITLE)}</title>\n"
+        f"<updated>{_w3c_date(updated)}</updated>\n"
+        f"<link rel=\"self\" href={quoteattr(self_url)}/>\n"
+        f"<link rel=\"alternate\" href={quoteattr(f'{SITE_URL}/{lang}')}/>\n"
+    )
+
+    def render_entry(entry: dict) -> str:
+        url = article_url(entry["slug"], lang)
+        view = entry["views"].get(lang) or {}
+        summary = f"<summary>{escape(view['subtitle'])}</summary>" if view.get("subtitle") else ""
+        return (
+            f"<entry><id>{escape(url)}</id><title>{escape(view.get('title') or entry['slug'])}</title>"
+            f"<link rel=\"alternate\" href={quoteattr(url)}/>"
+            f"<published>{_w3c_date(entry.get('created_at'))}</published>"
+            f"<updated>{_w3c_date(entry.get('updated_at'))}</updated>{summary}</entry>\n"
+        )
+
+    yield from _chunked(entries, render_entry)
+    yield "</feed>\n"
+
+
+@feeds_router.get("/sitemap.xml")
+async def sitemap(request: Request):
+    index = await articles_db.feed()
+    version = index.version()
+    etag = make_etag("sitemap", SITE_URL, version["count"], version["fingerprint"])
+    if is_not_modified(request, etag, version["last_modified"]):
+        return not_modified(etag, version["last_modified"], FEED_CACHE_CONTROL)
+
+    return StreamingResponse(
+        render_sitemap(index.snapshot()),
+        media_type="application/xml",
+        headers=cache_headers(etag, version["last_modified"], FEED_CACHE_CONTROL),
+    )
+
+
+@feeds_router.get("/feeds/{lang}.atom")
+async def atom_feed(request: Request, lang: str = Path(regex="^(cs|en|uk|ru)$")):
+    index = await articles_db.feed()
+    version = index.version()
+    etag = make_etag("atom", lang, SITE_URL, FEED_SIZE, version["count"], version["fingerprint"])
+    if is_not_modified(request, etag, version["last_modified"]):
+        return not_modified(etag, version["last_modified"], FEED_CACHE_CONTROL)
+
+    return StreamingResponse(
+        render_atom(index.latest(FEED_SIZE), lang, version["last_modified"]),
+        media_type="application/atom+xml",
+        headers=cache_headers(etag, version["last_modified"], FEED_CACHE_CONTROL),
+    )
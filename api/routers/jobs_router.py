@@ -0,0 +1,22 @@
+"""
+Status of background jobs (AI localization) started from the admin UI.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from api.dependencies.auth import require_admin
+from api.schemas.JobSchema import JobResponse
+from dbase.collections.JobCollection import AsyncJobCollection
+
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+jobs_db = AsyncJobCollection()
+
+
+@jobs_router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, _admin: dict = Depends(require_admin)):
+    """Return the status (and, once completed, the result) of a background job."""
+    job = await jobs_db.get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
@@ -1,15 +1,17 @@
 import os
-import uuid
 from pathlib import Path
 from urllib.parse import urlparse
 
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
 from api.dependencies.auth import require_admin
+from dbase.media_store import CHUNK_SIZE, MediaStore, MediaTooLarge
 
 MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", "media"))
-MEDIA_ROOT.mkdir(parents=True, exist_ok=True)
+MEDIA_MAX_BYTES = int(os.getenv("MEDIA_MAX_BYTES", str(200 * 1024 * 1024)))
+media_store = MediaStore(MEDIA_ROOT)
 
 media_router = APIRouter(prefix="/media", tags=["media"])
 
@@ -21,17 +23,21 @@ async def upload_media(file: UploadFile = File(...), _admin: dict = Depends(requ
 
     extension = Path(file.filename).suffix
     safe_extension = extension if len(extension) <= 5 else ""
-    target_name = f"{uuid.uuid4().hex}{safe_extension}"
-    target_path = MEDIA_ROOT / target_name
 
+    # Streamed from the spooled upload in chunks and hashed on the way;
+    # identical content resolves to the already stored file.
+    chunks = iter(lambda: file.file.read(CHUNK_SIZE), b"")
     try:
-        with target_path.open("wb") as buffer:
-            buffer.write(await file.read())
+        url, _created, _size = await run_in_threadpool(
+            media_store.save_stream, chunks, safe_extension, MEDIA_MAX_BYTES
+        )
+    except MediaTooLarge:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File is too large")
     except Exception:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to save file")
 
     # Return a relative URL that is served by StaticFiles in main.py
-    return JSONResponse({"url": f"/media/{target_name}"})
+    return JSONResponse({"url": url})
 
 
 def _resolve_path_from_url(url: str) -> Path:
@@ -51,10 +57,10 @@ async def delete_media(url: str, _admin: dict = Depends(require_admin)):
     if not url:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="url is required")
     target_path = _resolve_path_from_url(url)
-    if target_path.exists():
-        try:
-            target_path.unlink()
-        except Exception:
-            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete file")
+    # Deduplicated files may be shared: only the last reference removes the file.
+    try:
+        await run_in_threadpool(media_store.release, target_path.relative_to(MEDIA_ROOT).as_posix())
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete file")
     return {"message": "deleted"}
 
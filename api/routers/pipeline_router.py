@@ -13,6 +13,7 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from api.dependencies.auth import require_admin
+from dbase.invalidation import invalidate
 
 pipeline_router = APIRouter(prefix="/pipeline", tags=["pipeline"])
 
@@ -78,6 +79,10 @@ def _run_pipeline():
         _set_state("failed", finished_at=datetime.utcnow().isoformat(), error="Pipeline timed out (10 min limit)")
     except Exception as exc:
         _set_state("failed", finished_at=datetime.utcnow().isoformat(), error=str(exc)[:2000])
+    finally:
+        # The pipeline inserts draft articles from a separate process, so
+        # drop this worker's article caches once it is done.
+        invalidate("articles")
 
 
 # ── Endpoints ────────────────────────────────────────────────────────────────
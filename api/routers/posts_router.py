@@ -1,11 +1,20 @@
-from fastapi import APIRouter
 from typing import List
-from dbase.collections.PostCollection import PostCollection
+
+from fastapi import APIRouter, Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from api.http_cache import PUBLIC_CACHE_CONTROL, is_not_modified, make_etag, not_modified, set_cache_headers
+from dbase.collections.PostCollection import AsyncPostCollection
 
 router = APIRouter()
+posts_db = AsyncPostCollection()
 
 @router.get("/all_posts")
-def get_all_posts() -> List[dict]:
-    collection = PostCollection()
-    posts = collection.get_all_posts()
-    return posts
\ No newline at end of file
+async def get_all_posts(request: Request, response: Response) -> List[dict]:
+    version = await posts_db.version()
+    etag = make_etag("posts", version["count"], version["updated_at"])
+    if is_not_modified(request, etag, version["updated_at"]):
+        return not_modified(etag, version["updated_at"], PUBLIC_CACHE_CONTROL)
+
+    set_cache_headers(response, etag, version["updated_at"], PUBLIC_CACHE_CONTROL)
+    return jsonable_encoder(await posts_db.get_all_posts())
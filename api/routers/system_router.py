@@ -0,0 +1,37 @@
+"""
+Admin-only operational endpoints (connection pool, cache and OpenAI gateway statistics).
+"""
+
+from fastapi import APIRouter, Depends
+
+from api.dependencies.auth import require_admin
+from dbase.cache import cache_stats
+from dbase.change_streams import watcher
+from dbase.driver import pool_stats
+from openai_gateway.gateway import gateway_stats
+
+system_router = APIRouter(prefix="/system", tags=["system"])
+
+
+@system_router.get("/db-pool")
+def db_pool_stats(_admin: dict = Depends(require_admin)):
+    """Return live MongoDB connection pool statistics for this worker."""
+    return pool_stats()
+
+
+@system_router.get("/cache")
+def in_process_cache_stats(_admin: dict = Depends(require_admin)):
+    """Return hit/miss/eviction counters of the in-process caches of this worker."""
+    return cache_stats()
+
+
+@system_router.get("/changes")
+def change_watcher_stats(_admin: dict = Depends(require_admin)):
+    """Return the mode (change_stream / polling) and event count of this worker's change watcher."""
+    return watcher.stats()
+
+
+@system_router.get("/openai")
+def openai_gateway_stats(_admin: dict = Depends(require_admin)):
+    """Return call, retry, throttling and token counters of this worker's OpenAI gateway."""
+    return gateway_stats() or {}
@@ -1,49 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
 from api.dependencies.auth import require_admin
+from api.http_cache import is_not_modified, make_etag, not_modified, set_cache_headers
+from api.serialization import TrustedSerializer, respond
 from api.schemas.TeamSchema import TeamMemberCreate, TeamMemberResponse, TeamMemberUpdate
-from dbase.collections.TeamCollection import TeamCollection
+from dbase.collections.TeamCollection import AsyncTeamCollection
 
 router = APIRouter(prefix="/team", tags=["team"])
-team_db = TeamCollection()
+team_db = AsyncTeamCollection()
+member_serializer = TrustedSerializer(TeamMemberResponse)
 
 
 @router.get("", response_model=list[TeamMemberResponse])
-def list_team_members():
+async def list_team_members(request: Request, response: Response):
     """List all team members (public endpoint for main page)."""
-    return team_db.list()
+    version = await team_db.version()
+    etag = make_etag("team", version["count"], version["updated_at"])
+    if is_not_modified(request, etag, version["updated_at"]):
+        return not_modified(etag, version["updated_at"])
+
+    set_cache_headers(response, etag, version["updated_at"])
+    members = await team_db.list()
+    return respond(members, response, member_serializer.dumps_many)
 
 
 @router.get("/{member_id}", response_model=TeamMemberResponse)
-def get_team_member(member_id: str):
+async def get_team_member(member_id: str):
     """Get a single team member by ID."""
-    item = team_db.get(member_id)
+    item = await team_db.get(member_id)
     if not item:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team member not found")
     return item
 
 
 @router.post("", response_model=TeamMemberResponse, status_code=status.HTTP_201_CREATED)
-def create_team_member(payload: TeamMemberCreate, _admin: dict = Depends(require_admin)):
+async def create_team_member(payload: TeamMemberCreate, _admin: dict = Depends(require_admin)):
     """Create a new team member."""
     data = payload.model_dump(exclude_none=True)
-    return team_db.create(data)
+    return await team_db.create(data)
 
 
 @router.put("/{member_id}", response_model=TeamMemberResponse)
-def update_team_member(member_id: str, payload: TeamMemberUpdate, _admin: dict = Depends(require_admin)):
+async def update_team_member(member_id: str, payload: TeamMemberUpdate, _admin: dict = Depends(require_admin)):
     """Update a team member."""
     updates = payload.model_dump(exclude_none=True)
-    updated = team_db.update(member_id, updates)
+    updated = await team_db.update(member_id, updates)
     if not updated:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team member not found")
     return updated
 
 
 @router.delete("/{member_id}")
-def delete_team_member(member_id: str, _admin: dict = Depends(require_admin)):
+async def delete_team_member(member_id: str, _admin: dict = Depends(require_admin)):
     """Delete a team member."""
-    deleted = team_db.delete(member_id)
+    deleted = await team_db.delete(member_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team member not found")
     return {"message": "Team member deleted"}
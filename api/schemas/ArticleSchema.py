@@ -117,6 +117,77 @@ class ArticleResponse(ArticleBase):
     updated_at: datetime
 
 
+class ArticleCard(BaseModel):
+    """Lightweight listing projection of an article (localized when ?lang= is set)."""
+    id: str
+    slug: str
+    title: str
+    location: str
+    cover_url: Optional[str] = None
+    price: Optional[str] = None
+    price_on_request: bool = False
+    post_type: Literal["sale", "rent"] = "sale"
+    highlight: bool = False
+    status: Literal["draft", "published"] = "draft"
+    key_metrics: List[KeyMetric] = []
+    created_at: datetime
+
+
+class ArticleSearchHit(ArticleCard):
+    score: float
+
+
+class ArticleCardPage(BaseModel):
+    items: List[ArticleCard]
+    next_cursor: Optional[str] = Field(default=None, description="Pass as `after` to fetch the next page")
+
+
+class FacetValue(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+
+class FacetRange(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    count: int
+
+
+class ArticleFacets(BaseModel):
+    post_type: List[FacetValue] = []
+    disposition: List[FacetValue] = []
+    tags: List[FacetValue] = []
+    price: List[FacetRange] = []
+    area_m2: List[FacetRange] = []
+
+
+class ArticleFilterPage(ArticleCardPage):
+    facets: ArticleFacets
+
+
+class ArticleBulkOperation(BaseModel):
+    slug: str
+    action: Literal["publish", "unpublish", "retag", "delete"]
+    tags: Optional[List[str]] = Field(default=None, description="New tag list, required for `retag`")
+
+
+class ArticleBulkRequest(BaseModel):
+    operations: List[ArticleBulkOperation] = Field(..., min_length=1, max_length=500)
+
+
+class ArticleBulkItemResult(BaseModel):
+    slug: str
+    action: str
+    ok: bool
+    error: Optional[str] = None
+
+
+class ArticleBulkResponse(BaseModel):
+    results: List[ArticleBulkItemResult]
+    succeeded: int
+    failed: int
+
+
 class LocalizeRequest(BaseModel):
     """Payload sent to the AI-localization endpoint.
 
@@ -0,0 +1,64 @@
+"""
+Trusted-output serialization for public read endpoints.
+
+Collection results come from our own validated writes, so re-validating them
+against the response model on every request (discriminated block unions,
+nested translations, ...) is wasted CPU. In trusted mode the route still
+declares `response_model` (so OpenAPI is unchanged), but returns a ready
+Response rendered with orjson after a flat projection to the model's fields.
+
+Set TRUSTED_OUTPUT=0 to fall back to FastAPI's regular validation.
+"""
+
+import os
+from typing import Any, Iterable, Type
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+TRUSTED_OUTPUT = os.getenv("TRUSTED_OUTPUT", "1") == "1"
+
+
+class TrustedSerializer:
+    """
+    Precompiled projection for one response model: keeps only the model's
+    top-level fields and fills in defaults for missing ones. Nested values are
+    emitted as stored.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.fields = tuple(model.model_fields)
+        self.defaults = {
+            name: field.get_default(call_default_factory=True)
+            for name, field in model.model_fields.items()
+            if not field.is_required()
+        }
+
+    def project(self, item: dict) -> dict:
+        defaults = self.defaults
+        return {name: item[name] if name in item else defaults.get(name) for name in self.fields}
+
+    def dumps(self, item: dict) -> bytes:
+        return orjson.dumps(self.project(item))
+
+    def dumps_many(self, items: Iterable[dict]) -> bytes:
+        project = self.project
+        return orjson.dumps([project(item) for item in items])
+
+
+def render_page(serializer: TrustedSerializer, page: dict) -> bytes:
+    """Render a {"items": [...], ...} page, projecting only the items."""
+    return orjson.dumps({**page, "items": [serializer.project(item) for item in page["items"]]})
+
+
+def trusted_response(body: bytes, response: Response) -> Response:
+    """Wrap pre-rendered JSON, carrying over headers set on the injected `response`."""
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+
+def respond(data: Any, response: Response, render) -> Any:
+    """Return `data` through `render(data) -> bytes` in trusted mode, as-is otherwise."""
+    if not TRUSTED_OUTPUT:
+        return data
+    return trusted_response(render(data), response)
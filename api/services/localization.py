@@ -0,0 +1,304 @@
+"""
+AI localization of articles (Ukrainian base -> en / cs / ru) as background jobs.
+
+Only segments without a translation-memory hit (dbase/translation_memory.py)
+are sent to the model, so re-localizing an edited article costs tokens for
+the changed paragraphs / metrics only.
+
+`POST /articles/{slug}/localize` only records a job in Mongo and hands it to
+a bounded thread pool; the OpenAI call and the write-back into the article's
+`translations` happen off the request path. Progress is polled through
+`GET /jobs/{id}`.
+"""
+
+import json
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from dbase.collections.ArticleCollection import ArticleCollection
+from dbase.collections.JobCollection import JobCollection
+from dbase.translation_memory import apply_segments, extract_segments, translation_memory
+from openai_gateway.gateway import get_gateway
+
+# OPENAI_API_KEY lives in the ai-pipeline .env
+load_dotenv(Path(__file__).resolve().parents[2] / "ai-pipeline" / ".env")
+
+JOB_KIND = "localize_article"
+LANGUAGE_NAMES = {"cs": "Czech", "en": "English", "uk": "Ukrainian", "ru": "Russian"}
+SOURCE_LANG = "uk"
+DEFAULT_TARGET_LANGS = ("en", "cs", "ru")
+MODEL = os.getenv("LOCALIZATION_MODEL", "gpt-4o-mini")
+# Extra attempts when the model answers with unparseable JSON.
+JSON_RETRIES = int(os.getenv("LOCALIZATION_JSON_RETRIES", "1"))
+
+SYSTEM_PROMPT = (
+    "You are a professional real-estate copywriter and translator. "
+    "You receive a property listing in Ukrainian and translate it into the requested target languages. "
+    "Preserve the tone, marketing appeal, and all factual details (numbers, addresses, proper nouns). "
+    "Location names that are proper nouns (street names, city districts) should stay in their original form. "
+    "Return ONLY valid JSON — no markdown fences, no commentary."
+)
+
+
+class LocalizationError(Exception):
+    """Raised when an article cannot be localized (missing config, bad AI output)."""
+
+
+def build_source_content(article: dict) -> dict:
+    """The Ukrainian base fields sent to the model."""
+    source_content = {
+        "title": article.get("title", ""),
+        "subtitle": article.get("subtitle", ""),
+        "location": article.get("location", ""),
+        "body": article.get("body", ""),
+    }
+    key_metrics = article.get("key_metrics") or []
+    if key_metrics:
+        source_content["key_metrics"] = [
+            {"label": m.get("label", ""), "value": m.get("value", ""), "helper": m.get("helper", "")}
+            for m in key_metrics
+        ]
+    return source_content
+
+
+def build_user_prompt(segments: Dict[str, str], requests: Dict[str, List[str]]) -> str:
+    """Prompt asking for the segment ids in `requests[lang]` to be translated into each lang."""
+    wanted = ", ".join(f'"{code}" ({LANGUAGE_NAMES[code]})' for code in requests)
+    return (
+        "Source language: Ukrainian (uk).\n"
+        f"Target languages: {wanted}.\n\n"
+        "The segments below are parts of one property listing (title, subtitle, location, "
+        "body paragraphs, key metric labels/values, tags), keyed by segment id:\n"
+        f"{json.dumps(segments, ensure_ascii=False, indent=2)}\n\n"
+        "Segment ids to translate per target language:\n"
+        f"{json.dumps(requests, ensure_ascii=False)}\n\n"
+        "Return a JSON object with this exact structure:\n"
+        '{"translations": {"<lang_code>": {"<segment_id>": "<translated text>"}}}\n'
+        "Translate every requested segment id for its language and nothing else. "
+        "Keep numbers, units and proper nouns unchanged."
+    )
+
+
+def complete_json(system_prompt: str, user_prompt: str) -> dict:
+    """Blocking OpenAI call (through the shared gateway) returning the parsed JSON answer."""
+    response = get_gateway().chat(
+        model=MODEL,
+        temperature=0.3,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    )
+    raw = response.choices[0].message.content or ""
+    # Strip markdown fences if present
+    cleaned = raw.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[1] if "\n" in cleaned else cleaned[3:]
+    if cleaned.endswith("```"):
+        cleaned = cleaned[:-3]
+    return json.loads(cleaned.strip())
+
+
+def normalize_target_langs(target_langs: Optional[List[str]]) -> List[str]:
+    langs = [code for code in (target_langs or DEFAULT_TARGET_LANGS) if code != SOURCE_LANG and code in LANGUAGE_NAMES]
+    return list(dict.fromkeys(langs)) or list(DEFAULT_TARGET_LANGS)
+
+
+def _translate_missing(missing: Dict[str, List[str]]) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    One model request for the `missing` source texts of each language.
+    Unparseable JSON is retried up to JSON_RETRIES times before giving up.
+    Returns {lang: [(source, translation), ...]} and stores it in the translation memory.
+    """
+    if not os.getenv("OPENAI_API_KEY"):
+        raise LocalizationError("OPENAI_API_KEY is not configured on the server.")
+
+    unique_missing = sorted({text for lang_texts in missing.values() for text in lang_texts})
+    ids = {text: f"s{index}" for index, text in enumerate(unique_missing)}
+    requests = {lang: [ids[text] for text in lang_texts] for lang, lang_texts in missing.items()}
+    user_prompt = build_user_prompt({segment_id: text for text, segment_id in ids.items()}, requests)
+    for attempt in range(JSON_RETRIES + 1):
+        try:
+            result = complete_json(SYSTEM_PROMPT, user_prompt)
+            break
+        except json.JSONDecodeError:
+            if attempt == JSON_RETRIES:
+                raise LocalizationError(f"AI returned invalid JSON for {', '.join(missing)}. Please try again.")
+
+    answers = result.get("translations") or {}
+    translated = {}
+    for lang, lang_texts in missing.items():
+        lang_answers = answers.get(lang) if isinstance(answers.get(lang), dict) else {}
+        pairs = [
+            (text, lang_answers[ids[text]]) for text in lang_texts if isinstance(lang_answers.get(ids[text]), str)
+        ]
+        translation_memory.remember(pairs, lang, MODEL)
+        translated[lang] = pairs
+    return translated
+
+
+def _missing_error(texts: List[str], known: Dict[str, str]) -> Optional[str]:
+    """Why a language cannot be stored: segments the model left out would stay Ukrainian."""
+    untranslated = len({text for text in texts if text not in known})
+    return f"AI response left {untranslated} segment(s) untranslated" if untranslated else None
+
+
+def localize(article: dict, target_langs: List[str]) -> dict:
+    """
+    Translate `article` into `target_langs` with one model request, sending only
+    segments missing from the translation memory. A language missing any
+    segment is left out of `translations` and reported in `failed`.
+    Returns {"translations": {lang: fields}, "failed": {lang: error}, "segments": counts}.
+    """
+    content = build_source_content(article)
+    segments = extract_segments(content)
+    texts = [text for _, text in segments]
+    known = {lang: translation_memory.lookup(texts, lang, MODEL) for lang in target_langs}
+    missing = {lang: sorted({text for text in texts if text not in known[lang]}) for lang in target_langs}
+    missing = {lang: lang_texts for lang, lang_texts in missing.items() if lang_texts}
+    cached = sum(len(known[lang]) for lang in target_langs)
+
+    translated = 0
+    if missing:
+        for lang, pairs in _translate_missing(missing).items():
+            known[lang].update(pairs)
+            translated += len(pairs)
+
+    failed = {}
+    for lang in target_langs:
+        error = _missing_error(texts, known[lang])
+        if error:
+            failed[lang] = error
+    if len(failed) == len(target_langs):
+        raise LocalizationError(f"AI response was incomplete for {', '.join(failed)}. Please try again.")
+    translations = {
+        lang: apply_segments(content, {path: known[lang][text] for path, text in segments})
+        for lang in target_langs
+        if lang not in failed
+    }
+    return {
+        "translations": translations,
+        "failed": failed,
+        "segments": {"total": len(set(texts)), "cached": cached, "translated": translated},
+    }
+
+
+def localize_language(article: dict, lang: str) -> dict:
+    """
+    Translate `article` into a single language (own request, own JSON retries),
+    for running languages concurrently. Returns {"lang", "translation", "segments"}.
+    """
+    content = build_source_content(article)
+    segments = extract_segments(content)
+    texts = [text for _, text in segments]
+    known = translation_memory.lookup(texts, lang, MODEL)
+    cached = len(known)
+    missing = sorted({text for text in texts if text not in known})
+
+    translated = 0
+    if missing:
+        pairs = _translate_missing({lang: missing})[lang]
+        known.update(pairs)
+        translated = len(pairs)
+
+    error = _missing_error(texts, known)
+    if error:
+        raise LocalizationError(error)
+    translation = apply_segments(content, {path: known[text] for path, text in segments})
+    return {
+        "lang": lang,
+        "translation": translation,
+        "segments": {"total": len(set(texts)), "cached": cached, "translated": translated},
+    }
+
+
+def write_back(slug: str, localized: Dict[str, dict]) -> bool:
+    """Merge `localized` into the article's stored translations; False if the article is gone."""
+    return ArticleCollection().merge_translations(slug, localized)
+
+
+class LocalizationQueue:
+    """Bounded worker pool running localization jobs recorded in JobCollection."""
+
+    def __init__(self, max_workers: Optional[int] = None, job_timeout: Optional[float] = None):
+        self.max_workers = max_workers or int(os.getenv("LOCALIZATION_WORKERS", "2"))
+        self.job_timeout = job_timeout or float(os.getenv("LOCALIZATION_JOB_TIMEOUT", "600"))
+        # Unique per process start: a restarted container often reuses host and pid.
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="localize")
+        self.fail_stale()
+        # Jobs queued while no worker was running; claims keep them single-run.
+        for job_id in JobCollection().queued_ids(JOB_KIND):
+            self._executor.submit(self._run, job_id)
+        # A worker that dies after this start leaves its jobs "running"; keep
+        # sweeping so they fail once they pass the timeout, not at next deploy.
+        self._stopping.clear()
+        self._sweeper = threading.Thread(target=self._sweep, name="localize-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def fail_stale(self):
+        failed = JobCollection().fail_stale(JOB_KIND, self.job_timeout)
+        if failed:
+            print(f"Marked {failed} interrupted localization job(s) as failed")
+
+    def _sweep(self):
+        interval = max(self.job_timeout / 4, 5)
+        while not self._stopping.wait(interval):
+            try:
+                self.fail_stale()
+            except Exception as exc:
+                print(f"Stale localization job sweep failed: {exc}")
+
+    def shutdown(self):
+        self._stopping.set()
+        if self._executor:
+            # Queued jobs stay "queued" in Mongo and are picked up on next start.
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def submit(self, slug: str, target_langs: List[str]) -> dict:
+        if self._executor is None:
+            raise LocalizationError("Localization workers are not running.")
+        if not os.getenv("OPENAI_API_KEY"):
+            raise LocalizationError("OPENAI_API_KEY is not configured on the server.")
+        job = JobCollection().create(JOB_KIND, slug, {"target_langs": target_langs})
+        self._executor.submit(self._run, job["id"])
+        return job
+
+    def _run(self, job_id: str):
+        jobs = JobCollection()
+        job = jobs.claim(job_id, self.worker)
+        if not job:
+            return
+
+        try:
+            articles = ArticleCollection()
+            slug = job["target"]
+            article = articles.get(slug)
+            if not article:
+                raise LocalizationError("Article not found")
+
+            result = localize(article, job["params"]["target_langs"])
+            if not write_back(slug, result["translations"]):
+                raise LocalizationError("Article was deleted during localization")
+            finished = jobs.complete(job_id, self.worker, result)
+        except Exception as exc:
+            print(f"Localization job {job_id} failed: {exc}")
+            finished = jobs.fail(job_id, self.worker, str(exc))
+        if not finished:
+            print(f"Localization job {job_id} was reclaimed as stale; its outcome was not recorded")
+
+
+localization_queue = LocalizationQueue()
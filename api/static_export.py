@@ -0,0 +1,215 @@
+"""
+Static JSON snapshots of published content for edge serving.
+
+Prerenders the hot public endpoints into MEDIA_ROOT/snapshots so Caddy can
+serve them as precompressed static files; everything else (drafts, filters,
+admin traffic, misses) still goes to the API.
+
+    snapshots/articles/published/<lang|default>.json   GET /articles?status=published[&lang=]
+    snapshots/articles/cards/<lang|default>.json       GET /articles/cards?status=published[&lang=] (first page)
+    snapshots/articles/<slug>/<lang|default>.json      GET /articles/<slug>[?lang=] (published only)
+    snapshots/team.json                                GET /team
+
+Each file is written atomically next to .gz (and .br when `brotli` is
+installed) variants, and only when its content changed. While running,
+the exporter listens to article/team invalidations and regenerates just the
+affected files in a background thread.
+
+Enable with STATIC_EXPORT=1, or run a full export with:
+
+    python -m api.static_export
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Set
+
+from api.schemas.ArticleSchema import ArticleCard, ArticleResponse
+from api.schemas.TeamSchema import TeamMemberResponse
+from api.serialization import TrustedSerializer, render_page
+from dbase.collections.ArticleCollection import VIEW_LANGS, ArticleCollection
+from dbase.collections.TeamCollection import TeamCollection
+from dbase.invalidation import subscribe
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz variants are written without it
+    brotli = None
+
+_default_media = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "media")
+SNAPSHOT_ROOT = Path(os.getenv("MEDIA_ROOT", _default_media)) / "snapshots"
+
+# First page size of the listing grid, matching GET /articles/cards' default limit.
+CARDS_PAGE_SIZE = 24
+
+LANG_VARIANTS = (None, *VIEW_LANGS)
+
+article_serializer = TrustedSerializer(ArticleResponse)
+card_serializer = TrustedSerializer(ArticleCard)
+member_serializer = TrustedSerializer(TeamMemberResponse)
+
+
+def _lang_file(lang: Optional[str]) -> str:
+    return f"{lang or 'default'}.json"
+
+
+def _is_safe_slug(slug: str) -> bool:
+    return bool(slug) and "/" not in slug and "\\" not in slug and not slug.startswith(".")
+
+
+class SnapshotExporter:
+    def __init__(self, root: Path = SNAPSHOT_ROOT, debounce: float = 1.0):
+        self.root = root
+        self.debounce = debounce
+        self.articles = ArticleCollection()
+        self.team = TeamCollection()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending_slugs: Set[str] = set()
+        self._pending_full = False
+        self._pending_team = False
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # --- incremental mode ---
+
+    def start(self):
+        """Subscribe to invalidations and run a full export in the background."""
+        subscribe("articles", self._on_article_change)
+        subscribe("team", self._on_team_change)
+        with self._lock:
+            self._pending_full = True
+        self._thread = threading.Thread(target=self._run, name="snapshot-exporter", daemon=True)
+        self._thread.start()
+        self._wakeup.set()
+
+    def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+
+    def _on_article_change(self, slug: Optional[str]):
+        with self._lock:
+            if slug is None:
+                self._pending_full = True
+            else:
+                self._pending_slugs.add(slug)
+        self._wakeup.set()
+
+    def _on_team_change(self, _member_id: Optional[str]):
+        with self._lock:
+            self._pending_team = True
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait()
+            if self._stopping:
+                break
+            # Coalesce bursts of writes (e.g. bulk edits) into one export pass.
+            time.sleep(self.debounce)
+            self._wakeup.clear()
+            with self._lock:
+                full, slugs, team = self._pending_full, self._pending_slugs, self._pending_team
+                self._pending_full, self._pending_slugs, self._pending_team = False, set(), False
+            try:
+                if full:
+                    self.export_all()
+                else:
+                    if slugs:
+                        for slug in slugs:
+                            self.export_article(slug)
+                        self.export_listings()
+                    if team:
+                        self.export_team()
+            except Exception as e:
+                print(f"Snapshot export failed: {e}")
+
+    # --- exporters ---
+
+    def export_all(self) -> int:
+        published = self.articles.list(status="published")
+        slugs = {article["slug"] for article in published}
+        for slug in slugs:
+            self.export_article(slug)
+
+        articles_dir = self.root / "articles"
+        if articles_dir.is_dir():
+            for entry in articles_dir.iterdir():
+                if entry.is_dir() and entry.name not in ("published", "cards") and entry.name not in slugs:
+                    shutil.rmtree(entry, ignore_errors=True)
+
+        written = self.export_listings()
+        written += self.export_team()
+        return written
+
+    def export_article(self, slug: str) -> int:
+        if not _is_safe_slug(slug):
+            return 0
+        target_dir = Path("articles") / slug
+        base = self.articles.get(slug)
+        if not base or base.get("status") != "published":
+            shutil.rmtree(self.root / target_dir, ignore_errors=True)
+            return 0
+
+        written = 0
+        for lang in LANG_VARIANTS:
+            article = self.articles.get(slug, lang=lang) if lang else base
+            written += self._write(target_dir / _lang_file(lang), article_serializer.dumps(article))
+        return written
+
+    def export_listings(self) -> int:
+        written = 0
+        for lang in LANG_VARIANTS:
+            articles = self.articles.list(status="published", lang=lang)
+            written += self._write(Path("articles/published") / _lang_file(lang), article_serializer.dumps_many(articles))
+            page = self.articles.list_cards(status="published", lang=lang, limit=CARDS_PAGE_SIZE)
+            written += self._write(Path("articles/cards") / _lang_file(lang), render_page(card_serializer, page))
+        return written
+
+    def export_team(self) -> int:
+        return self._write(Path("team.json"), member_serializer.dumps_many(self.team.list()))
+
+    def _write(self, relative: Path, body: bytes) -> int:
+        """Atomically write `body` and its precompressed variants; skip unchanged files."""
+        path = self.root / relative
+        try:
+            if path.read_bytes() == body:
+                return 0
+        except FileNotFoundError:
+            pass
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        variants = [(path.with_name(path.name + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((path.with_name(path.name + ".br"), brotli.compress(body)))
+        # The plain file goes last so its presence implies the variants are fresh.
+        variants.append((path, body))
+
+        for target, data in variants:
+            # Unique temp file: every API worker may run an exporter on the same tree.
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.chmod(tmp, 0o644)
+                os.replace(tmp, target)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+        return 1
+
+
+exporter = SnapshotExporter()
+
+
+if __name__ == "__main__":
+    count = exporter.export_all()
+    print(f"Snapshot export done: {count} files updated under {exporter.root}")
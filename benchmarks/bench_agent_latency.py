@@ -0,0 +1,107 @@
+"""
+Per-post latency of the pipeline agent: the former Assistants flow
+(create thread, create run, poll, list messages) versus the single
+structured-output chat completion, both against benchmarks.fake_openai.
+
+Runs without network access or an API key:
+
+    python -m benchmarks.bench_agent_latency --posts 20 --latency 80 --generation 1500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.fake_openai import start_server
+
+# ai-pipeline is a script directory, not a package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ai-pipeline"))
+
+SAMPLE_POST = {
+    "instagram_id": "3400000000000000000",
+    "code": "DAbCdEf",
+    "caption": "🏠 Pronájem bytu 2+kk, Praha 3, 54 m², 25 000 Kč/měsíc + poplatky.",
+    "media_type": 1,
+    "image_url": "https://example.invalid/photo.jpg",
+}
+
+
+def legacy_process(agent, assistant_id: str, post: dict):
+    """The Assistants round trips the pipeline used to make for every post."""
+    gateway, client = agent.openai_api.gateway, agent.openai_api.client
+    messages = [{"role": "user", "content": json.dumps(post, ensure_ascii=False)}]
+    thread = gateway.call(client.beta.threads.create, messages=messages)
+    gateway.call(
+        client.beta.threads.runs.create_and_poll,
+        assistant_id=assistant_id,
+        thread_id=thread.id,
+        response_format=agent.response_format,
+    )
+    last_msg = gateway.call(client.beta.threads.messages.list, thread_id=thread.id, limit=1).data[0]
+    result = json.loads(last_msg.content[0].text.value)
+    return result.get("value")
+
+
+def run(label: str, fn, posts: int, concurrency: int, fake) -> float:
+    before = sum(fake.counts.values())
+
+    def timed(_):
+        started = time.perf_counter()
+        assert fn() is not None
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(timed, range(posts)))
+    elapsed = time.perf_counter() - started
+
+    requests = sum(fake.counts.values()) - before
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:>11}: p50 {statistics.median(latencies) * 1000:7.0f} ms | p99 {p99 * 1000:7.0f} ms | "
+        f"{posts / elapsed:5.2f} posts/s | {requests / posts:.1f} requests/post"
+    )
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=80, help="Fake per-request latency, ms")
+    parser.add_argument("--generation", type=float, default=1500, help="Fake generation time, ms")
+    parser.add_argument("--poll-after-ms", type=int, default=0,
+                        help="Run polling interval hint; 0 leaves the SDK default")
+    args = parser.parse_args()
+
+    server = start_server(latency_ms=args.latency, generation_ms=args.generation, poll_after_ms=args.poll_after_ms)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["OPENAI_API_KEY"] = "fake"
+
+    from agent_module import AgentModule
+
+    agent = AgentModule()
+    assistant = agent.openai_api.gateway.call(
+        agent.openai_api.client.beta.assistants.create,
+        name="Pipeline Agent",
+        model=agent.openai_api.model,
+        instructions=agent.agent_prompt,
+        response_format=agent.response_format,
+    )
+
+    print(f"{args.posts} posts, concurrency {args.concurrency}, "
+          f"{args.latency:.0f} ms/request, {args.generation:.0f} ms generation")
+    slow = run("assistants", lambda: legacy_process(agent, assistant.id, SAMPLE_POST), args.posts,
+               args.concurrency, server.fake)
+    fast = run("completion", lambda: agent.process_post(SAMPLE_POST), args.posts, args.concurrency, server.fake)
+    print(f"Saved per post: {(slow - fast) * 1000:.0f} ms ({slow / fast:.2f}x faster)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
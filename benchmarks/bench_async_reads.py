@@ -0,0 +1,90 @@
+"""
+Compare concurrent public article reads through the sync and async data layers.
+
+The sync path mirrors how FastAPI runs a plain `def` route: every call occupies
+one worker of a bounded threadpool (AnyIO defaults to 40 threads). The async
+path awaits AsyncArticleCollection directly on the event loop.
+
+Both paths query `collection.collection.find` with the same projection and
+serialization as `list()`, bypassing `article_cache`, so every read reaches
+MongoDB and the drivers are compared rather than cache hits.
+
+Usage (needs a reachable MONGODB_URI with some articles):
+
+    python -m benchmarks.bench_async_reads --concurrency 400 --rounds 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from dbase.collections.ArticleCollection import WITHOUT_DERIVED, ArticleCollection, AsyncArticleCollection
+from dbase.driver import close_async_pools, close_pools
+
+
+def _report(label: str, latencies: list, elapsed: float):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{label:>6}: {len(latencies) / elapsed:8.1f} req/s | "
+        f"p50 {statistics.median(latencies) * 1000:7.2f} ms | p99 {p99 * 1000:7.2f} ms"
+    )
+
+
+async def bench_sync(concurrency: int, threads: int, status: str):
+    collection = ArticleCollection()
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=threads)
+
+    def one_read():
+        started = time.perf_counter()
+        [collection._serialize(doc) for doc in collection.collection.find({"status": status}, WITHOUT_DERIVED)]
+        return time.perf_counter() - started
+
+    async def timed():
+        queued = time.perf_counter()
+        await loop.run_in_executor(executor, one_read)
+        return time.perf_counter() - queued
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+    _report("sync", latencies, elapsed)
+
+
+async def bench_async(concurrency: int, status: str):
+    collection = AsyncArticleCollection()
+
+    async def timed():
+        started = time.perf_counter()
+        [collection._serialize(doc) async for doc in collection.collection.find({"status": status}, WITHOUT_DERIVED)]
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    latencies = await asyncio.gather(*(timed() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    _report("async", latencies, elapsed)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=40, help="Threadpool size for the sync path")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--status", default="published")
+    args = parser.parse_args()
+
+    for round_no in range(1, args.rounds + 1):
+        print(f"Round {round_no}: {args.concurrency} concurrent reads")
+        await bench_sync(args.concurrency, args.threads, args.status)
+        await bench_async(args.concurrency, args.status)
+
+    await close_async_pools()
+    close_pools()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""
+CPU cost of serializing a 500-article list: FastAPI's response_model path
+(validate against List[ArticleResponse] + jsonable_encoder + json.dumps)
+versus the trusted orjson path from api.serialization.
+
+Runs without MongoDB:
+
+    python -m benchmarks.bench_serialization --articles 500 --repeat 20
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from api.schemas.ArticleSchema import ArticleResponse
+from api.serialization import TrustedSerializer
+
+
+def make_article(index: int) -> dict:
+    now = datetime.utcnow()
+    translation = {
+        "title": f"Byt 2+kk #{index}",
+        "subtitle": "Slunný byt s balkonem",
+        "location": "Praha 3, Žižkov",
+        "body": "Lorem ipsum dolor sit amet. " * 40,
+        "tags": ["pronájem", "praha", "2+kk"],
+        "key_metrics": [{"label": "Plocha", "value": "54 m²", "helper": None}],
+        "gallery": None,
+        "blocks": None,
+    }
+    return {
+        "id": f"article-{index}",
+        "slug": f"article-{index}",
+        "title": f"Квартира 2+kk #{index}",
+        "subtitle": "Сонячна квартира з балконом",
+        "location": "Praha 3",
+        "cover_url": f"/media/{index:032x}.jpg",
+        "video_url": None,
+        "body": "Опис об'єкта. " * 60,
+        "price": "25 000 CZK/měsíc",
+        "price_on_request": False,
+        "highlight": index % 7 == 0,
+        "status": "published",
+        "post_type": "rent",
+        "tags": ["оренда", "praha"],
+        "key_metrics": [
+            {"label": "Площа", "value": "54 m²", "helper": ""},
+            {"label": "Поверх", "value": "3/5", "helper": ""},
+        ],
+        "gallery": [{"src": f"/media/{index:032x}-{n}.jpg", "alt": None, "caption": None} for n in range(8)],
+        "blocks": [
+            {"type": "heading", "level": "h2", "text": "Про квартиру"},
+            {"type": "text", "content": "Текст блоку. " * 20},
+            {"type": "stats", "title": None, "items": [{"label": "Кімнати", "value": "2", "helper": None}]},
+        ],
+        "translations": {lang: dict(translation) for lang in ("cs", "en", "ru")},
+        "source": "instagram",
+        "source_instagram_id": str(10_000 + index),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def timed(label: str, fn, repeat: int) -> float:
+    fn()  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    per_call = (time.perf_counter() - started) / repeat
+    print(f"{label:>14}: {per_call * 1000:8.2f} ms/response ({len(body) / 1024:.0f} KiB)")
+    return per_call
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    articles = [make_article(i) for i in range(args.articles)]
+    adapter = TypeAdapter(List[ArticleResponse])
+    serializer = TrustedSerializer(ArticleResponse)
+
+    def response_model_path() -> bytes:
+        validated = adapter.validate_python(articles)
+        return json.dumps(jsonable_encoder(validated), ensure_ascii=False).encode("utf-8")
+
+    def trusted_path() -> bytes:
+        return serializer.dumps_many(articles)
+
+    slow = timed("response_model", response_model_path, args.repeat)
+    fast = timed("trusted", trusted_path, args.repeat)
+    print(f"CPU saved per response: {(slow - fast) * 1000:.2f} ms ({slow / fast:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
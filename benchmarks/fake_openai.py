@@ -0,0 +1,331 @@
+"""
+Local stand-in for the OpenAI HTTP API, for latency benchmarks of the pipeline
+without network access or API spend.
+
+Every request costs `--latency` ms (network round trip); generating a
+completion or finishing a run costs `--generation` ms. Implemented endpoints:
+
+- POST /v1/chat/completions            structured draft in one call
+- POST /v1/assistants, /v1/threads     legacy Assistants flow
+- POST /v1/threads/{id}/runs, GET .../runs/{run_id}, GET .../messages
+- POST /v1/files, GET /v1/files/{id}/content  Batch API input / output files
+- POST /v1/batches, GET /v1/batches/{id}      completes after `--batch-ms`
+
+`GET /_stats` returns per-endpoint request counts.
+
+    python -m benchmarks.fake_openai --port 8765 --latency 80 --generation 1500
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python ai-pipeline/main.py
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python ai-pipeline/main.py --batch
+"""
+
+import argparse
+import email.parser
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_METRICS = [
+    {"label": "Площа", "value": "54 m²", "helper": ""},
+    {"label": "Кімнати", "value": "2+kk", "helper": ""},
+]
+
+
+def sample_translation(lang: str) -> dict:
+    return {
+        "title": f"Byt 2+kk ({lang})",
+        "subtitle": "Sunny flat with a balcony",
+        "location": "Praha 3",
+        "body": "Bright two-room flat.\n\nClose to the tram stop.",
+        "tags": ["praha", "2+kk"],
+        "key_metrics": SAMPLE_METRICS,
+    }
+
+
+def sample_draft(langs) -> dict:
+    """A listing that satisfies the pipeline's strict draft schema."""
+    return {
+        "value": {
+            "post_type": "rent",
+            "slug": f"byt-2kk-praha-{uuid.uuid4().hex[:6]}",
+            "title": "Квартира 2+kk у Празі",
+            "subtitle": "Сонячна квартира з балконом",
+            "location": "Praha 3",
+            "body": "Світла двокімнатна квартира.\n\nПоруч зупинка трамваю.",
+            "price": "25 000 CZK/měsíc",
+            "price_on_request": False,
+            "tags": ["оренда", "praha"],
+            "key_metrics": SAMPLE_METRICS,
+            "translations": {lang: sample_translation(lang) for lang in langs},
+        }
+    }
+
+
+def _schema_langs(response_format) -> list:
+    """Target languages required by the draft schema, if the request carried one."""
+    try:
+        schema = response_format["json_schema"]["schema"]
+        return schema["properties"]["value"]["properties"]["translations"]["required"]
+    except (KeyError, TypeError):
+        return ["en", "cs", "ru"]
+
+
+class FakeOpenAI:
+    def __init__(self, latency_ms: float = 80, generation_ms: float = 1500, poll_after_ms: int = 0,
+                 batch_ms: float = 5000):
+        self.latency = latency_ms / 1000
+        self.generation = generation_ms / 1000
+        self.poll_after_ms = poll_after_ms
+        self.batch_duration = batch_ms / 1000
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.runs = {}
+        self.thread_formats = {}
+        self.files = {}
+        self.batches = {}
+
+    def usage(self, content: str) -> dict:
+        completion = len(content) // 4
+        return {"prompt_tokens": 1200, "completion_tokens": completion, "total_tokens": 1200 + completion}
+
+    # ── chat.completions ────────────────────────────────────────────────
+
+    def chat_completion(self, body: dict) -> dict:
+        time.sleep(self.generation)
+        return self._completion(body)
+
+    def _completion(self, body: dict) -> dict:
+        content = json.dumps(sample_draft(_schema_langs(body.get("response_format"))), ensure_ascii=False)
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+            ],
+            "usage": self.usage(content),
+        }
+
+    # ── Assistants (threads / runs) ─────────────────────────────────────
+
+    def create_assistant(self, body: dict) -> dict:
+        return {"id": f"asst_{uuid.uuid4().hex}", "object": "assistant", "created_at": int(time.time()),
+                "model": body.get("model"), "instructions": body.get("instructions"), "tools": []}
+
+    def create_thread(self, body: dict) -> dict:
+        return {"id": f"thread_{uuid.uuid4().hex}", "object": "thread", "created_at": int(time.time()), "metadata": {}}
+
+    def run_document(self, thread_id: str, run_id: str) -> dict:
+        with self.lock:
+            run = self.runs[run_id]
+        status = "completed" if time.monotonic() >= run["done_at"] else "in_progress"
+        return {"id": run_id, "object": "thread.run", "thread_id": thread_id, "assistant_id": run["assistant_id"],
+                "status": status, "created_at": run["created_at"]}
+
+    def create_run(self, thread_id: str, body: dict) -> dict:
+        run_id = f"run_{uuid.uuid4().hex}"
+        with self.lock:
+            self.runs[run_id] = {"assistant_id": body.get("assistant_id"), "created_at": int(time.time()),
+                                 "done_at": time.monotonic() + self.generation}
+            self.thread_formats[thread_id] = body.get("response_format")
+        return self.run_document(thread_id, run_id)
+
+    def list_messages(self, thread_id: str) -> dict:
+        with self.lock:
+            response_format = self.thread_formats.get(thread_id)
+        content = json.dumps(sample_draft(_schema_langs(response_format)), ensure_ascii=False)
+        message = {"id": f"msg_{uuid.uuid4().hex}", "object": "thread.message", "thread_id": thread_id,
+                   "role": "assistant", "created_at": int(time.time()),
+                   "content": [{"type": "text", "text": {"value": content, "annotations": []}}]}
+        return {"object": "list", "data": [message], "first_id": message["id"], "last_id": message["id"],
+                "has_more": False}
+
+    # ── Batch API ───────────────────────────────────────────────────────
+
+    def create_file(self, body: dict) -> dict:
+        file_id = f"file-{uuid.uuid4().hex}"
+        with self.lock:
+            self.files[file_id] = body["file"]
+        return {"id": file_id, "object": "file", "bytes": len(body["file"]), "created_at": int(time.time()),
+                "filename": body.get("filename") or "input.jsonl", "purpose": body.get("purpose", "batch")}
+
+    def file_content(self, file_id: str) -> bytes:
+        with self.lock:
+            return self.files[file_id]
+
+    def create_batch(self, body: dict) -> dict:
+        batch_id = f"batch_{uuid.uuid4().hex}"
+        with self.lock:
+            total = len([line for line in self.files[body["input_file_id"]].splitlines() if line.strip()])
+            self.batches[batch_id] = {
+                "input_file_id": body["input_file_id"],
+                "endpoint": body.get("endpoint"),
+                "created_at": int(time.time()),
+                "done_at": time.monotonic() + self.batch_duration,
+                "total": total,
+                "output_file_id": None,
+            }
+        return self.batch_document(batch_id)
+
+    def _finish_batch(self, batch: dict):
+        """Answer every request of the input file once the batch is due; called under the lock."""
+        lines = []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            lines.append(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex}",
+                "custom_id": request["custom_id"],
+                "response": {"status_code": 200, "request_id": uuid.uuid4().hex,
+                             "body": self._completion(request["body"])},
+                "error": None,
+            }, ensure_ascii=False))
+        output_file_id = f"file-{uuid.uuid4().hex}"
+        self.files[output_file_id] = ("\n".join(lines) + "\n").encode("utf-8")
+        batch["output_file_id"] = output_file_id
+
+    def batch_document(self, batch_id: str) -> dict:
+        with self.lock:
+            batch = self.batches[batch_id]
+            done = time.monotonic() >= batch["done_at"]
+            if done and not batch["output_file_id"]:
+                self._finish_batch(batch)
+            completed = batch["total"] if done else 0
+            return {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": batch["endpoint"],
+                "input_file_id": batch["input_file_id"],
+                "completion_window": "24h",
+                "status": "completed" if done else "in_progress",
+                "output_file_id": batch["output_file_id"],
+                "error_file_id": None,
+                "created_at": batch["created_at"],
+                "request_counts": {"total": batch["total"], "completed": completed, "failed": 0},
+            }
+
+
+ROUTES = [
+    ("POST", re.compile(r"^/v1/chat/completions$"), "chat_completion"),
+    ("POST", re.compile(r"^/v1/assistants$"), "create_assistant"),
+    ("POST", re.compile(r"^/v1/threads$"), "create_thread"),
+    ("POST", re.compile(r"^/v1/threads/(?P<thread_id>[^/]+)/runs$"), "create_run"),
+    ("GET", re.compile(r"^/v1/threads/(?P<thread_id>[^/]+)/runs/(?P<run_id>[^/]+)$"), "run_document"),
+    ("GET", re.compile(r"^/v1/threads/(?P<thread_id>[^/]+)/messages$"), "list_messages"),
+    ("POST", re.compile(r"^/v1/files$"), "create_file"),
+    ("GET", re.compile(r"^/v1/files/(?P<file_id>[^/]+)/content$"), "file_content"),
+    ("POST", re.compile(r"^/v1/batches$"), "create_batch"),
+    ("GET", re.compile(r"^/v1/batches/(?P<batch_id>[^/]+)$"), "batch_document"),
+]
+
+
+def parse_multipart(content_type: str, data: bytes) -> dict:
+    """Form fields of a multipart upload; the file part goes under "file" (bytes) and "filename"."""
+    message = email.parser.BytesParser().parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + data
+    )
+    fields = {}
+    for part in message.get_payload():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True)
+        if name == "file":
+            fields["file"] = payload
+            fields["filename"] = part.get_filename()
+        else:
+            fields[name] = payload.decode("utf-8")
+    return fields
+
+
+def make_handler(fake: FakeOpenAI):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload, headers: dict = None):
+            if isinstance(payload, bytes):
+                data, content_type = payload, "application/octet-stream"
+            else:
+                data, content_type = json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _dispatch(self, method: str):
+            path = self.path.split("?", 1)[0]
+            length = int(self.headers.get("Content-Length") or 0)
+            data = self.rfile.read(length) if length else b""
+            content_type = self.headers.get("Content-Type", "")
+            if content_type.startswith("multipart/form-data"):
+                body = parse_multipart(content_type, data)
+            else:
+                body = json.loads(data) if data else {}
+
+            if method == "GET" and path == "/_stats":
+                with fake.lock:
+                    return self._send(200, dict(fake.counts))
+
+            for route_method, pattern, name in ROUTES:
+                match = pattern.match(path)
+                if route_method != method or not match:
+                    continue
+                with fake.lock:
+                    fake.counts[name] += 1
+                time.sleep(fake.latency)
+                kwargs = match.groupdict()
+                payload = getattr(fake, name)(**kwargs, body=body) if method == "POST" else getattr(fake, name)(**kwargs)
+                headers = {"openai-poll-after-ms": str(fake.poll_after_ms)} if fake.poll_after_ms else None
+                return self._send(200, payload, headers)
+
+            self._send(404, {"error": {"message": f"{method} {path} is not faked", "type": "invalid_request_error"}})
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+    return Handler
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0, **options) -> ThreadingHTTPServer:
+    """Serve a FakeOpenAI on a daemon thread; `server.fake` holds its state."""
+    fake = FakeOpenAI(**options)
+    server = ThreadingHTTPServer((host, port), make_handler(fake))
+    server.daemon_threads = True
+    server.fake = fake
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-openai").start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=80, help="Per-request latency, ms")
+    parser.add_argument("--generation", type=float, default=1500, help="Completion / run time, ms")
+    parser.add_argument("--poll-after-ms", type=int, default=0, help="openai-poll-after-ms header for run polling")
+    parser.add_argument("--batch-ms", type=float, default=5000, help="Time until a submitted batch completes, ms")
+    args = parser.parse_args()
+
+    server = start_server(args.host, args.port, latency_ms=args.latency, generation_ms=args.generation,
+                          poll_after_ms=args.poll_after_ms, batch_ms=args.batch_ms)
+    print(f"Fake OpenAI listening on http://{args.host}:{server.server_address[1]}/v1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Cross-process cache invalidation from MongoDB change streams.
+
+Each API worker runs one `ChangeWatcher` thread that watches the articles,
+team and applications collections and replays every change into the local
+invalidation hub (`dbase.invalidation.invalidate`). Writes made by other
+workers or by the ai-pipeline subprocess therefore reach every in-process
+cache, not only the one of the process that performed the write.
+
+- The resume token is stored in Mongo (`MONGODB_CHANGE_STATE_COLLECTION`)
+  under a leased worker slot `<MONGODB_CHANGE_WATCHER>:<n>` (the lowest slot
+  no live worker holds), so a restarted worker picks up a stored token and
+  continues where it stopped. If the token is too old for the oplog, the
+  watcher starts fresh and invalidates everything.
+- On a standalone mongod (no change streams, error 40573) it falls back to
+  polling `updated_at` every MONGODB_CHANGE_POLL_INTERVAL seconds.
+  Deletes are found by diffing the set of `_id`s between polls, for
+  collections of up to MONGODB_CHANGE_POLL_TRACK_IDS documents. Larger
+  collections only compare document counts: a drop invalidates the whole
+  topic, and a delete plus an insert within one interval goes unnoticed.
+
+Local writes are seen twice (direct call + change event); both are cheap
+cache clears, so no attempt is made to de-duplicate them.
+"""
+
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
+
+from dbase.driver import DbaseDriver
+from dbase.invalidation import invalidate
+
+CHANGE_STREAMS_UNSUPPORTED = 40573
+CHANGE_STREAM_HISTORY_LOST = (260, 280, 286)
+
+# A worker slot is held for this long without renewal (renewed every few seconds).
+SLOT_LEASE_SECONDS = 30
+MAX_SLOTS = 64
+# Polling diffs the _id sets of collections up to this size to see deletes.
+POLL_TRACK_IDS = int(os.getenv("MONGODB_CHANGE_POLL_TRACK_IDS", "10000"))
+
+# Invalidation topic -> collection name.
+WATCHED_COLLECTIONS = {
+    "articles": os.getenv("MONGODB_ARTICLES_COLLECTION", "articles"),
+    "team": os.getenv("MONGODB_TEAM_COLLECTION", "team_members"),
+    "applications": os.getenv("MONGODB_APPLICATIONS_COLLECTION", "applications"),
+}
+
+
+class ChangeWatcher:
+    """Background thread fanning Mongo changes out to the local invalidation hub."""
+
+    def __init__(
+        self,
+        collections: Optional[Dict[str, str]] = None,
+        name: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        token_flush_interval: float = 5.0,
+    ):
+        self.topics = {collection: topic for topic, collection in (collections or WATCHED_COLLECTIONS).items()}
+        # Resume tokens are per worker slot: each worker must see every event itself.
+        self.prefix = name or os.getenv("MONGODB_CHANGE_WATCHER", "api")
+        self.name: Optional[str] = None
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lease_renewed = 0.0
+        self.poll_interval = poll_interval or float(os.getenv("MONGODB_CHANGE_POLL_INTERVAL", "5"))
+        self.token_flush_interval = token_flush_interval
+        self.mode = "stopped"
+        self.events = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- lifecycle ---
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="change-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.mode = "stopped"
+        self._release_slot()
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "events": self.events, "watcher": self.name}
+
+    # --- worker slot ---
+
+    def _acquire_slot(self) -> str:
+        """
+        Lease the lowest free slot. The slot, not the pid, owns the resume
+        token: a restarted worker finds a stored token again, and the number
+        of state documents stays bounded by the number of workers.
+        """
+        state = self._state()
+        for ordinal in range(MAX_SLOTS):
+            now = datetime.utcnow()
+            free = [{"owner": self._owner}, {"lease_until": {"$lt": now}}, {"lease_until": {"$exists": False}}]
+            try:
+                document = state.find_one_and_update(
+                    {"_id": f"{self.prefix}:{ordinal}", "$or": free},
+                    {"$set": {"owner": self._owner, "lease_until": now + timedelta(seconds=SLOT_LEASE_SECONDS)}},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+            except DuplicateKeyError:
+                continue  # held by a live worker
+            self._lease_renewed = time.monotonic()
+            return document["_id"]
+        raise RuntimeError(f"All {MAX_SLOTS} change watcher slots are leased")
+
+    def _renew_slot(self):
+        if time.monotonic() - self._lease_renewed < SLOT_LEASE_SECONDS / 3:
+            return
+        self._state().update_one(
+            {"_id": self.name, "owner": self._owner},
+            {"$set": {"lease_until": datetime.utcnow() + timedelta(seconds=SLOT_LEASE_SECONDS)}},
+        )
+        self._lease_renewed = time.monotonic()
+
+    def _release_slot(self):
+        if self.name is None:
+            return
+        try:
+            self._state().update_one(
+                {"_id": self.name, "owner": self._owner}, {"$set": {"lease_until": datetime.utcnow()}}
+            )
+        except PyMongoError as e:
+            print(f"Releasing change watcher slot failed: {e}")
+
+    # --- resume token persistence ---
+
+    def _state(self):
+        db = DbaseDriver()
+        return db.get_collection(os.getenv("MONGODB_CHANGE_STATE_COLLECTION", "change_stream_state"))
+
+    def _load_token(self) -> Optional[dict]:
+        state = self._state().find_one({"_id": self.name})
+        return state.get("resume_token") if state else None
+
+    def _save_token(self, token: Optional[dict]):
+        self._state().update_one(
+            {"_id": self.name},
+            {"$set": {"resume_token": token, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    # --- main loop ---
+
+    def _run(self):
+        while self.name is None and not self._stop.is_set():
+            try:
+                self.name = self._acquire_slot()
+            except (PyMongoError, RuntimeError) as e:
+                print(f"Change watcher could not lease a slot: {e}")
+                self._stop.wait(self.poll_interval)
+
+        while not self._stop.is_set():
+            try:
+                self._watch()
+            except OperationFailure as e:
+                if e.code == CHANGE_STREAMS_UNSUPPORTED:
+                    print("Change streams unavailable (standalone mongod); polling updated_at instead")
+                    self._poll()
+                    return
+                if e.code in CHANGE_STREAM_HISTORY_LOST:
+                    print("Stored resume token is no longer in the oplog; starting a fresh change stream")
+                    self._save_token(None)
+                else:
+                    print(f"Change stream failed: {e}")
+                    self._stop.wait(self.poll_interval)
+            except PyMongoError as e:
+                print(f"Change stream failed: {e}")
+                self._stop.wait(self.poll_interval)
+            # Anything may have changed while the stream was down.
+            self._invalidate_all()
+
+    def _watch(self):
+        token = self._load_token()
+        last_flush = time.monotonic()
+        with DbaseDriver().watch_collections(self.topics, resume_after=token, max_await_time_ms=1000) as stream:
+            self.mode = "change_stream"
+            while not self._stop.is_set():
+                change = stream.try_next()
+                if change is not None:
+                    self._dispatch(change)
+                self._renew_slot()
+                if stream.resume_token != token and time.monotonic() - last_flush >= self.token_flush_interval:
+                    token = stream.resume_token
+                    self._save_token(token)
+                    last_flush = time.monotonic()
+            if stream.resume_token != token:
+                self._save_token(stream.resume_token)
+
+    def _dispatch(self, change: dict):
+        topic = self.topics.get(change.get("ns", {}).get("coll"))
+        if topic is None:
+            return
+        self.events += 1
+        if change["operationType"] in ("drop", "rename", "dropDatabase", "invalidate"):
+            invalidate(topic)
+            return
+        key = (change.get("documentKey") or {}).get("_id")
+        invalidate(topic, str(key) if key is not None else None)
+
+    def _invalidate_all(self):
+        for topic in self.topics.values():
+            invalidate(topic)
+
+    # --- standalone fallback ---
+
+    def _poll(self):
+        self.mode = "polling"
+        db = DbaseDriver()
+        high_water: Dict[str, Optional[datetime]] = {}
+        snapshots: Dict[str, Tuple[int, Optional[Set[str]]]] = {}
+        while not self._stop.is_set():
+            try:
+                self._renew_slot()
+            except PyMongoError as e:
+                print(f"Renewing change watcher slot failed: {e}")
+            for collection_name, topic in self.topics.items():
+                try:
+                    collection = db.get_collection(collection_name)
+                    if collection_name not in snapshots:
+                        # Baseline; retried on the next pass if Mongo is unavailable.
+                        latest = collection.find_one({}, {"updated_at": 1}, sort=[("updated_at", -1)])
+                        high_water[collection_name] = latest.get("updated_at") if latest else None
+                        snapshots[collection_name] = self._snapshot(collection)
+                        continue
+                    since = high_water[collection_name]
+                    query = {"updated_at": {"$gt": since}} if since else {"updated_at": {"$exists": True}}
+                    for document in collection.find(query, {"updated_at": 1}).sort("updated_at", 1):
+                        self.events += 1
+                        invalidate(topic, str(document["_id"]))
+                        high_water[collection_name] = document["updated_at"]
+                    count, ids = self._snapshot(collection)
+                    previous_count, previous_ids = snapshots[collection_name]
+                    if ids is not None and previous_ids is not None:
+                        for key in previous_ids - ids:
+                            self.events += 1
+                            invalidate(topic, key)
+                    elif count < previous_count:
+                        invalidate(topic)
+                    snapshots[collection_name] = (count, ids)
+                except PyMongoError as e:
+                    print(f"Change polling for '{collection_name}' failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    @staticmethod
+    def _snapshot(collection) -> Tuple[int, Optional[Set[str]]]:
+        """Document count, plus the set of `_id`s when the collection is small enough to diff."""
+        count = collection.estimated_document_count()
+        if count > POLL_TRACK_IDS:
+            return count, None
+        return count, {str(document["_id"]) for document in collection.find({}, {"_id": 1})}
+
+
+watcher = ChangeWatcher()
@@ -3,9 +3,10 @@ from datetime import datetime
 from typing import List, Optional
 
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
 
-from dbase.driver import DbaseDriver
+from dbase.driver import AsyncDbaseDriver, DbaseDriver
+from dbase.invalidation import invalidate
 
 
 class ApplicationCollection:
@@ -13,6 +14,13 @@ class ApplicationCollection:
     CRUD helper for applications (website form submissions) stored in MongoDB.
     """
 
+    INDEXES = [
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING)], name="status_created_at"),
+        IndexModel([("created_at", DESCENDING)], name="created_at"),
+        # Change polling on standalone mongod (dbase/change_streams.py).
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+    ]
+
     def __init__(self, collection_name: Optional[str] = None):
         self.db = DbaseDriver()
         self.collection = self.db.get_collection(
@@ -49,6 +57,7 @@ class ApplicationCollection:
         }
         result = self.collection.insert_one(document)
         document["_id"] = result.inserted_id
+        invalidate("applications", str(result.inserted_id))
         return self._serialize(document)
 
     def update_status(self, application_id: str, status: str) -> Optional[dict]:
@@ -57,6 +66,7 @@ class ApplicationCollection:
             {"$set": {"status": status, "updated_at": datetime.utcnow()}},
             return_document=ReturnDocument.AFTER,
         )
+        invalidate("applications", application_id)
         return self._serialize(document)
 
     def update_notes(self, application_id: str, notes: str) -> Optional[dict]:
@@ -65,9 +75,70 @@ class ApplicationCollection:
             {"$set": {"notes": notes, "updated_at": datetime.utcnow()}},
             return_document=ReturnDocument.AFTER,
         )
+        invalidate("applications", application_id)
         return self._serialize(document)
 
     def delete(self, application_id: str) -> bool:
         result = self.collection.delete_one({"_id": ObjectId(application_id)})
+        invalidate("applications", application_id)
         return result.deleted_count == 1
 
+
+class AsyncApplicationCollection:
+    """Async counterpart of ApplicationCollection used by the API routers."""
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = AsyncDbaseDriver()
+        self.collection = self.db.get_collection(
+            collection_name or os.getenv("MONGODB_APPLICATIONS_COLLECTION", "applications")
+        )
+
+    _serialize = staticmethod(ApplicationCollection._serialize)
+
+    async def list(self, status: Optional[str] = None) -> List[dict]:
+        query = {}
+        if status:
+            query["status"] = status
+        cursor = self.collection.find(query).sort("created_at", -1)
+        return [self._serialize(doc) async for doc in cursor]
+
+    async def get(self, application_id: str) -> Optional[dict]:
+        document = await self.collection.find_one({"_id": ObjectId(application_id)})
+        return self._serialize(document)
+
+    async def create(self, data: dict) -> dict:
+        now = datetime.utcnow()
+        document = {
+            **data,
+            "status": "new",
+            "notes": "",
+            "created_at": now,
+            "updated_at": now,
+        }
+        result = await self.collection.insert_one(document)
+        document["_id"] = result.inserted_id
+        invalidate("applications", str(result.inserted_id))
+        return self._serialize(document)
+
+    async def update_status(self, application_id: str, status: str) -> Optional[dict]:
+        document = await self.collection.find_one_and_update(
+            {"_id": ObjectId(application_id)},
+            {"$set": {"status": status, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        invalidate("applications", application_id)
+        return self._serialize(document)
+
+    async def update_notes(self, application_id: str, notes: str) -> Optional[dict]:
+        document = await self.collection.find_one_and_update(
+            {"_id": ObjectId(application_id)},
+            {"$set": {"notes": notes, "updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        invalidate("applications", application_id)
+        return self._serialize(document)
+
+    async def delete(self, application_id: str) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(application_id)})
+        invalidate("applications", application_id)
+        return result.deleted_count == 1
@@ -1,10 +1,402 @@
+import asyncio
+import base64
 import os
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, DeleteOne, IndexModel, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
-from dbase.driver import DbaseDriver
+from dbase.cache import MISSING, TTLCache, register_cache
+from dbase.driver import AsyncDbaseDriver, DbaseDriver
+from dbase.feeds import ArticleFeedIndex
+from dbase.invalidation import invalidate, subscribe
+from dbase.listing_facets import normalize_disposition, parse_facets
+from dbase.search import FIELD_WEIGHTS, ArticleSearchIndex
+from dbase.text import tokenize
+
+TRANSLATABLE_FIELDS = ("title", "subtitle", "location", "body", "tags", "key_metrics", "gallery", "blocks")
+
+# Base article content is Ukrainian; `views.<lang>` holds the localized,
+# ready-to-serve translatable fields for each language, built at write time.
+BASE_LANG = "uk"
+VIEW_LANGS = ("cs", "en", "uk", "ru")
+# Fields needed to render a listing card; the first group is localized.
+CARD_LOCALIZED_FIELDS = ("title", "location", "key_metrics")
+CARD_BASE_FIELDS = ("cover_url", "price", "price_on_request", "post_type", "highlight", "status", "created_at")
+
+LANG_FALLBACK = [code.strip() for code in os.getenv("ARTICLE_LANG_FALLBACK", "en,uk").split(",") if code.strip()]
+
+# Read-through cache for list/get results, keyed by status, slug and language.
+# Any article write clears it (see `invalidate("articles", ...)` below).
+article_cache = register_cache(
+    TTLCache(
+        "articles",
+        maxsize=int(os.getenv("ARTICLE_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("ARTICLE_CACHE_TTL", "300")),
+    )
+)
+subscribe("articles", article_cache.clear)
+
+
+def card_from_document(document: dict, lang: Optional[str] = None) -> dict:
+    """Build a listing card from a raw document holding card fields and views."""
+    card = {"_id": document["_id"]}
+    card.update((field, document.get(field)) for field in CARD_BASE_FIELDS)
+    view = (document.get("views") or {}).get(lang) or {} if lang else {}
+    card.update((field, view.get(field, document.get(field))) for field in CARD_LOCALIZED_FIELDS)
+    return card
+
+
+def _search_entry(document: dict) -> dict:
+    """What the search index keeps per article: status plus card fields in every language."""
+    entry = {field: document.get(field) for field in ("_id", "status", *CARD_BASE_FIELDS, *CARD_LOCALIZED_FIELDS)}
+    entry["views"] = {
+        lang: {field: view[field] for field in CARD_LOCALIZED_FIELDS if field in view}
+        for lang, view in (document.get("views") or {}).items()
+    }
+    return entry
+
+
+SEARCH_PROJECTION = {
+    "translations": 1,
+    **{field: 1 for field in (*FIELD_WEIGHTS, *CARD_BASE_FIELDS, *CARD_LOCALIZED_FIELDS)},
+    **{f"views.{lang}.{field}": 1 for lang in VIEW_LANGS for field in CARD_LOCALIZED_FIELDS},
+}
+
+# Full-text index over all languages; writes mark slugs dirty, reads refresh them.
+search_index = ArticleSearchIndex(store=_search_entry)
+subscribe("articles", search_index.invalidate)
+# One refresh at a time, so a query arriving mid-rebuild waits for the load
+# instead of searching a half-empty index.
+search_refresh_lock = asyncio.Lock()
+
+FEED_FIELDS = ("title", "subtitle")
+FEED_PROJECTION = {
+    "created_at": 1,
+    "updated_at": 1,
+    "cover_url": 1,
+    **{field: 1 for field in FEED_FIELDS},
+    **{f"views.{lang}.{field}": 1 for lang in VIEW_LANGS for field in FEED_FIELDS},
+}
+
+
+def feed_entry_from_document(document: dict) -> dict:
+    """Sitemap/feed entry: slug, dates, cover and title/subtitle in every view language."""
+    views = document.get("views") or {}
+    return {
+        "slug": document["_id"],
+        "created_at": document.get("created_at"),
+        "updated_at": document.get("updated_at") or document.get("created_at"),
+        "cover_url": document.get("cover_url"),
+        "views": {
+            lang: {field: (views.get(lang) or {}).get(field) or document.get(field) for field in FEED_FIELDS}
+            for lang in VIEW_LANGS
+        },
+    }
+
+
+# Published articles for sitemap.xml and feeds; maintained like the search index.
+feed_index = ArticleFeedIndex()
+subscribe("articles", feed_index.invalidate)
+# One refresh at a time, so a request arriving mid-rebuild waits for the load
+# instead of reading a half-empty index.
+feed_refresh_lock = asyncio.Lock()
+
+
+def build_localized_views(document: dict) -> Dict[str, dict]:
+    """
+    Precompute the ready-to-serve translatable fields for every language.
+
+    For each field the chain is: requested lang, then LANG_FALLBACK in order.
+    Reaching BASE_LANG in the chain falls back to the base (top-level) content,
+    which is also the final fallback when no translation has the field.
+    """
+    translations = document.get("translations") or {}
+    views = {}
+    for lang in VIEW_LANGS:
+        chain = [lang] + [code for code in LANG_FALLBACK if code != lang]
+        view = {}
+        for field in TRANSLATABLE_FIELDS:
+            value = None
+            for code in chain:
+                value = (translations.get(code) or {}).get(field)
+                if value is None and code == BASE_LANG:
+                    value = document.get(field)
+                if value is not None:
+                    break
+            if value is None:
+                value = document.get(field)
+            if value is not None:
+                view[field] = value
+        views[lang] = view
+    return views
+
+
+# Fields stored alongside each article that are derived from its content.
+DERIVED_FIELDS = ("views", "facets")
+DERIVED_SOURCE_FIELDS = TRANSLATABLE_FIELDS + ("translations", "price")
+WITHOUT_DERIVED = {field: 0 for field in DERIVED_FIELDS}
+
+
+def derive_fields(document: dict) -> dict:
+    """Write-time projections of an article: localized views and parsed facets."""
+    return {"views": build_localized_views(document), "facets": parse_facets(document)}
+
+
+def localized_pipeline(query: dict, lang: str) -> List[dict]:
+    """Aggregation that returns documents with views.<lang> merged over the base fields."""
+    return [
+        {"$match": query},
+        {"$replaceWith": {"$mergeObjects": ["$$ROOT", f"$views.{lang}"]}},
+        {"$unset": list(DERIVED_FIELDS)},
+    ]
+
+
+def card_stages(lang: Optional[str], after: Optional[str], limit: int) -> List[dict]:
+    """
+    Keyset pagination stages: newest first, ordered by (created_at, _id),
+    projected down to card fields. Fetches one extra row to detect a next page.
+    """
+    stages = []
+    if after:
+        created_at, slug = decode_cursor(after)
+        stages.append(
+            {
+                "$match": {
+                    "$or": [
+                        {"created_at": {"$lt": created_at}},
+                        {"created_at": created_at, "_id": {"$lt": slug}},
+                    ]
+                }
+            }
+        )
+
+    projection = {field: 1 for field in CARD_BASE_FIELDS}
+    for field in CARD_LOCALIZED_FIELDS:
+        projection[field] = {"$ifNull": [f"$views.{lang}.{field}", f"${field}"]} if lang else 1
+
+    return stages + [
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit + 1},
+        {"$project": projection},
+    ]
+
+
+def card_pipeline(query: dict, lang: Optional[str], after: Optional[str], limit: int) -> List[dict]:
+    return [{"$match": query}] + card_stages(lang, after, limit)
+
+
+def build_filter_query(
+    post_type: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    currency: Optional[str] = None,
+    min_area: Optional[float] = None,
+    max_area: Optional[float] = None,
+    dispositions: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    location: Optional[str] = None,
+) -> dict:
+    """Match on the parsed `facets` of published articles."""
+    query: dict = {"status": "published"}
+    if post_type:
+        query["post_type"] = post_type
+    if currency:
+        query["facets.currency"] = currency
+    price_range = {op: value for op, value in (("$gte", min_price), ("$lte", max_price)) if value is not None}
+    if price_range:
+        query["facets.price"] = price_range
+    area_range = {op: value for op, value in (("$gte", min_area), ("$lte", max_area)) if value is not None}
+    if area_range:
+        query["facets.area_m2"] = area_range
+    if dispositions:
+        query["facets.disposition"] = {"$in": [normalize_disposition(d) for d in dispositions]}
+    if tags:
+        query["tags"] = {"$all": tags}
+    if location:
+        terms = tokenize(location)
+        if terms:
+            query["facets.location_terms"] = {"$all": terms}
+    return query
+
+
+def _facet_counts(path: str, unwind: bool = False, limit: int = 30) -> List[dict]:
+    stages = [{"$match": {path: {"$ne": None}}}]
+    if unwind:
+        stages.append({"$unwind": f"${path}"})
+    return stages + [
+        {"$sortByCount": f"${path}"},
+        {"$limit": limit},
+        {"$project": {"_id": 0, "value": "$_id", "count": 1}},
+    ]
+
+
+def _facet_ranges(path: str, buckets: int = 5) -> List[dict]:
+    return [
+        {"$match": {path: {"$ne": None}}},
+        {"$bucketAuto": {"groupBy": f"${path}", "buckets": buckets}},
+        {"$project": {"_id": 0, "min": "$_id.min", "max": "$_id.max", "count": 1}},
+    ]
+
+
+def filter_pipeline(query: dict, lang: Optional[str], after: Optional[str], limit: int) -> List[dict]:
+    """One aggregation returning a card page plus facet counts over the filtered set."""
+    return [
+        {"$match": query},
+        {
+            "$facet": {
+                "items": card_stages(lang, after, limit),
+                "post_type": _facet_counts("post_type"),
+                "disposition": _facet_counts("facets.disposition"),
+                "tags": _facet_counts("tags", unwind=True),
+                "price": _facet_ranges("facets.price"),
+                "area_m2": _facet_ranges("facets.area_m2"),
+            }
+        },
+    ]
+
+
+def encode_cursor(created_at: datetime, slug: str) -> str:
+    raw = f"{created_at.isoformat()}|{slug}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, slug = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), slug
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def build_card_page(documents: List[dict], limit: int) -> dict:
+    items = [ArticleCollection._serialize(doc) for doc in documents[:limit]]
+    next_cursor = None
+    if len(documents) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor(last["created_at"], last["slug"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def new_article_document(data: dict, now: datetime) -> dict:
+    """Full document for a new article: slug as `_id`, timestamps and derived fields."""
+    slug = data.get("slug")
+    if not slug:
+        raise ValueError("Slug is required")
+
+    document = {
+        "_id": slug,
+        **data,
+        "created_at": now,
+        "updated_at": now,
+    }
+    if document.get("source_instagram_id") is None:
+        # Explicit nulls would collide in the unique sparse index.
+        document.pop("source_instagram_id", None)
+    document.update(derive_fields(document))
+    return document
+
+
+def duplicate_article_error(details: Optional[dict]) -> ValueError:
+    key_pattern = (details or {}).get("keyPattern") or {}
+    if "source_instagram_id" in key_pattern:
+        return ValueError("Article for this Instagram post already exists")
+    return ValueError("Article with this slug already exists")
+
+
+def plan_create_many(items: List[dict]) -> Tuple[List[dict], dict]:
+    """Build insertable documents; items without a slug are reported as errors up front."""
+    now = datetime.utcnow()
+    documents, report = [], {"created": [], "conflicts": [], "errors": []}
+    for data in items:
+        try:
+            documents.append(new_article_document(data, now))
+        except ValueError as exc:
+            report["errors"].append({"slug": data.get("slug"), "error": str(exc)})
+    return documents, report
+
+
+def apply_insert_many_errors(error: BulkWriteError, documents: List[dict], report: dict) -> set:
+    """Record per-document insert failures; returns the failed slugs."""
+    failed = set()
+    for write_error in error.details.get("writeErrors", []):
+        slug = documents[write_error["index"]]["_id"]
+        failed.add(slug)
+        if write_error.get("code") == 11000:
+            report["conflicts"].append(slug)
+        else:
+            report["errors"].append({"slug": slug, "error": write_error.get("errmsg") or "Insert failed"})
+    return failed
+
+
+BULK_STATUS = {"publish": "published", "unpublish": "draft"}
+
+
+def plan_bulk_operations(
+    operations: List[dict], existing: set, retag_sources: Dict[str, dict]
+) -> Tuple[List, List[int], List[dict]]:
+    """
+    Turn admin bulk operations ({"slug", "action", "tags"}) into bulk_write
+    requests. Returns (requests, result index of each request, per-item results);
+    items that cannot be applied are marked failed up front.
+    """
+    now = datetime.utcnow()
+    requests, slots, results, seen = [], [], [], set()
+    for operation in operations:
+        slug, action = operation["slug"], operation["action"]
+        result = {"slug": slug, "action": action, "ok": False, "error": None}
+        results.append(result)
+        if slug in seen:
+            result["error"] = "Duplicate operation for this slug"
+            continue
+        seen.add(slug)
+        if slug not in existing:
+            result["error"] = "Article not found"
+            continue
+
+        if action == "delete":
+            request = DeleteOne({"_id": slug})
+        elif action == "retag":
+            if operation.get("tags") is None:
+                result["error"] = "`tags` is required for retag"
+                continue
+            updates = {"tags": operation["tags"]}
+            # Tags feed the localized views and facets, so re-derive them.
+            updates.update(derive_fields({**retag_sources[slug], **updates}))
+            request = UpdateOne({"_id": slug}, {"$set": {**updates, "updated_at": now}})
+        else:
+            request = UpdateOne({"_id": slug}, {"$set": {"status": BULK_STATUS[action], "updated_at": now}})
+
+        result["ok"] = True
+        requests.append(request)
+        slots.append(len(results) - 1)
+    return requests, slots, results
+
+
+def apply_bulk_write_errors(error: BulkWriteError, slots: List[int], results: List[dict]):
+    for write_error in error.details.get("writeErrors", []):
+        result = results[slots[write_error["index"]]]
+        result["ok"] = False
+        result["error"] = write_error.get("errmsg") or "Write failed"
+
+
+def bulk_summary(results: List[dict]) -> dict:
+    succeeded = sum(1 for result in results if result["ok"])
+    return {"results": results, "succeeded": succeeded, "failed": len(results) - succeeded}
+
+
+def invalidate_articles(slugs) -> None:
+    """
+    One invalidation for a batch write: per slug when a single article changed,
+    topic-wide otherwise, so subscribers do one pass instead of one per item.
+    """
+    slugs = set(slugs)
+    if len(slugs) == 1:
+        invalidate("articles", next(iter(slugs)))
+    elif slugs:
+        invalidate("articles")
 
 
 class ArticleCollection:
@@ -13,11 +405,30 @@ class ArticleCollection:
     Documents are keyed by slug (stored in the `_id` field).
     """
 
+    INDEXES = [
+        # list(status=...) and the keyset-paginated cards listing.
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at"),
+        # Collection version (count + newest updated_at) for conditional GETs.
+        IndexModel([("status", ASCENDING), ("updated_at", DESCENDING)], name="status_updated_at"),
+        # Change polling on standalone mongod (dbase/change_streams.py).
+        IndexModel([("updated_at", ASCENDING)], name="updated_at"),
+        # Instagram dedup; sparse so manually created articles (no field) are not indexed.
+        IndexModel([("source_instagram_id", ASCENDING)], name="source_instagram_id", unique=True, sparse=True),
+        # Faceted filtering on parsed listing data.
+        IndexModel([("status", ASCENDING), ("post_type", ASCENDING), ("facets.price", ASCENDING)], name="status_post_type_price"),
+        IndexModel([("status", ASCENDING), ("facets.area_m2", ASCENDING)], name="status_area"),
+        IndexModel([("facets.disposition", ASCENDING)], name="disposition"),
+        IndexModel([("facets.location_terms", ASCENDING)], name="location_terms"),
+        IndexModel([("tags", ASCENDING)], name="tags"),
+    ]
+
     def __init__(self, collection_name: Optional[str] = None):
         self.db = DbaseDriver()
         self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_ARTICLES_COLLECTION", "articles"))
 
-    def _serialize(self, document: Optional[dict]) -> Optional[dict]:
+    @staticmethod
+    def _serialize(document: Optional[dict]) -> Optional[dict]:
         if not document:
             return None
 
@@ -25,6 +436,8 @@ class ArticleCollection:
         doc["id"] = str(doc.get("_id"))
         doc["slug"] = doc.get("_id")
         doc.pop("_id", None)
+        for field in DERIVED_FIELDS:
+            doc.pop(field, None)
 
         for key in ("created_at", "updated_at"):
             if isinstance(doc.get(key), datetime):
@@ -32,58 +445,184 @@ class ArticleCollection:
 
         return doc
 
-    def list(self, status: Optional[str] = None) -> List[dict]:
+    def list(self, status: Optional[str] = None, lang: Optional[str] = None) -> List[dict]:
+        key = ("list", status, lang)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
         query = {"status": status} if status else {}
-        return [self._serialize(doc) for doc in self.collection.find(query)]
+        if lang:
+            cursor = self.collection.aggregate(localized_pipeline(query, lang))
+        else:
+            cursor = self.collection.find(query, WITHOUT_DERIVED)
+        articles = [self._serialize(doc) for doc in cursor]
+        article_cache.set(key, articles, generation)
+        return articles
 
-    def get(self, slug: str) -> Optional[dict]:
-        document = self.collection.find_one({"_id": slug})
-        return self._serialize(document)
+    def get(self, slug: str, lang: Optional[str] = None) -> Optional[dict]:
+        key = ("get", slug, lang)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
 
-    def create(self, data: dict) -> dict:
-        slug = data.get("slug")
-        if not slug:
-            raise ValueError("Slug is required")
-
-        if self.collection.find_one({"_id": slug}):
-            raise ValueError("Article with this slug already exists")
-
-        now = datetime.utcnow()
-        document = {
-            "_id": slug,
-            **data,
-            "created_at": now,
-            "updated_at": now,
-        }
+        generation = article_cache.generation
+        if lang:
+            cursor = self.collection.aggregate(localized_pipeline({"_id": slug}, lang))
+            document = next(iter(cursor.to_list(1)), None)
+        else:
+            document = self.collection.find_one({"_id": slug}, WITHOUT_DERIVED)
+        article = self._serialize(document)
+        article_cache.set(key, article, generation)
+        return article
+
+    def list_cards(
+        self,
+        status: Optional[str] = None,
+        lang: Optional[str] = None,
+        limit: int = 24,
+        after: Optional[str] = None,
+    ) -> dict:
+        """Return one page of listing cards: {"items": [...], "next_cursor": str | None}."""
+        key = ("cards", status, lang, limit, after)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        query = {"status": status} if status else {}
+        cursor = self.collection.aggregate(card_pipeline(query, lang, after, limit))
+        page = build_card_page(cursor.to_list(limit + 1), limit)
+        article_cache.set(key, page, generation)
+        return page
 
-        self.collection.insert_one(document)
+    def create(self, data: dict) -> dict:
+        document = new_article_document(data, datetime.utcnow())
+        # The unique `_id` (slug) decides conflicts in a single round trip.
+        try:
+            self.collection.insert_one(document)
+        except DuplicateKeyError as exc:
+            raise duplicate_article_error(exc.details) from exc
+        invalidate("articles", document["_id"])
         return self._serialize(document)
 
+    def create_many(self, items: List[dict]) -> dict:
+        """
+        Insert a batch of articles with one unordered insert_many.
+        Returns {"created": [slugs], "conflicts": [slugs], "errors": [{"slug", "error"}]}.
+        """
+        documents, report = plan_create_many(items)
+        if not documents:
+            return report
+
+        failed = set()
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            failed = apply_insert_many_errors(exc, documents, report)
+        report["created"] = [document["_id"] for document in documents if document["_id"] not in failed]
+        invalidate_articles(report["created"])
+        return report
+
     def update(self, slug: str, updates: dict) -> Optional[dict]:
         if not updates:
             existing = self.collection.find_one({"_id": slug})
             return self._serialize(existing)
 
+        if any(field in updates for field in DERIVED_SOURCE_FIELDS):
+            current = self.collection.find_one({"_id": slug}, WITHOUT_DERIVED)
+            if not current:
+                return None
+            updates.update(derive_fields({**current, **updates}))
+
         updates["updated_at"] = datetime.utcnow()
 
         document = self.collection.find_one_and_update(
             {"_id": slug}, {"$set": updates}, return_document=ReturnDocument.AFTER
         )
+        invalidate("articles", slug)
 
         return self._serialize(document)
 
     def delete(self, slug: str) -> bool:
         result = self.collection.delete_one({"_id": slug})
+        invalidate("articles", slug)
         return result.deleted_count == 1
 
+    def merge_translations(self, slug: str, localized: Dict[str, dict]) -> bool:
+        """
+        Set translations.<lang>.<field> in place, so languages written
+        concurrently never drop each other, then re-derive views and facets
+        from the stored document. False if the article is gone.
+        """
+        updates = {
+            f"translations.{lang}.{field}": value
+            for lang, fields in localized.items()
+            for field, value in fields.items()
+        }
+        updates["updated_at"] = datetime.utcnow()
+        document = self.collection.find_one_and_update(
+            {"_id": slug}, {"$set": updates}, projection=WITHOUT_DERIVED, return_document=ReturnDocument.AFTER
+        )
+        if document is None:
+            return False
+        # Only applied while the translations are still the ones derived from;
+        # a writer that changed them since re-derives with its own document.
+        self.collection.update_one(
+            {"_id": slug, "translations": document.get("translations")}, {"$set": derive_fields(document)}
+        )
+        invalidate("articles", slug)
+        return True
+
+    def bulk(self, operations: List[dict]) -> dict:
+        """Apply publish/unpublish/retag/delete operations in one unordered bulk_write."""
+        slugs = list({operation["slug"] for operation in operations})
+        existing = {document["_id"] for document in self.collection.find({"_id": {"$in": slugs}}, {"_id": 1})}
+        retag = [operation["slug"] for operation in operations if operation["action"] == "retag"]
+        retag_sources = {
+            document["_id"]: document
+            for document in (self.collection.find({"_id": {"$in": retag}}, WITHOUT_DERIVED) if retag else [])
+        }
+
+        requests, slots, results = plan_bulk_operations(operations, existing, retag_sources)
+        if requests:
+            try:
+                self.collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as exc:
+                apply_bulk_write_errors(exc, slots, results)
+            # One invalidation after the single write.
+            invalidate_articles(results[slot]["slug"] for slot in slots)
+        return bulk_summary(results)
+
+    def rebuild_derived_fields(self, batch_size: int = 200) -> int:
+        """
+        Backfill migration: recompute views and facets for every article in
+        batches of `batch_size` unordered bulk writes.
+        """
+        updated = 0
+        batch = []
+        for document in self.collection.find({}, WITHOUT_DERIVED).batch_size(batch_size):
+            batch.append(UpdateOne({"_id": document["_id"]}, {"$set": derive_fields(document)}))
+            if len(batch) >= batch_size:
+                updated += self.collection.bulk_write(batch, ordered=False).modified_count
+                batch = []
+        if batch:
+            updated += self.collection.bulk_write(batch, ordered=False).modified_count
+        invalidate("articles")
+        return updated
+
     # --- Instagram source helpers ---
 
-    def get_source_instagram_ids(self) -> List[str]:
-        """Return all source_instagram_id values stored in articles."""
-        docs = self.collection.find(
-            {"source_instagram_id": {"$exists": True, "$ne": None}},
-            {"source_instagram_id": 1},
-        )
+    def get_source_instagram_ids(self, instagram_ids: Optional[List[str]] = None, limit: int = 0) -> List[str]:
+        """
+        Return the source_instagram_id values stored in articles; restricted
+        to `instagram_ids` (an index-only $in lookup) when given.
+        """
+        query = {"source_instagram_id": {"$exists": True, "$ne": None}}
+        if instagram_ids is not None:
+            query = {"source_instagram_id": {"$in": list(instagram_ids)}}
+        docs = self.collection.find(query, {"_id": 0, "source_instagram_id": 1}).limit(limit)
         return [doc["source_instagram_id"] for doc in docs]
 
     def get_by_instagram_id(self, instagram_id: str) -> Optional[dict]:
@@ -91,3 +630,247 @@ class ArticleCollection:
         document = self.collection.find_one({"source_instagram_id": instagram_id})
         return self._serialize(document)
 
+
+class AsyncArticleCollection:
+    """
+    Async counterpart of ArticleCollection, used by the API routers so that
+    Mongo I/O does not occupy a threadpool worker.
+    """
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = AsyncDbaseDriver()
+        self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_ARTICLES_COLLECTION", "articles"))
+
+    _serialize = staticmethod(ArticleCollection._serialize)
+
+    async def list(self, status: Optional[str] = None, lang: Optional[str] = None) -> List[dict]:
+        key = ("list", status, lang)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        query = {"status": status} if status else {}
+        if lang:
+            cursor = await self.collection.aggregate(localized_pipeline(query, lang))
+        else:
+            cursor = self.collection.find(query, WITHOUT_DERIVED)
+        articles = [self._serialize(doc) async for doc in cursor]
+        article_cache.set(key, articles, generation)
+        return articles
+
+    async def get(self, slug: str, lang: Optional[str] = None) -> Optional[dict]:
+        key = ("get", slug, lang)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        if lang:
+            cursor = await self.collection.aggregate(localized_pipeline({"_id": slug}, lang))
+            document = next(iter(await cursor.to_list(1)), None)
+        else:
+            document = await self.collection.find_one({"_id": slug}, WITHOUT_DERIVED)
+        article = self._serialize(document)
+        article_cache.set(key, article, generation)
+        return article
+
+    async def list_cards(
+        self,
+        status: Optional[str] = None,
+        lang: Optional[str] = None,
+        limit: int = 24,
+        after: Optional[str] = None,
+    ) -> dict:
+        """Return one page of listing cards: {"items": [...], "next_cursor": str | None}."""
+        key = ("cards", status, lang, limit, after)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        query = {"status": status} if status else {}
+        cursor = await self.collection.aggregate(card_pipeline(query, lang, after, limit))
+        page = build_card_page(await cursor.to_list(limit + 1), limit)
+        article_cache.set(key, page, generation)
+        return page
+
+    async def filter(self, filters: dict, lang: Optional[str] = None, limit: int = 24, after: Optional[str] = None) -> dict:
+        """
+        Faceted listing filter. `filters` are build_filter_query() keyword args.
+        Returns {"items", "next_cursor", "facets"}.
+        """
+        key = ("filter", tuple(sorted((k, str(v)) for k, v in filters.items())), lang, limit, after)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        cursor = await self.collection.aggregate(filter_pipeline(build_filter_query(**filters), lang, after, limit))
+        result = (await cursor.to_list(1))[0]
+        page = build_card_page(result.pop("items"), limit)
+        page["facets"] = result
+        article_cache.set(key, page, generation)
+        return page
+
+    async def search(self, query: str, lang: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """Full-text search over published articles; returns cards with a `score`."""
+        await self._refresh_search_index()
+        hits = []
+        for document, score in search_index.search(query, status="published", limit=limit):
+            card = self._serialize(card_from_document(document, lang))
+            card["score"] = round(score, 4)
+            hits.append(card)
+        return hits
+
+    async def _refresh_search_index(self):
+        async with search_refresh_lock:
+            rebuild, dirty = search_index.take_pending()
+            try:
+                await self._load_search_index(rebuild, dirty)
+            except BaseException:
+                search_index.restore_pending(rebuild, dirty)
+                raise
+
+    async def _load_search_index(self, rebuild: bool, dirty: set):
+        if rebuild:
+            documents = await self.collection.find({}, SEARCH_PROJECTION).to_list()
+            search_index.rebuild(documents)
+        elif dirty:
+            found = set()
+            async for document in self.collection.find({"_id": {"$in": list(dirty)}}, SEARCH_PROJECTION):
+                search_index.upsert(document)
+                found.add(document["_id"])
+            for slug in dirty - found:
+                search_index.remove(slug)
+
+    async def feed(self) -> ArticleFeedIndex:
+        """The published-articles feed index, refreshed for any pending writes."""
+        async with feed_refresh_lock:
+            rebuild, dirty = feed_index.take_pending()
+            try:
+                await self._load_feed(rebuild, dirty)
+            except BaseException:
+                feed_index.restore_pending(rebuild, dirty)
+                raise
+        return feed_index
+
+    async def _load_feed(self, rebuild: bool, dirty: set):
+        published = {"status": "published"}
+        if rebuild:
+            documents = await self.collection.find(published, FEED_PROJECTION).to_list()
+            feed_index.rebuild([feed_entry_from_document(document) for document in documents])
+        elif dirty:
+            found = set()
+            async for document in self.collection.find({**published, "_id": {"$in": list(dirty)}}, FEED_PROJECTION):
+                feed_index.upsert(feed_entry_from_document(document))
+                found.add(document["_id"])
+            # Unpublished or deleted since the last refresh.
+            for slug in dirty - found:
+                feed_index.remove(slug)
+
+    async def version(self, status: Optional[str] = None) -> dict:
+        """Cheap change validator for list endpoints: {"count", "updated_at"}."""
+        key = ("version", status)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        query = {"status": status} if status else {}
+        cursor = await self.collection.aggregate(
+            [
+                {"$match": query},
+                {"$group": {"_id": None, "count": {"$sum": 1}, "updated_at": {"$max": "$updated_at"}}},
+            ]
+        )
+        result = next(iter(await cursor.to_list(1)), None) or {}
+        version = {"count": result.get("count", 0), "updated_at": result.get("updated_at")}
+        article_cache.set(key, version, generation)
+        return version
+
+    async def article_version(self, slug: str) -> Optional[dict]:
+        """{"status", "updated_at"} of a single article, or None if it does not exist."""
+        key = ("article_version", slug)
+        cached = article_cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        generation = article_cache.generation
+        document = await self.collection.find_one({"_id": slug}, {"status": 1, "updated_at": 1})
+        version = {"status": document.get("status"), "updated_at": document.get("updated_at")} if document else None
+        article_cache.set(key, version, generation)
+        return version
+
+    async def create(self, data: dict) -> dict:
+        document = new_article_document(data, datetime.utcnow())
+        # The unique `_id` (slug) decides conflicts in a single round trip.
+        try:
+            await self.collection.insert_one(document)
+        except DuplicateKeyError as exc:
+            raise duplicate_article_error(exc.details) from exc
+        invalidate("articles", document["_id"])
+        return self._serialize(document)
+
+    async def create_many(self, items: List[dict]) -> dict:
+        """
+        Insert a batch of articles with one unordered insert_many.
+        Returns {"created": [slugs], "conflicts": [slugs], "errors": [{"slug", "error"}]}.
+        """
+        documents, report = plan_create_many(items)
+        if not documents:
+            return report
+
+        failed = set()
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            failed = apply_insert_many_errors(exc, documents, report)
+        report["created"] = [document["_id"] for document in documents if document["_id"] not in failed]
+        invalidate_articles(report["created"])
+        return report
+
+    async def update(self, slug: str, updates: dict) -> Optional[dict]:
+        if not updates:
+            existing = await self.collection.find_one({"_id": slug})
+            return self._serialize(existing)
+
+        if any(field in updates for field in DERIVED_SOURCE_FIELDS):
+            current = await self.collection.find_one({"_id": slug}, WITHOUT_DERIVED)
+            if not current:
+                return None
+            updates.update(derive_fields({**current, **updates}))
+
+        updates["updated_at"] = datetime.utcnow()
+
+        document = await self.collection.find_one_and_update(
+            {"_id": slug}, {"$set": updates}, return_document=ReturnDocument.AFTER
+        )
+        invalidate("articles", slug)
+
+        return self._serialize(document)
+
+    async def delete(self, slug: str) -> bool:
+        result = await self.collection.delete_one({"_id": slug})
+        invalidate("articles", slug)
+        return result.deleted_count == 1
+
+    async def bulk(self, operations: List[dict]) -> dict:
+        """Apply publish/unpublish/retag/delete operations in one unordered bulk_write."""
+        slugs = list({operation["slug"] for operation in operations})
+        existing = {document["_id"] async for document in self.collection.find({"_id": {"$in": slugs}}, {"_id": 1})}
+        retag = [operation["slug"] for operation in operations if operation["action"] == "retag"]
+        retag_sources = {}
+        if retag:
+            async for document in self.collection.find({"_id": {"$in": retag}}, WITHOUT_DERIVED):
+                retag_sources[document["_id"]] = document
+
+        requests, slots, results = plan_bulk_operations(operations, existing, retag_sources)
+        if requests:
+            try:
+                await self.collection.bulk_write(requests, ordered=False)
+            except BulkWriteError as exc:
+                apply_bulk_write_errors(exc, slots, results)
+            # One invalidation after the single write.
+            invalidate_articles(results[slot]["slug"] for slot in slots)
+        return bulk_summary(results)
@@ -0,0 +1,134 @@
+import os
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+
+from dbase.driver import AsyncDbaseDriver, DbaseDriver
+
+
+def _object_id(job_id: str) -> Optional[ObjectId]:
+    try:
+        return ObjectId(job_id)
+    except (InvalidId, TypeError):
+        return None
+
+
+class JobCollection:
+    """
+    Background job records (e.g. AI localization) stored in MongoDB.
+    A job moves queued -> running -> completed | failed; workers claim
+    queued jobs atomically so each job runs once across API workers.
+    """
+
+    INDEXES = [
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at"),
+        IndexModel([("kind", ASCENDING), ("target", ASCENDING), ("created_at", DESCENDING)], name="kind_target"),
+        # Finished job records are only kept for a week.
+        IndexModel([("finished_at", ASCENDING)], name="finished_at_ttl", expireAfterSeconds=7 * 24 * 3600),
+    ]
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = DbaseDriver()
+        self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_JOBS_COLLECTION", "jobs"))
+
+    @staticmethod
+    def _serialize(document: Optional[dict]) -> Optional[dict]:
+        if not document:
+            return None
+        doc = document.copy()
+        doc["id"] = str(doc.pop("_id"))
+        return doc
+
+    def create(self, kind: str, target: str, params: dict) -> dict:
+        now = datetime.utcnow()
+        document = {
+            "kind": kind,
+            "target": target,
+            "params": params,
+            "status": "queued",
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "started_at": None,
+            "finished_at": None,
+        }
+        result = self.collection.insert_one(document)
+        document["_id"] = result.inserted_id
+        return self._serialize(document)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        object_id = _object_id(job_id)
+        if object_id is None:
+            return None
+        return self._serialize(self.collection.find_one({"_id": object_id}))
+
+    def claim(self, job_id: str, worker: str) -> Optional[dict]:
+        """Atomically move a queued job to running; None if another worker got it first."""
+        now = datetime.utcnow()
+        document = self.collection.find_one_and_update(
+            {"_id": ObjectId(job_id), "status": "queued"},
+            {"$set": {"status": "running", "worker": worker, "started_at": now, "updated_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+        return self._serialize(document)
+
+    def complete(self, job_id: str, worker: str, result: dict) -> bool:
+        return self._finish(job_id, worker, {"status": "completed", "result": result})
+
+    def fail(self, job_id: str, worker: str, error: str) -> bool:
+        return self._finish(job_id, worker, {"status": "failed", "error": error[:2000]})
+
+    def _finish(self, job_id: str, worker: str, fields: dict) -> bool:
+        """
+        Record the outcome of a job `worker` claimed. False when the worker
+        lost it meanwhile (failed or re-queued as stale), leaving it untouched.
+        """
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": ObjectId(job_id), "status": "running", "worker": worker},
+            {"$set": {**fields, "updated_at": now, "finished_at": now}},
+        )
+        return result.matched_count == 1
+
+    def queued_ids(self, kind: str) -> List[str]:
+        cursor = self.collection.find({"kind": kind, "status": "queued"}, {"_id": 1}).sort("created_at", 1)
+        return [str(document["_id"]) for document in cursor]
+
+    def fail_stale(self, kind: str, timeout_seconds: float) -> int:
+        """Mark jobs left running by a crashed worker as failed."""
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout_seconds)
+        now = datetime.utcnow()
+        result = self.collection.update_many(
+            {"kind": kind, "status": "running", "started_at": {"$lt": cutoff}},
+            {"$set": {"status": "failed", "error": "Worker stopped before the job finished", "updated_at": now, "finished_at": now}},
+        )
+        return result.modified_count
+
+    def requeue_stale(self, kind: str, timeout_seconds: float) -> int:
+        """Put jobs left running by a crashed worker back in the queue."""
+        cutoff = datetime.utcnow() - timedelta(seconds=timeout_seconds)
+        result = self.collection.update_many(
+            {"kind": kind, "status": "running", "started_at": {"$lt": cutoff}},
+            {"$set": {"status": "queued", "worker": None, "started_at": None, "updated_at": datetime.utcnow()}},
+        )
+        return result.modified_count
+
+
+class AsyncJobCollection:
+    """Async counterpart of JobCollection used by the API routers."""
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = AsyncDbaseDriver()
+        self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_JOBS_COLLECTION", "jobs"))
+
+    _serialize = staticmethod(JobCollection._serialize)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        object_id = _object_id(job_id)
+        if object_id is None:
+            return None
+        return self._serialize(await self.collection.find_one({"_id": object_id}))
@@ -0,0 +1,56 @@
+import os
+from datetime import datetime
+from typing import Optional
+
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+
+from dbase.driver import DbaseDriver
+
+
+class MediaCollection:
+    """
+    Index of content-addressed media files: sha256 -> file name in MEDIA_ROOT.
+    `refs` counts the owners (uploads, pipeline downloads) that were handed the
+    file; it is released by DELETE /media and the file is removed at zero.
+    """
+
+    INDEXES = [
+        IndexModel([("filename", ASCENDING)], name="filename", unique=True),
+    ]
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = DbaseDriver()
+        self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_MEDIA_COLLECTION", "media"))
+
+    def get(self, sha256: str) -> Optional[dict]:
+        return self.collection.find_one({"_id": sha256})
+
+    def get_by_filename(self, filename: str) -> Optional[dict]:
+        return self.collection.find_one({"filename": filename})
+
+    def acquire(self, sha256: str, filename: str, size: int, refs: int = 1) -> dict:
+        """Register (or re-reference) a stored file; returns the media record."""
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {"_id": sha256},
+            {
+                "$inc": {"refs": refs},
+                "$set": {"updated_at": now},
+                "$setOnInsert": {"filename": filename, "size": size, "created_at": now},
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+
+    def release(self, filename: str) -> Optional[int]:
+        """Drop one reference; returns the remaining count, or None for untracked files."""
+        document = self.collection.find_one_and_update(
+            {"filename": filename},
+            {"$inc": {"refs": -1}, "$set": {"updated_at": datetime.utcnow()}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            return None
+        if document["refs"] <= 0:
+            self.collection.delete_one({"_id": document["_id"], "refs": {"$lte": 0}})
+        return document["refs"]
@@ -1,7 +1,8 @@
 import os
+from datetime import datetime
 from typing import List, Optional
 
-from dbase.driver import DbaseDriver
+from dbase.driver import AsyncDbaseDriver, DbaseDriver
 
 
 class PostCollection:
@@ -10,6 +11,9 @@ class PostCollection:
     Each document is keyed by the Instagram post id (_id).
     """
 
+    # All lookups go through _id.
+    INDEXES = []
+
     def __init__(self, collection_name: Optional[str] = None):
         self.db = DbaseDriver()
         self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_COLLECTION", "posts"))
@@ -19,6 +23,7 @@ class PostCollection:
 
     def upsert_post(self, instagram_id: str, document: dict):
         document["_id"] = instagram_id
+        document["updated_at"] = datetime.utcnow()
         return self.collection.update_one({"_id": instagram_id}, {"$set": document}, upsert=True)
 
     def get_instagram_ids(self) -> List[str]:
@@ -30,4 +35,39 @@ class PostCollection:
     def delete_by_ids(self, ids: List[str]):
         if not ids:
             return None
-        return self.collection.delete_many({"_id": {"$in": ids}})
\ No newline at end of file
+        return self.collection.delete_many({"_id": {"$in": ids}})
+
+
+class AsyncPostCollection:
+    """Async counterpart of PostCollection used by the API routers."""
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = AsyncDbaseDriver()
+        self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_COLLECTION", "posts"))
+
+    async def get_all_posts(self) -> List[dict]:
+        return await self.collection.find({}).to_list()
+
+    async def version(self) -> dict:
+        """Cheap change validator for the posts list: {"count", "updated_at"}."""
+        cursor = await self.collection.aggregate(
+            [{"$group": {"_id": None, "count": {"$sum": 1}, "updated_at": {"$max": "$updated_at"}}}]
+        )
+        result = next(iter(await cursor.to_list(1)), None) or {}
+        return {"count": result.get("count", 0), "updated_at": result.get("updated_at")}
+
+    async def upsert_post(self, instagram_id: str, document: dict):
+        document["_id"] = instagram_id
+        document["updated_at"] = datetime.utcnow()
+        return await self.collection.update_one({"_id": instagram_id}, {"$set": document}, upsert=True)
+
+    async def get_instagram_ids(self) -> List[str]:
+        return [doc["_id"] async for doc in self.collection.find({}, {"_id": 1})]
+
+    async def get_post_by_id(self, instagram_id: str):
+        return await self.collection.find_one({"_id": instagram_id})
+
+    async def delete_by_ids(self, ids: List[str]):
+        if not ids:
+            return None
+        return await self.collection.delete_many({"_id": {"$in": ids}})
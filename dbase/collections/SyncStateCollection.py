@@ -0,0 +1,35 @@
+import os
+from datetime import datetime
+from typing import Optional
+
+from dbase.driver import DbaseDriver
+
+
+class SyncStateCollection:
+    """
+    Per-source sync state, e.g. the Instagram high-water mark of an account:
+    {"_id": "instagram:<username>", "high_water": {"instagram_id", "taken_at"},
+     "resume": {"cursor", "high_water"} | None}.
+    """
+
+    INDEXES = []
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = DbaseDriver()
+        self.collection = self.db.get_collection(collection_name or os.getenv("MONGODB_SYNC_STATE_COLLECTION", "sync_state"))
+
+    @staticmethod
+    def key(source: str, account: str) -> str:
+        return f"{source}:{account}"
+
+    def get(self, source: str, account: str) -> Optional[dict]:
+        return self.collection.find_one({"_id": self.key(source, account)})
+
+    def set_state(self, source: str, account: str, high_water: Optional[dict], resume: Optional[dict]):
+        """Store the mark and, while a catch-up is unfinished, where it continues."""
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"_id": self.key(source, account)},
+            {"$set": {"high_water": high_water, "resume": resume, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+            upsert=True,
+        )
@@ -3,14 +3,21 @@ from datetime import datetime
 from typing import List, Optional
 
 from bson import ObjectId
-from pymongo import ReturnDocument
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
 
-from dbase.driver import DbaseDriver
+from dbase.driver import AsyncDbaseDriver, DbaseDriver
+from dbase.invalidation import invalidate
 
 
 class TeamCollection:
     """CRUD helper for team members stored in MongoDB."""
 
+    INDEXES = [
+        IndexModel([("order", ASCENDING), ("created_at", ASCENDING)], name="order_created_at"),
+        # Team version validator and change polling on standalone mongod.
+        IndexModel([("updated_at", DESCENDING)], name="updated_at"),
+    ]
+
     def __init__(self, collection_name: Optional[str] = None):
         self.db = DbaseDriver()
         self.collection = self.db.get_collection(
@@ -26,7 +33,7 @@ class TeamCollection:
         return doc
 
     def list(self) -> List[dict]:
-        cursor = self.collection.find({}).sort("order", 1).sort("created_at", 1)
+        cursor = self.collection.find({}).sort([("order", 1), ("created_at", 1)])
         return [self._serialize(doc) for doc in cursor]
 
     def get(self, member_id: str) -> Optional[dict]:
@@ -47,6 +54,7 @@ class TeamCollection:
         }
         result = self.collection.insert_one(document)
         document["_id"] = result.inserted_id
+        invalidate("team", str(result.inserted_id))
         return self._serialize(document)
 
     def update(self, member_id: str, updates: dict) -> Optional[dict]:
@@ -58,8 +66,72 @@ class TeamCollection:
             {"$set": updates},
             return_document=ReturnDocument.AFTER,
         )
+        invalidate("team", member_id)
         return self._serialize(document)
 
     def delete(self, member_id: str) -> bool:
         result = self.collection.delete_one({"_id": ObjectId(member_id)})
+        invalidate("team", member_id)
+        return result.deleted_count == 1
+
+
+class AsyncTeamCollection:
+    """Async counterpart of TeamCollection used by the API routers."""
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = AsyncDbaseDriver()
+        self.collection = self.db.get_collection(
+            collection_name or os.getenv("MONGODB_TEAM_COLLECTION", "team_members")
+        )
+
+    _serialize = staticmethod(TeamCollection._serialize)
+
+    async def list(self) -> List[dict]:
+        cursor = self.collection.find({}).sort([("order", 1), ("created_at", 1)])
+        return [self._serialize(doc) async for doc in cursor]
+
+    async def version(self) -> dict:
+        """Cheap change validator for the team list: {"count", "updated_at"}."""
+        cursor = await self.collection.aggregate(
+            [{"$group": {"_id": None, "count": {"$sum": 1}, "updated_at": {"$max": "$updated_at"}}}]
+        )
+        result = next(iter(await cursor.to_list(1)), None) or {}
+        return {"count": result.get("count", 0), "updated_at": result.get("updated_at")}
+
+    async def get(self, member_id: str) -> Optional[dict]:
+        document = await self.collection.find_one({"_id": ObjectId(member_id)})
+        return self._serialize(document)
+
+    async def create(self, data: dict) -> dict:
+        now = datetime.utcnow()
+        order = data.pop("order", None)
+        if order is None:
+            count = await self.collection.count_documents({})
+            order = count
+        document = {
+            **data,
+            "order": order,
+            "created_at": now,
+            "updated_at": now,
+        }
+        result = await self.collection.insert_one(document)
+        document["_id"] = result.inserted_id
+        invalidate("team", str(result.inserted_id))
+        return self._serialize(document)
+
+    async def update(self, member_id: str, updates: dict) -> Optional[dict]:
+        if not updates:
+            return await self.get(member_id)
+        updates["updated_at"] = datetime.utcnow()
+        document = await self.collection.find_one_and_update(
+            {"_id": ObjectId(member_id)},
+            {"$set": updates},
+            return_document=ReturnDocument.AFTER,
+        )
+        invalidate("team", member_id)
+        return self._serialize(document)
+
+    async def delete(self, member_id: str) -> bool:
+        result = await self.collection.delete_one({"_id": ObjectId(member_id)})
+        invalidate("team", member_id)
         return result.deleted_count == 1
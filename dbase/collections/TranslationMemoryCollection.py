@@ -0,0 +1,66 @@
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from dbase.driver import DbaseDriver
+
+
+class TranslationMemoryCollection:
+    """
+    Persistent translation memory: (source text hash, target lang, model) -> translation.
+    Documents are keyed by "<hash>:<lang>:<model>" so lookups are plain `_id` reads.
+    """
+
+    INDEXES = [
+        # Entries not reused for a year are dropped.
+        IndexModel([("last_used_at", ASCENDING)], name="last_used_at_ttl", expireAfterSeconds=365 * 24 * 3600),
+    ]
+
+    def __init__(self, collection_name: Optional[str] = None):
+        self.db = DbaseDriver()
+        self.collection = self.db.get_collection(
+            collection_name or os.getenv("MONGODB_TRANSLATION_MEMORY_COLLECTION", "translation_memory")
+        )
+
+    @staticmethod
+    def key(source_hash: str, lang: str, model: str) -> str:
+        return f"{source_hash}:{lang}:{model}"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = {
+            document["_id"]: document["translation"]
+            for document in self.collection.find({"_id": {"$in": keys}}, {"translation": 1})
+        }
+        if found:
+            self.collection.update_many({"_id": {"$in": list(found)}}, {"$set": {"last_used_at": datetime.utcnow()}})
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, str, str, str, str]]) -> int:
+        """Upsert (source_hash, lang, model, source, translation) entries in one unordered bulk write."""
+        now = datetime.utcnow()
+        requests = [
+            UpdateOne(
+                {"_id": self.key(source_hash, lang, model)},
+                {
+                    "$set": {"translation": translation, "last_used_at": now},
+                    "$setOnInsert": {
+                        "source_hash": source_hash,
+                        "lang": lang,
+                        "model": model,
+                        "source": source,
+                        "created_at": now,
+                    },
+                },
+                upsert=True,
+            )
+            for source_hash, lang, model, source, translation in entries
+        ]
+        if not requests:
+            return 0
+        result = self.collection.bulk_write(requests, ordered=False)
+        return result.upserted_count + result.modified_count
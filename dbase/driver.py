@@ -1,27 +1,211 @@
 import os
-from typing import Optional
+import threading
+from typing import Dict, Optional
 
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient, monitoring
 
 load_dotenv()
 
 
+def pool_options() -> dict:
+    """Connection pool settings shared by every client, read from env."""
+    return {
+        "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+        "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+        "maxIdleTimeMS": int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "300000")),
+        "waitQueueTimeoutMS": int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000")),
+        "serverSelectionTimeoutMS": int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    }
+
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """
+    Counts connection pool events per server address so that live pool
+    usage (open / in use / waiting connections) can be reported.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, dict] = {}
+
+    def _bump(self, address, field: str, delta: int = 1):
+        key = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+        with self._lock:
+            counters = self._pools.setdefault(
+                key,
+                {
+                    "open": 0,
+                    "in_use": 0,
+                    "waiting": 0,
+                    "created_total": 0,
+                    "closed_total": 0,
+                    "checkout_failed_total": 0,
+                    "cleared_total": 0,
+                },
+            )
+            counters[field] += delta
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {address: counters.copy() for address, counters in self._pools.items()}
+
+    def pool_created(self, event):
+        self._bump(event.address, "open", 0)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._bump(event.address, "cleared_total")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._bump(event.address, "open")
+        self._bump(event.address, "created_total")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump(event.address, "open", -1)
+        self._bump(event.address, "closed_total")
+
+    def connection_check_out_started(self, event):
+        self._bump(event.address, "waiting")
+
+    def connection_check_out_failed(self, event):
+        self._bump(event.address, "waiting", -1)
+        self._bump(event.address, "checkout_failed_total")
+
+    def connection_checked_out(self, event):
+        self._bump(event.address, "waiting", -1)
+        self._bump(event.address, "in_use")
+
+    def connection_checked_in(self, event):
+        self._bump(event.address, "in_use", -1)
+
+
+# ── Process-wide client registry ────────────────────────────────────────────
+#
+# MongoClient is thread-safe and owns its connection pool, so one client per
+# URI is shared by every collection helper in the process. Async clients are
+# kept in a separate registry: they are bound to the event loop of the worker.
+
+pool_listener = PoolStatsListener()
+
+_clients: Dict[str, MongoClient] = {}
+_async_clients: Dict[str, AsyncMongoClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(uri: str) -> MongoClient:
+    """Return the shared MongoClient for `uri`, creating it on first use."""
+    client = _clients.get(uri)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(uri)
+        if client is None:
+            client = MongoClient(uri, event_listeners=[pool_listener], **pool_options())
+            _clients[uri] = client
+        return client
+
+
+def get_async_client(uri: str) -> AsyncMongoClient:
+    """Return the shared AsyncMongoClient for `uri`, creating it on first use."""
+    client = _async_clients.get(uri)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _async_clients.get(uri)
+        if client is None:
+            client = AsyncMongoClient(uri, event_listeners=[pool_listener], **pool_options())
+            _async_clients[uri] = client
+        return client
+
+
+def open_pools():
+    """Warm up the default client so the first request skips server selection."""
+    try:
+        DbaseDriver().client.admin.command("ping")
+    except Exception as e:
+        print(f"MongoDB warm-up failed: {e}")
+
+
+def close_pools():
+    """Close every shared client. Called from the app lifespan on shutdown."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+async def open_async_pools():
+    """Async counterpart of open_pools() for the event-loop bound client."""
+    try:
+        await AsyncDbaseDriver().client.admin.command("ping")
+    except Exception as e:
+        print(f"MongoDB async warm-up failed: {e}")
+
+
+async def close_async_pools():
+    with _clients_lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        await client.close()
+
+
+def pool_stats() -> dict:
+    """Live pool statistics for all shared clients."""
+    return {
+        "options": pool_options(),
+        "clients": len(_clients),
+        "async_clients": len(_async_clients),
+        "servers": pool_listener.snapshot(),
+    }
+
+
 class DbaseDriver:
     """
-    Thin wrapper around MongoClient that:
+    Thin wrapper around the shared MongoClient that:
     - Reads connection settings from env (MONGODB_URI, MONGODB_DB)
     - Exposes a helper to obtain a collection handle.
     """
 
+    _get_client = staticmethod(get_client)
+
     def __init__(self, uri: Optional[str] = None, db_name: Optional[str] = None):
         self.uri = uri or os.getenv("MONGODB_URI")
         if not self.uri:
             raise ValueError("MONGODB_URI is not set. Add it to .env or pass uri explicitly.")
 
         self.db_name = db_name or os.getenv("MONGODB_DB", "realdeko")
-        self.client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
+        self.client = self._get_client(self.uri)
         self.db = self.client[self.db_name]
 
     def get_collection(self, collection_name: str):
-        return self.db[collection_name]
\ No newline at end of file
+        return self.db[collection_name]
+
+    def watch_collections(self, collection_names, resume_after: Optional[dict] = None, **kwargs):
+        """
+        Open one database-level change stream limited to `collection_names`.
+        Only the document key is needed downstream, so full documents are not requested.
+        """
+        pipeline = [
+            {"$match": {"ns.coll": {"$in": list(collection_names)}}},
+            {"$project": {"operationType": 1, "ns": 1, "documentKey": 1}},
+        ]
+        return self.db.watch(pipeline, resume_after=resume_after, **kwargs)
+
+
+class AsyncDbaseDriver(DbaseDriver):
+    """Same as DbaseDriver, but backed by the shared AsyncMongoClient."""
+
+    _get_client = staticmethod(get_async_client)
@@ -0,0 +1,108 @@
+"""
+In-process index of published articles for sitemap.xml and Atom feeds.
+
+Holds one small entry per published article (slug, dates, per-language
+title/subtitle). Like the search index, it is maintained incrementally:
+writes mark slugs dirty via `invalidate`, and the owning collection reloads
+only those documents before the next read, so publish / unpublish / delete
+cost one indexed lookup instead of a full scan.
+
+`fingerprint` and `last_modified` are stable across workers (they depend
+only on the indexed data), so they can back ETag / Last-Modified headers.
+"""
+
+import heapq
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def _entry_hash(entry: dict) -> int:
+    return zlib.crc32(f"{entry['slug']}|{entry.get('updated_at')}".encode("utf-8"))
+
+
+class ArticleFeedIndex:
+    """Thread-safe slug -> feed entry map with an order-independent fingerprint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._fingerprint = 0
+        self._dirty: Set[str] = set()
+        self._needs_rebuild = True
+
+    # --- invalidation ---
+
+    def invalidate(self, slug: Optional[str] = None):
+        """Invalidation callback: mark one slug (or the whole index) for reload."""
+        with self._lock:
+            if slug is None:
+                self._needs_rebuild = True
+            else:
+                self._dirty.add(slug)
+
+    def take_pending(self) -> Tuple[bool, Set[str]]:
+        """Return (needs_full_rebuild, dirty_slugs) and reset both."""
+        with self._lock:
+            rebuild, dirty = self._needs_rebuild, self._dirty
+            self._needs_rebuild, self._dirty = False, set()
+            return rebuild, dirty
+
+    def restore_pending(self, rebuild: bool, dirty: Set[str]):
+        """Hand back what `take_pending` returned when the reload failed."""
+        with self._lock:
+            self._needs_rebuild = self._needs_rebuild or rebuild
+            self._dirty |= dirty
+
+    # --- maintenance ---
+
+    def rebuild(self, entries: List[dict]):
+        with self._lock:
+            self._entries = {entry["slug"]: entry for entry in entries}
+            self._fingerprint = 0
+            for entry in self._entries.values():
+                self._fingerprint ^= _entry_hash(entry)
+
+    def upsert(self, entry: dict):
+        with self._lock:
+            self._remove(entry["slug"])
+            self._entries[entry["slug"]] = entry
+            self._fingerprint ^= _entry_hash(entry)
+
+    def remove(self, slug: str):
+        with self._lock:
+            self._remove(slug)
+
+    def _remove(self, slug: str):
+        previous = self._entries.pop(slug, None)
+        if previous is not None:
+            self._fingerprint ^= _entry_hash(previous)
+
+    # --- reading ---
+
+    def snapshot(self) -> List[dict]:
+        """All entries, newest update first (a copy, safe to stream from)."""
+        with self._lock:
+            entries = list(self._entries.values())
+        entries.sort(key=lambda entry: entry.get("updated_at") or datetime.min, reverse=True)
+        return entries
+
+    def latest(self, limit: int) -> List[dict]:
+        """The `limit` most recently created entries, newest first."""
+        with self._lock:
+            return heapq.nlargest(
+                limit, self._entries.values(), key=lambda entry: (entry.get("created_at") or datetime.min, entry["slug"])
+            )
+
+    def version(self) -> dict:
+        """{"count", "fingerprint", "last_modified"} for conditional GETs."""
+        with self._lock:
+            last_modified = max(
+                (entry["updated_at"] for entry in self._entries.values() if entry.get("updated_at")), default=None
+            )
+            return {"count": len(self._entries), "fingerprint": self._fingerprint, "last_modified": last_modified}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"documents": len(self._entries), "dirty": len(self._dirty)}
@@ -0,0 +1,84 @@
+"""
+Declarative index management.
+
+Every collection helper declares its indexes in an `INDEXES` class attribute
+(a list of pymongo IndexModel with explicit names). `ensure_indexes` applies
+them idempotently; `check_indexes` reports declared indexes that are missing
+and existing indexes that have not been used since the server started.
+"""
+
+from typing import List, Tuple
+
+from pymongo.errors import OperationFailure
+
+
+def indexed_collections() -> list:
+    """Instances of every collection helper that declares indexes."""
+    # Imported lazily: the collection modules import from dbase at load time.
+    from dbase.collections.ApplicationCollection import ApplicationCollection
+    from dbase.collections.ArticleCollection import ArticleCollection
+    from dbase.collections.JobCollection import JobCollection
+    from dbase.collections.MediaCollection import MediaCollection
+    from dbase.collections.PostCollection import PostCollection
+    from dbase.collections.TeamCollection import TeamCollection
+    from dbase.collections.TranslationMemoryCollection import TranslationMemoryCollection
+
+    return [
+        ArticleCollection(),
+        ApplicationCollection(),
+        TeamCollection(),
+        PostCollection(),
+        JobCollection(),
+        TranslationMemoryCollection(),
+        MediaCollection(),
+    ]
+
+
+def ensure_indexes(helper) -> Tuple[List[str], List[str]]:
+    """
+    Create the declared indexes of `helper.collection` one at a time, so a
+    conflicting index does not keep the rest from being built. Existing ones
+    are left as is. Returns (created, failed) index names.
+    """
+    created, failed = [], []
+    for model in helper.INDEXES:
+        name = model.document["name"]
+        try:
+            created.extend(helper.collection.create_indexes([model]))
+        except OperationFailure as e:
+            # Same name/keys with different options: needs a manual drop first.
+            print(f"Failed to create index '{name}' on '{helper.collection.name}': {e}")
+            failed.append(name)
+    return created, failed
+
+
+def check_indexes(helper) -> dict:
+    declared = {model.document["name"] for model in helper.INDEXES}
+    existing = set(helper.collection.index_information())
+    usage = {
+        stats["name"]: stats["accesses"]["ops"]
+        for stats in helper.collection.aggregate([{"$indexStats": {}}])
+    }
+    return {
+        "collection": helper.collection.name,
+        "missing": sorted(declared - existing),
+        "undeclared": sorted(existing - declared - {"_id_"}),
+        "unused": sorted(name for name, ops in usage.items() if ops == 0 and name != "_id_"),
+    }
+
+
+def ensure_all_indexes() -> List[str]:
+    """Ensure every declared index; returns "collection.index" names that failed."""
+    failures = []
+    for helper in indexed_collections():
+        created, failed = ensure_indexes(helper)
+        if created:
+            print(f"Indexes ensured on '{helper.collection.name}': {', '.join(created)}")
+        failures.extend(f"{helper.collection.name}.{name}" for name in failed)
+    if failures:
+        print(f"{len(failures)} indexes could not be created: {', '.join(failures)}")
+    return failures
+
+
+def check_all_indexes() -> List[dict]:
+    return [check_indexes(helper) for helper in indexed_collections()]
@@ -0,0 +1,34 @@
+"""
+In-process invalidation hub.
+
+Collection helpers call `invalidate(topic, key)` after every write. Caches and
+other derived data register a callback for the topics they depend on, so the
+write path never needs to know who is holding a copy of the data.
+
+Topics are the logical collection names: "articles", "team", "applications".
+`key` is the affected document id, or None when the whole topic changed.
+"""
+
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+_subscribers: Dict[str, List[Callable[[Optional[str]], None]]] = defaultdict(list)
+_lock = threading.Lock()
+
+
+def subscribe(topic: str, callback: Callable[[Optional[str]], None]):
+    """Register `callback(key)` to be called whenever `topic` is invalidated."""
+    with _lock:
+        _subscribers[topic].append(callback)
+
+
+def invalidate(topic: str, key: Optional[str] = None):
+    """Notify every subscriber of `topic` that `key` (or everything) changed."""
+    with _lock:
+        callbacks = list(_subscribers.get(topic, ()))
+    for callback in callbacks:
+        try:
+            callback(key)
+        except Exception as e:
+            print(f"Invalidation callback for '{topic}' failed: {e}")
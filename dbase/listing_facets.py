@@ -0,0 +1,139 @@
+"""
+Parse free-form listing data (price labels, key_metrics, titles) into numeric
+facet fields at write time, so listings can be filtered, sorted and counted
+by Mongo instead of by string matching.
+
+    price "25 000 CZK/měsíc"  -> {"price": 25000.0, "currency": "CZK", "price_period": "month"}
+    key_metrics "Площа: 54 m²" -> {"area_m2": 54.0}
+    "2+kk" anywhere            -> {"disposition": "2+kk", "rooms": 2}
+    "Поверх: 3/5"              -> {"floor": 3}
+"""
+
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from dbase.text import tokenize
+
+_CURRENCIES = (
+    ("CZK", re.compile(r"czk|kč|kc\b|крон|крн|korun", re.IGNORECASE)),
+    ("EUR", re.compile(r"€|eur|євро|евро", re.IGNORECASE)),
+    ("USD", re.compile(r"\$|usd|долар|доллар", re.IGNORECASE)),
+)
+_MONTHLY = re.compile(r"/\s*(měs|mes|міс|мес|month|mo\b)|měsíčně|mesicne|щоміс|ежемес|per month", re.IGNORECASE)
+_MULTIPLIERS = (
+    (re.compile(r"mil|млн|mln|million", re.IGNORECASE), 1_000_000),
+    (re.compile(r"tis|тис|тыс|thousand|\bk\b", re.IGNORECASE), 1_000),
+)
+_NUMBER = re.compile(r"\d[\d\s  .,']*")
+
+_AREA = re.compile(r"(\d+(?:[.,]\d+)?)\s*(?:m2|m²|м2|м²|кв\.?\s*м|sq\.?\s*m|sqm)", re.IGNORECASE)
+_DISPOSITION = re.compile(r"\b([1-9])\s*\+\s*(kk|кк|1)\b", re.IGNORECASE)
+# Filter values arrive as "2 kk" when "+" is not URL-encoded, or as "2kk".
+_DISPOSITION_SEPARATOR = re.compile(r"^\s*([1-9])\s*(?:\+\s*|\s+|(?=[kк]))", re.IGNORECASE)
+_FLOOR_LABEL = re.compile(r"поверх|этаж|podlaží|podlazi|patro|floor", re.IGNORECASE)
+_FIRST_INT = re.compile(r"-?\d+")
+
+
+def _parse_number(raw: str) -> Optional[float]:
+    text = re.sub(r"[\s  ']", "", raw).strip(".,")
+    if not text:
+        return None
+    if "," in text and "." in text:
+        # The last separator is the decimal one: "1.234,5" / "1,234.5".
+        decimal = "," if text.rfind(",") > text.rfind(".") else "."
+        text = text.replace("." if decimal == "," else ",", "").replace(decimal, ".")
+    else:
+        for sep in (",", "."):
+            if sep in text:
+                parts = text.split(sep)
+                # "25.000" / "1,500,000" are thousands groups; "1,2" / "2.5" are decimals.
+                if len(parts) > 2 or len(parts[-1]) == 3:
+                    text = text.replace(sep, "")
+                else:
+                    text = text.replace(sep, ".")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def parse_price(label: Optional[str]) -> dict:
+    """Parse a displayed price label into {price, currency, price_period} (missing keys when unknown)."""
+    if not label:
+        return {}
+    match = _NUMBER.search(label)
+    if not match:
+        return {}
+    value = _parse_number(match.group())
+    if value is None:
+        return {}
+
+    tail = label[match.end():]
+    for pattern, factor in _MULTIPLIERS:
+        if pattern.match(tail.strip()):
+            value *= factor
+            break
+
+    result = {"price": value}
+    for code, pattern in _CURRENCIES:
+        if pattern.search(label):
+            result["currency"] = code
+            break
+    result["price_period"] = "month" if _MONTHLY.search(label) else None
+    return result
+
+
+def _canonical_disposition(match: re.Match) -> str:
+    suffix = "kk" if match.group(2).lower() in ("kk", "кк") else "1"
+    return f"{match.group(1)}+{suffix}"
+
+
+def normalize_disposition(value: str) -> str:
+    """Canonical form of a disposition filter value: "2 kk", "2+KK" and "2kk" -> "2+kk"."""
+    match = _DISPOSITION.search(_DISPOSITION_SEPARATOR.sub(r"\1+", value))
+    return _canonical_disposition(match) if match else value.strip().lower()
+
+
+def _metric_texts(key_metrics: Optional[Iterable]) -> List[Tuple[str, str]]:
+    texts = []
+    for metric in key_metrics or []:
+        if isinstance(metric, dict):
+            texts.append((str(metric.get("label") or ""), str(metric.get("value") or "")))
+    return texts
+
+
+def parse_facets(document: dict) -> dict:
+    """Compute the `facets` sub-document of an article from its base content and translations."""
+    facets = parse_price(document.get("price"))
+
+    translations = [t for t in (document.get("translations") or {}).values() if isinstance(t, dict)]
+    metrics = _metric_texts(document.get("key_metrics"))
+    for translation in translations:
+        metrics.extend(_metric_texts(translation.get("key_metrics")))
+
+    free_text = [document.get("title") or "", document.get("subtitle") or "", " ".join(document.get("tags") or [])]
+    searchable = [f"{label} {value}" for label, value in metrics] + free_text + [document.get("body") or ""]
+
+    for text in searchable:
+        match = _AREA.search(text)
+        if match:
+            facets["area_m2"] = _parse_number(match.group(1))
+            break
+
+    for text in searchable:
+        match = _DISPOSITION.search(text)
+        if match:
+            facets["disposition"] = _canonical_disposition(match)
+            facets["rooms"] = int(match.group(1))
+            break
+
+    for label, value in metrics:
+        if _FLOOR_LABEL.search(label):
+            match = _FIRST_INT.search(value)
+            if match:
+                facets["floor"] = int(match.group())
+                break
+
+    locations = [document.get("location") or ""] + [t.get("location") or "" for t in translations]
+    facets["location_terms"] = sorted({token for location in locations for token in tokenize(location)})
+    return facets
@@ -0,0 +1,81 @@
+"""
+Maintenance commands for the MongoDB data layer.
+
+Usage (from the repository root):
+
+    python -m dbase.manage ensure-indexes
+    python -m dbase.manage check-indexes
+    python -m dbase.manage rebuild-derived [--batch-size 200]
+    python -m dbase.manage dedup-media [--media-root media] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+from dbase.collections.ArticleCollection import ArticleCollection
+from dbase.indexes import check_all_indexes, ensure_all_indexes
+from dbase.media_store import dedup_media_root
+
+
+def ensure_indexes(args):
+    if ensure_all_indexes():
+        sys.exit(1)
+
+
+def check_indexes(args):
+    problems = False
+    for report in check_all_indexes():
+        print(f"{report['collection']}:")
+        for key in ("missing", "undeclared", "unused"):
+            names = report[key]
+            print(f"  {key:<10} {', '.join(names) if names else '-'}")
+        problems = problems or bool(report["missing"])
+    if problems:
+        sys.exit(1)
+
+
+def rebuild_derived(args):
+    updated = ArticleCollection().rebuild_derived_fields(batch_size=args.batch_size)
+    print(f"Rebuilt localized views and facets for {updated} articles.")
+
+
+def dedup_media(args):
+    report = dedup_media_root(Path(args.media_root), dry_run=args.dry_run)
+    prefix = "Would remove" if args.dry_run else "Removed"
+    print(
+        f"{report['files']} files, {report['unique']} unique. {prefix} {report['removed']} duplicates "
+        f"({report['bytes_freed'] / (1024 * 1024):.1f} MB), rewrote {report['articles']} articles "
+        f"and {report['team_members']} team members."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MongoDB maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("ensure-indexes", help="Create declared indexes").set_defaults(func=ensure_indexes)
+    subparsers.add_parser(
+        "check-indexes", help="Report missing, undeclared and unused indexes"
+    ).set_defaults(func=check_indexes)
+
+    derived_parser = subparsers.add_parser(
+        "rebuild-derived", help="Backfill localized views and price/area facets of every article"
+    )
+    derived_parser.add_argument("--batch-size", type=int, default=200)
+    derived_parser.set_defaults(func=rebuild_derived)
+
+    dedup_parser = subparsers.add_parser(
+        "dedup-media", help="Merge identical files in MEDIA_ROOT into content-addressed names"
+    )
+    dedup_parser.add_argument("--media-root", default=os.getenv("MEDIA_ROOT", "media"))
+    dedup_parser.add_argument("--dry-run", action="store_true")
+    dedup_parser.set_defaults(func=dedup_media)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Content-addressed media storage shared by the API uploads and the pipeline.
+
+Files are written to MEDIA_ROOT as `<sha256><ext>`, with the hash computed
+while streaming into a hidden temp file. When the bytes are already stored,
+the temp file is dropped and the existing URL is returned, so re-running the
+pipeline or re-uploading the same photo never duplicates data on disk.
+The `media` collection maps hash -> file and counts references.
+
+`dedup_media_root` is the one-off migration for files stored before this
+(uuid4 names): identical files are merged and article / team references
+are rewritten to the surviving URL.
+"""
+
+import hashlib
+import os
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dbase.collections.MediaCollection import MediaCollection
+
+CHUNK_SIZE = 64 * 1024
+
+
+class MediaTooLarge(Exception):
+    pass
+
+
+def media_url(filename: str) -> str:
+    return f"/media/{filename}"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MediaStore:
+    def __init__(self, media_root: Path, index: Optional[MediaCollection] = None):
+        self.media_root = Path(media_root)
+        self.media_root.mkdir(parents=True, exist_ok=True)
+        self._index = index
+
+    @property
+    def index(self) -> MediaCollection:
+        if self._index is None:
+            self._index = MediaCollection()
+        return self._index
+
+    def save_stream(self, chunks: Iterable[bytes], ext: str, max_bytes: Optional[int] = None) -> Tuple[str, bool, int]:
+        """
+        Store streamed bytes; returns (url, created, size). `created` is False
+        when identical content was already stored and its URL is reused.
+        """
+        tmp_path = self.media_root / f".{uuid.uuid4().hex}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise MediaTooLarge(f"Media exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            sha256 = digest.hexdigest()
+            # Take the reference first: `release` moves a file aside before it
+            # checks the index, so either it sees this reference and puts the
+            # file back, or the file is found missing here and restored.
+            record = self.index.acquire(sha256, f"{sha256}{ext.lower()}", size)
+            path = self.media_root / record["filename"]
+            created = not path.exists()
+            if created:
+                # New content, or the recorded file went missing: store these
+                # bytes under the recorded name, whatever this upload's extension.
+                os.replace(tmp_path, path)
+            return media_url(record["filename"]), created, size
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def release(self, filename: str) -> bool:
+        """
+        Drop one reference to `filename`; returns True when the file itself
+        should be (and was) removed. Untracked legacy files are removed directly.
+        """
+        remaining = self.index.release(filename)
+        if remaining is not None and remaining > 0:
+            return False
+        path = self.media_root / filename
+        if remaining is None:
+            if path.exists():
+                path.unlink()
+            return True
+
+        doomed = self.media_root / f".{uuid.uuid4().hex}.del"
+        try:
+            os.replace(path, doomed)
+        except FileNotFoundError:
+            return True
+        if self.index.get_by_filename(filename):
+            # Re-acquired by a concurrent save_stream; the bytes are identical.
+            os.replace(doomed, path)
+            return False
+        doomed.unlink()
+        return True
+
+
+# ── One-off deduplication of MEDIA_ROOT ────────────────────────────────────
+
+
+def _rewrite_urls(value, mapping: Dict[str, str]):
+    """Return (new_value, changed) with every media URL in `mapping` replaced, at any depth."""
+    if isinstance(value, str):
+        for old, new in mapping.items():
+            if value == old or value.endswith(old):
+                return value[: len(value) - len(old)] + new, True
+        return value, False
+    if isinstance(value, list):
+        changed = False
+        items = []
+        for item in value:
+            item, item_changed = _rewrite_urls(item, mapping)
+            items.append(item)
+            changed = changed or item_changed
+        return items, changed
+    if isinstance(value, dict):
+        changed = False
+        result = {}
+        for key, item in value.items():
+            result[key], item_changed = _rewrite_urls(item, mapping)
+            changed = changed or item_changed
+        return result, changed
+    return value, False
+
+
+def _media_files(media_root: Path) -> List[Path]:
+    return sorted(
+        path for path in media_root.iterdir() if path.is_file() and not path.name.startswith(".")
+    )
+
+
+def dedup_media_root(media_root: Path, dry_run: bool = False) -> dict:
+    """
+    Hash every file in `media_root`, keep one `<sha256><ext>` file per content,
+    rewrite article and team references to it and record reference counts.
+    """
+    # Imported here: the collection modules pull in the whole article stack.
+    from dbase.collections.ArticleCollection import WITHOUT_DERIVED, ArticleCollection
+    from dbase.collections.TeamCollection import TeamCollection
+
+    groups: Dict[str, List[Path]] = defaultdict(list)
+    for path in _media_files(media_root):
+        groups[file_sha256(path)].append(path)
+
+    mapping: Dict[str, str] = {}
+    report = {"files": sum(len(paths) for paths in groups.values()), "unique": len(groups), "removed": 0,
+              "bytes_freed": 0, "articles": 0, "team_members": 0}
+    index = MediaCollection()
+    for sha256, paths in groups.items():
+        canonical = next((path for path in paths if path.stem == sha256), None)
+        existing = index.get(sha256)
+        if existing and (media_root / existing["filename"]).exists():
+            target = media_root / existing["filename"]
+        else:
+            target = media_root / f"{sha256}{(canonical or paths[0]).suffix.lower()}"
+        merged = 0
+        target_present = target.exists()
+        for path in paths:
+            if path == target:
+                continue
+            mapping[media_url(path.name)] = media_url(target.name)
+            merged += 1
+            if not target_present:
+                if not dry_run:
+                    os.replace(path, target)
+                target_present = True
+                continue
+            report["removed"] += 1
+            report["bytes_freed"] += path.stat().st_size
+            if not dry_run:
+                path.unlink()
+        if dry_run:
+            continue
+        # Every merged file had its own owner, so each one becomes a reference.
+        if existing:
+            index.collection.update_one(
+                {"_id": sha256}, {"$set": {"filename": target.name}, "$inc": {"refs": merged}}
+            )
+        else:
+            index.acquire(sha256, target.name, target.stat().st_size, refs=len(paths))
+
+    if mapping:
+        articles = ArticleCollection()
+        for document in articles.collection.find({}, WITHOUT_DERIVED):
+            rewritten, changed = _rewrite_urls({k: v for k, v in document.items() if k != "_id"}, mapping)
+            if changed:
+                report["articles"] += 1
+                if not dry_run:
+                    updates = {key: value for key, value in rewritten.items() if value != document.get(key)}
+                    articles.update(document["_id"], updates)
+
+        team = TeamCollection()
+        for document in team.collection.find({}):
+            rewritten, changed = _rewrite_urls({k: v for k, v in document.items() if k != "_id"}, mapping)
+            if changed:
+                report["team_members"] += 1
+                if not dry_run:
+                    updates = {key: value for key, value in rewritten.items() if value != document.get(key)}
+                    team.update(str(document["_id"]), updates)
+    return report
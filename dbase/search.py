@@ -0,0 +1,172 @@
+"""
+In-process full-text index over articles with BM25 ranking.
+
+Every language of an article (base content and all `translations`) is indexed
+into the same postings, with diacritic-insensitive tokens from dbase.text, so
+"2+kk Praha 3", "Žižkov" or "zizkov" all match regardless of the UI language.
+
+The index only holds what search results need (see `store`). It is
+kept in sync incrementally: writes mark slugs dirty via `invalidate`, and the
+owning collection reloads just those documents before the next query.
+"""
+
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from dbase.text import tokenize
+
+# Repeat counts applied to term frequencies, per source field.
+FIELD_WEIGHTS = {"title": 3, "subtitle": 2, "location": 2, "tags": 2, "key_metrics": 1, "body": 1}
+
+
+def _field_text(value) -> str:
+    if not value:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        parts = []
+        for item in value:
+            if isinstance(item, dict):
+                parts.extend(str(v) for v in item.values() if v)
+            elif item:
+                parts.append(str(item))
+        return " ".join(parts)
+    return str(value)
+
+
+def _term_frequencies(document: dict) -> Counter:
+    sources = [document] + [t for t in (document.get("translations") or {}).values() if isinstance(t, dict)]
+    frequencies = Counter()
+    for source in sources:
+        for field, weight in FIELD_WEIGHTS.items():
+            for token in tokenize(_field_text(source.get(field))):
+                frequencies[token] += weight
+    return frequencies
+
+
+class ArticleSearchIndex:
+    """
+    Thread-safe inverted index with incremental upsert/remove and BM25 scoring.
+    `store(document)` picks what is kept in memory for each hit.
+    """
+
+    def __init__(self, store: Callable[[dict], dict], k1: float = 1.2, b: float = 0.75):
+        self.store = store
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._terms: Dict[str, Tuple[str, ...]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._documents: Dict[str, dict] = {}
+        self._dirty: Set[str] = set()
+        self._needs_rebuild = True
+
+    # --- invalidation ---
+
+    def invalidate(self, slug: Optional[str] = None):
+        """Invalidation callback: mark one slug (or the whole index) for reload."""
+        with self._lock:
+            if slug is None:
+                self._needs_rebuild = True
+            else:
+                self._dirty.add(slug)
+
+    def take_pending(self) -> Tuple[bool, Set[str]]:
+        """Return (needs_full_rebuild, dirty_slugs) and reset both."""
+        with self._lock:
+            rebuild, dirty = self._needs_rebuild, self._dirty
+            self._needs_rebuild, self._dirty = False, set()
+            return rebuild, dirty
+
+    def restore_pending(self, rebuild: bool, dirty: Set[str]):
+        """Hand back what `take_pending` returned when the reload failed."""
+        with self._lock:
+            self._needs_rebuild = self._needs_rebuild or rebuild
+            self._dirty |= dirty
+
+    # --- maintenance ---
+
+    def rebuild(self, documents: Iterable[dict]):
+        with self._lock:
+            self._postings.clear()
+            self._terms.clear()
+            self._lengths.clear()
+            self._documents.clear()
+            self._total_length = 0
+            for document in documents:
+                self._add(document)
+
+    def upsert(self, document: dict):
+        with self._lock:
+            self._remove(document["_id"])
+            self._add(document)
+
+    def remove(self, slug: str):
+        with self._lock:
+            self._remove(slug)
+
+    def _add(self, document: dict):
+        slug = document["_id"]
+        frequencies = _term_frequencies(document)
+        for term, tf in frequencies.items():
+            self._postings[term][slug] = tf
+        self._terms[slug] = tuple(frequencies)
+        length = sum(frequencies.values())
+        self._lengths[slug] = length
+        self._total_length += length
+        self._documents[slug] = self.store(document)
+
+    def _remove(self, slug: str):
+        for term in self._terms.pop(slug, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slug, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(slug, 0)
+        self._documents.pop(slug, None)
+
+    # --- querying ---
+
+    def search(self, query: str, status: Optional[str] = "published", limit: int = 20) -> List[Tuple[dict, float]]:
+        """Return up to `limit` (stored document, score) pairs, best first."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            count = len(self._lengths)
+            if not count:
+                return []
+            lengths = self._lengths
+            k1_plus_1 = self.k1 + 1
+            norm_base = self.k1 * (1 - self.b)
+            # Documents with no indexable text leave the total at 0.
+            avg_length = (self._total_length / count) or 1
+            norm_scale = self.k1 * self.b / avg_length
+            scores: Dict[str, float] = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for slug, tf in postings.items():
+                    scores[slug] += idf * tf * k1_plus_1 / (tf + norm_base + norm_scale * lengths[slug])
+
+            documents = self._documents
+            if status:
+                candidates = [item for item in scores.items() if documents[item[0]].get("status") == status]
+            else:
+                candidates = scores.items()
+            best = heapq.nlargest(limit, candidates, key=lambda item: item[1])
+            return [(documents[slug], score) for slug, score in best]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"documents": len(self._lengths), "terms": len(self._postings), "dirty": len(self._dirty)}
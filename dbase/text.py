@@ -0,0 +1,35 @@
+"""
+Text normalization shared by the AI pipeline (slugs) and the search index.
+"""
+
+import re
+import unicodedata
+from typing import List
+
+# Basic Cyrillic / Czech → Latin transliteration map
+TRANSLIT_MAP = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'zh', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'kh', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'shch',
+    'ъ': '', 'ы': 'y', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'і': 'i', 'ї': 'yi', 'є': 'ye', 'ґ': 'g',
+    'ě': 'e', 'š': 's', 'č': 'c', 'ř': 'r', 'ž': 'z', 'ý': 'y',
+    'á': 'a', 'í': 'i', 'é': 'e', 'ú': 'u', 'ů': 'u', 'ň': 'n',
+    'ť': 't', 'ď': 'd', 'ö': 'o', 'ü': 'u', 'ä': 'a',
+}
+
+_TRANSLIT_TABLE = str.maketrans(TRANSLIT_MAP)
+
+# Words made of letters/digits, keeping dispositions such as "2+kk" or "3+1" whole.
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:\+[a-z0-9]+)*")
+
+
+def transliterate(text: str) -> str:
+    """Lowercase, transliterate and strip remaining diacritics to plain ASCII."""
+    text = text.lower().translate(_TRANSLIT_TABLE)
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(transliterate(text))
@@ -0,0 +1,155 @@
+"""
+Segment-level translation memory for article localization.
+
+Article content is split into segments (title, subtitle, location, each body
+paragraph, each key-metric label/value/helper, each tag). Translations are
+remembered per (sha256 of the source segment, target lang, model) in Mongo
+with an in-process LRU in front, so re-localizing a lightly edited article
+only sends the segments that actually changed to the model.
+
+    segments = extract_segments(content)              # [(path, text), ...]
+    known = translation_memory.lookup(texts, "en", model)
+    ... translate the rest ...
+    translation_memory.remember(pairs, "en", model)
+    localized = apply_segments(content, {path: translation})
+"""
+
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dbase.cache import MISSING, TTLCache, register_cache
+from dbase.collections.TranslationMemoryCollection import TranslationMemoryCollection
+
+Path = Tuple
+TEXT_FIELDS = ("title", "subtitle", "location")
+METRIC_PARTS = ("label", "value", "helper")
+
+_PARAGRAPH_BREAK = re.compile(r"(\n\s*\n)")
+
+
+def segment_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().encode("utf-8")).hexdigest()
+
+
+def _paragraphs(body: str) -> List[str]:
+    """Split on blank lines, keeping the separators at odd indices."""
+    return _PARAGRAPH_BREAK.split(body)
+
+
+def extract_segments(content: dict) -> List[Tuple[Path, str]]:
+    """Translatable (path, text) segments of `content`; empty strings are skipped."""
+    segments = []
+    for field in TEXT_FIELDS:
+        value = content.get(field)
+        if isinstance(value, str) and value.strip():
+            segments.append(((field,), value))
+
+    body = content.get("body")
+    if isinstance(body, str):
+        for index, part in enumerate(_paragraphs(body)):
+            if index % 2 == 0 and part.strip():
+                segments.append((("body", index), part))
+
+    for index, metric in enumerate(content.get("key_metrics") or []):
+        for part in METRIC_PARTS:
+            value = metric.get(part) if isinstance(metric, dict) else None
+            if isinstance(value, str) and value.strip():
+                segments.append((("key_metrics", index, part), value))
+
+    for index, tag in enumerate(content.get("tags") or []):
+        if isinstance(tag, str) and tag.strip():
+            segments.append((("tags", index), tag))
+    return segments
+
+
+def apply_segments(content: dict, translated: Dict[Path, str]) -> dict:
+    """Rebuild the translatable fields of `content` from translated segments (source text as fallback)."""
+    localized = {}
+    for field in TEXT_FIELDS:
+        if field in content:
+            localized[field] = translated.get((field,), content[field])
+
+    body = content.get("body")
+    if isinstance(body, str):
+        parts = _paragraphs(body)
+        localized["body"] = "".join(
+            translated.get(("body", index), part) if index % 2 == 0 else part for index, part in enumerate(parts)
+        )
+
+    if content.get("key_metrics"):
+        localized["key_metrics"] = [
+            {
+                part: translated.get(("key_metrics", index, part), metric.get(part) or "")
+                for part in METRIC_PARTS
+            }
+            for index, metric in enumerate(content["key_metrics"])
+            if isinstance(metric, dict)
+        ]
+
+    if content.get("tags"):
+        localized["tags"] = [translated.get(("tags", index), tag) for index, tag in enumerate(content["tags"])]
+    return localized
+
+
+def aligned_pairs(source: dict, translation: dict) -> List[Tuple[str, str]]:
+    """
+    (source segment, translated segment) pairs from an already translated
+    document, e.g. pipeline output. Structures that do not line up (different
+    paragraph, metric or tag counts) are skipped rather than guessed.
+    """
+    source_segments = dict(extract_segments(source))
+    translated_segments = dict(extract_segments(translation))
+    if len(_paragraphs(source.get("body") or "")) != len(_paragraphs(translation.get("body") or "")):
+        source_segments = {path: text for path, text in source_segments.items() if path[0] != "body"}
+    for field in ("key_metrics", "tags"):
+        if len(source.get(field) or []) != len(translation.get(field) or []):
+            source_segments = {path: text for path, text in source_segments.items() if path[0] != field}
+    return [
+        (text, translated_segments[path]) for path, text in source_segments.items() if path in translated_segments
+    ]
+
+
+class TranslationMemory:
+    """Mongo-backed translation memory with an in-process LRU front."""
+
+    def __init__(self, maxsize: int = 20000):
+        self.cache = register_cache(TTLCache("translation_memory", maxsize=maxsize, ttl=None))
+        self._store: Optional[TranslationMemoryCollection] = None
+
+    @property
+    def store(self) -> TranslationMemoryCollection:
+        if self._store is None:
+            self._store = TranslationMemoryCollection()
+        return self._store
+
+    def lookup(self, texts: Iterable[str], lang: str, model: str) -> Dict[str, str]:
+        """Known translations of `texts` into `lang`, as {source text: translation}."""
+        found, missing = {}, {}
+        for text in set(texts):
+            key = TranslationMemoryCollection.key(segment_hash(text), lang, model)
+            cached = self.cache.get(key)
+            if cached is MISSING:
+                missing[key] = text
+            else:
+                found[text] = cached
+
+        if missing:
+            for key, translation in self.store.get_many(missing).items():
+                self.cache.set(key, translation)
+                found[missing[key]] = translation
+        return found
+
+    def remember(self, pairs: Iterable[Tuple[str, str]], lang: str, model: str) -> int:
+        entries = []
+        for source, translation in pairs:
+            if not source.strip() or not isinstance(translation, str):
+                continue
+            source_hash = segment_hash(source)
+            self.cache.set(TranslationMemoryCollection.key(source_hash, lang, model), translation)
+            entries.append((source_hash, lang, model, source, translation))
+        return self.store.put_many(entries) if entries else 0
+
+
+translation_memory = TranslationMemory(maxsize=int(os.getenv("TRANSLATION_MEMORY_CACHE_SIZE", "20000")))
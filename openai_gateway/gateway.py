@@ -0,0 +1,202 @@
+"""
+Shared OpenAI client for the API and the ai-pipeline.
+
+One process-wide gateway owns:
+- a keep-alive httpx connection pool (OPENAI_MAX_CONNECTIONS / OPENAI_MAX_KEEPALIVE),
+- token buckets for requests and tokens per minute (OPENAI_RPM / OPENAI_TPM),
+- a concurrency semaphore (OPENAI_MAX_CONCURRENCY),
+- exponential backoff with jitter on 429, 5xx, timeouts and connection errors
+  (OPENAI_MAX_RETRIES), honouring Retry-After,
+- a default per-call timeout (OPENAI_TIMEOUT).
+
+Usage:
+
+    from openai_gateway.gateway import get_gateway
+
+    response = get_gateway().chat(model="gpt-4o-mini", messages=[...])
+    batch = get_gateway().call(client.batches.retrieve, batch_id)
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import APIConnectionError, APIStatusError, APITimeoutError, OpenAI, RateLimitError
+
+load_dotenv()
+
+# Rough prompt size estimate used before the real usage is known.
+CHARS_PER_TOKEN = 4
+DEFAULT_COMPLETION_TOKENS = 1000
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `per_minute` units per minute."""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until `amount` units are available and take them; returns the seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, delta: float):
+        """Correct an earlier estimate once the real cost is known (may go negative)."""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - delta)
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (RateLimitError, APITimeoutError, APIConnectionError)):
+        return True
+    return isinstance(exc, APIStatusError) and exc.status_code >= 500
+
+
+class OpenAIGateway:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+        timeout: Optional[float] = None,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+    ):
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY is not set. Add it to your environment or pass api_key explicitly.")
+
+        self.timeout = timeout or float(os.getenv("OPENAI_TIMEOUT", "60"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=max_connections or int(os.getenv("OPENAI_MAX_CONNECTIONS", "20")),
+                max_keepalive_connections=max_keepalive or int(os.getenv("OPENAI_MAX_KEEPALIVE", "10")),
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=float(os.getenv("OPENAI_CONNECT_TIMEOUT", "10"))),
+        )
+        # Retries are handled here (shared backoff + limiter), not by the SDK.
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=base_url or os.getenv("OPENAI_BASE_URL") or None,
+            http_client=self.http_client,
+            max_retries=0,
+        )
+        self.requests = TokenBucket(requests_per_minute or float(os.getenv("OPENAI_RPM", "500")))
+        self.tokens = TokenBucket(tokens_per_minute or float(os.getenv("OPENAI_TPM", "200000")))
+        self.semaphore = threading.BoundedSemaphore(max_concurrency or int(os.getenv("OPENAI_MAX_CONCURRENCY", "8")))
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "failures": 0, "throttled_seconds": 0.0, "tokens": 0}
+
+    def _bump(self, field: str, amount=1):
+        with self._stats_lock:
+            self._stats[field] += amount
+
+    def call(self, fn: Callable[..., Any], *args, estimated_tokens: int = 0, **kwargs) -> Any:
+        """
+        Run one SDK call under the limiter, semaphore and retry policy.
+        `estimated_tokens` is charged to the TPM bucket up front and corrected
+        from `response.usage` when available.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            waited = self.requests.acquire(1)
+            if estimated_tokens:
+                waited += self.tokens.acquire(estimated_tokens)
+            if waited:
+                self._bump("throttled_seconds", waited)
+
+            try:
+                with self.semaphore:
+                    response = fn(*args, **kwargs)
+            except Exception as exc:
+                if not _is_retryable(exc) or attempt >= self.max_retries:
+                    self._bump("failures")
+                    raise
+                delay = _retry_after(exc) or min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random())
+                attempt += 1
+                self._bump("retries")
+                print(f"OpenAI call failed ({exc.__class__.__name__}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self._bump("calls")
+            usage = getattr(response, "usage", None)
+            used = getattr(usage, "total_tokens", None) if usage is not None else None
+            if used:
+                self._bump("tokens", used)
+                self.tokens.adjust(used - estimated_tokens)
+            return response
+
+    def chat(self, **kwargs) -> Any:
+        """chat.completions.create through the gateway."""
+        prompt_chars = len(json.dumps(kwargs.get("messages", []), ensure_ascii=False))
+        estimated = prompt_chars // CHARS_PER_TOKEN + (kwargs.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+        return self.call(self.client.chat.completions.create, estimated_tokens=estimated, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        return stats
+
+    def close(self):
+        self.http_client.close()
+
+
+_gateway: Optional[OpenAIGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> OpenAIGateway:
+    """Return the process-wide gateway, creating it on first use."""
+    global _gateway
+    if _gateway is not None:
+        return _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = OpenAIGateway()
+        return _gateway
+
+
+def gateway_stats() -> Optional[Dict[str, Any]]:
+    return _gateway.stats() if _gateway is not None else None